@@ -0,0 +1,190 @@
+import argparse
+import contextlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from itertools import islice
+
+import numpy as np
+
+from linear_programming_functions import transfer_to_standard_form, solve_linear_programming_problem, restore_signs
+from bounded_simplex import solve_bounded_problem
+from branch_and_bound import is_mixed_integer, branch_and_bound
+
+
+def parse_problem(text, name):
+    '''
+        Function parses one JSON problem. A malformed one becomes a problem holding its "error",
+    which solve_problem reports as an error result, so the rest of the batch still runs.
+    Input:
+        text: JSON text of the problem
+        name: id of the problem if the text has none or cannot be parsed (e.g. "line 3")
+    Output:
+        problem: python dict
+    '''
+    try:
+        problem = json.loads(text)
+    except json.JSONDecodeError as e:
+        return {'id': name, 'error': 'invalid JSON: %s' % e}
+    if not isinstance(problem, dict):
+        return {'id': name, 'error': 'a problem must be a JSON object'}
+    problem.setdefault('id', name)
+    return problem
+
+
+def read_problems(source):
+    '''
+        Function reads problems lazily from a JSONL file or from a directory of JSON files.
+    Each problem is a JSON object with the inputs of transfer_to_standard_form: "n_var", "n_constraint",
+    "func_type", "func_coef", "constraints", "constraint_signs", "variable_cons" and an optional "id"
+    (default: "line <number>" or the file name).
+    Input:
+        source: path of a JSONL file, of a directory or "-" for standard input
+    Output:
+        generator of problems (python dicts, see parse_problem for malformed ones)
+    '''
+    if source == '-':
+        for number, line in enumerate(sys.stdin, 1):
+            if line.strip():
+                yield parse_problem(line, 'line %d' % number)
+    elif os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            if name.endswith('.json'):
+                with open(os.path.join(source, name)) as f:
+                    yield parse_problem(f.read(), os.path.splitext(name)[0])
+    else:
+        with open(source) as f:
+            for number, line in enumerate(f, 1):
+                if line.strip():
+                    yield parse_problem(line, 'line %d' % number)
+
+
+def solve_problem(problem, method = 'auto'):
+    '''
+        Function solves one problem read by read_problems.
+    Input:
+        problem: python dict of a problem
+        method: solver engine passed to solve_linear_programming_problem, or "bounded" for the
+                bounded-variable simplex (see bounded_simplex.solve_bounded_problem); problems with "Integer"
+                or "Binary" variables are solved by branch_and_bound.branch_and_bound in the worker process
+    Output:
+        result: python dict with "id", "status", "z" and "solution"
+    '''
+    if 'error' in problem:
+        return {'id': problem.get('id'), 'status': 'error', 'message': problem['error']}
+    try:
+        inputs = (problem['n_var'], problem['n_constraint'], problem['func_type'], list(problem['func_coef']),
+                  [list(row) for row in problem['constraints']], list(problem['constraint_signs']), list(problem['variable_cons']))
+        if is_mixed_integer(inputs[6]):
+            B, z, solver = branch_and_bound(*inputs)
+        elif method == 'bounded':
+            B, z, solver = solve_bounded_problem(*inputs)
+        else:
+            A, free_var = transfer_to_standard_form(*inputs)
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                B, z, solver = solve_linear_programming_problem(problem['n_var'], A, free_var, problem['func_type'], method)
+            if isinstance(B, np.ndarray):
+                solver = restore_signs(solver, inputs[6])
+    except Exception as e:
+        return {'id': problem.get('id'), 'status': 'error', 'message': str(e)}
+
+    if not isinstance(B, np.ndarray):
+        return {'id': problem.get('id'), 'status': 'no_solution', 'z': None, 'solution': None}
+    return {'id': problem.get('id'), 'status': 'optimal', 'z': float(z), 'solution': [float(x) for x in solver]}
+
+
+def solve_chunk(chunk, method = 'auto'):
+    '''
+        Function solves a chunk of (index, problem) pairs in a worker process.
+    '''
+    return [(index, solve_problem(problem, method)) for index, problem in chunk]
+
+
+def solve_problems(problems, workers = None, chunk_size = 16, ordered = True, max_pending = None, method = 'auto'):
+    '''
+        Function solves problems in a process pool and streams results back as they complete.
+    At most max_pending chunks are in flight (submitted or waiting to be yielded in order),
+    so memory stays bounded however many problems are read.
+    Input:
+        problems: iterable of problems (python dicts)
+        workers: number of worker processes (default: number of CPUs)
+        chunk_size: number of problems sent to a worker at once
+        ordered: yield results in input order, otherwise as soon as they complete
+        max_pending: maximal number of chunks in flight (default: 2*workers)
+        method: solver engine passed to solve_linear_programming_problem
+    Output:
+        generator of results (python dicts, see solve_problem)
+    '''
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or 2*workers
+    numbered = enumerate(problems)
+    chunks = iter(lambda: list(islice(numbered, chunk_size)), [])
+
+    with ProcessPoolExecutor(workers) as executor:
+        pending = {}
+        finished = {}
+        next_chunk = 0
+        n_submitted = 0
+
+        def submit():
+            nonlocal n_submitted
+            while len(pending) + len(finished) < max_pending:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    return
+                pending[executor.submit(solve_chunk, chunk, method)] = n_submitted
+                n_submitted += 1
+
+        submit()
+        while pending:
+            done, _ = wait(pending, return_when = FIRST_COMPLETED)
+            for future in done:
+                number = pending.pop(future)
+                if ordered:
+                    finished[number] = future.result()
+                else:
+                    for index, result in future.result():
+                        yield result
+
+            while next_chunk in finished:
+                for index, result in finished.pop(next_chunk):
+                    yield result
+                next_chunk += 1
+
+            submit()
+
+
+def run_batch(source, output = '-', workers = None, chunk_size = 16, ordered = True, method = 'auto'):
+    '''
+        Function solves every problem of a source and writes one JSON result per line.
+    Input:
+        source: path of a JSONL file, of a directory or "-" for standard input
+        output: path of the JSONL result file or "-" for standard output
+        workers, chunk_size, ordered, method: see solve_problems
+    Output:
+        n: number of solved problems
+    '''
+    f = sys.stdout if output == '-' else open(output, 'w')
+    n = 0
+    try:
+        for result in solve_problems(read_problems(source), workers, chunk_size, ordered, method = method):
+            f.write(json.dumps(result) + '\n')
+            n += 1
+    finally:
+        if f is not sys.stdout:
+            f.close()
+    return n
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Solve a batch of linear programming problems in parallel.")
+    parser.add_argument('source', help = "JSONL file, directory of JSON files or - for standard input")
+    parser.add_argument('-o', '--output', default = '-', help = "JSONL result file (default: standard output)")
+    parser.add_argument('-w', '--workers', type = int, default = None, help = "number of worker processes")
+    parser.add_argument('-c', '--chunk-size', type = int, default = 16, help = "problems sent to a worker at once")
+    parser.add_argument('--unordered', action = 'store_true', help = "write results as soon as they complete")
+    parser.add_argument('--method', default = 'auto', help = "solver engine")
+    args = parser.parse_args()
+
+    run_batch(args.source, args.output, args.workers, args.chunk_size, not args.unordered, args.method)
@@ -0,0 +1,204 @@
+import numpy as np
+
+
+def find_batch_basis(T, tol = 1e-12):
+    '''
+        Function finds, for each problem and each row, a unit column with zero reduced cost.
+    Input:
+        T: stack of tableaux of shape (k, m+1, n+1)
+    Output:
+        basis: array of shape (k, m) with the index of the unit column of each row (-1 if none)
+    '''
+    k, m, n = T.shape[0], T.shape[1] - 1, T.shape[2] - 1
+    nonzero = np.abs(T[:, :, :-1]) > tol
+    rows = np.argmax(nonzero, axis = 1)
+    values = np.take_along_axis(T[:, :, :-1], rows[:, None, :], axis = 1)[:, 0, :]
+    unit = (nonzero.sum(axis = 1) == 1) & (rows > 0) & (np.abs(values - 1.0) <= tol)
+
+    basis = np.full((k, m), -1)
+    problem, col = np.where(unit)
+    basis[problem, rows[problem, col] - 1] = col
+    return basis
+
+
+def batch_pivot(T, problems, pivot_rows, pivot_cols):
+    '''
+        Function makes one pivot operation on several tableaux of a stack at once, in place.
+    Input:
+        T: stack of tableaux
+        problems: indices of the problems to pivot
+        pivot_rows: pivot row of each problem
+        pivot_cols: pivot column of each problem
+    '''
+    every = len(problems) == T.shape[0]
+    S = T if every else T[problems]
+    ar = np.arange(len(problems))
+
+    row = S[ar, pivot_rows, :]/S[ar, pivot_rows, pivot_cols][:, None]
+    col = S[ar, :, pivot_cols]
+    col[ar, pivot_rows] = 0.0
+
+    # rank-1 elimination of every problem
+    S -= col[:, :, None]*row[:, None, :]
+    S[ar, pivot_rows, :] = row
+
+    if not every:
+        T[problems] = S
+
+
+def batch_simplex_iterations(T, basis, active, n_candidates, tol = 1e-9, max_iter = None):
+    '''
+        Function runs primal simplex iterations (Dantzig's rule) on every active problem of a stack.
+    A problem whose last pivot was degenerate uses Bland's rule (lowest index entering, lowest basic
+    index leaving among tied rows) until it makes progress again, so degenerate problems cannot cycle.
+    Input:
+        T: stack of feasible tableaux, modified in place
+        basis: basic variable of each row of each problem, modified in place
+        active: boolean mask of problems to optimize
+        n_candidates: only columns with index < n_candidates may enter the basis
+        tol: optimality and pivot tolerance
+        max_iter: maximal number of pivots
+    Output:
+        status: array of "optimal", "unbounded", "iteration_limit" ("" for inactive problems)
+    '''
+    status = np.full(T.shape[0], "", dtype = object)
+    active = active.copy()
+    bland = np.zeros(T.shape[0], dtype = bool)
+    iteration = 0
+
+    while active.any():
+        if max_iter is not None and iteration >= max_iter:
+            status[active] = "iteration_limit"
+            break
+
+        problems = np.where(active)[0]
+        ar = np.arange(len(problems))
+
+        # find pivot column, mask out optimal problems
+        reduced = T[problems, 0, :n_candidates]
+        pivot_cols = np.argmin(reduced, axis = 1)
+        use_bland = bland[problems]
+        if use_bland.any():
+            eligible = reduced[use_bland] < -tol
+            pivot_cols[use_bland] = np.where(eligible.any(axis = 1), np.argmax(eligible, axis = 1), pivot_cols[use_bland])
+        optimal = reduced[ar, pivot_cols] >= -tol
+        status[problems[optimal]] = "optimal"
+
+        # ratio test, mask out unbounded problems
+        col = T[problems, 1:, pivot_cols]
+        positive = col > tol
+        unbounded = ~optimal & ~positive.any(axis = 1)
+        status[problems[unbounded]] = "unbounded"
+
+        ratios = np.full(col.shape, np.inf)
+        np.divide(T[problems, 1:, -1], col, out = ratios, where = positive)
+        pivot_rows = np.argmin(ratios, axis = 1)
+        if use_bland.any():
+            tied = ratios[use_bland] <= ratios[use_bland].min(axis = 1, keepdims = True) + tol
+            pivot_rows[use_bland] = np.argmin(np.where(tied, basis[problems[use_bland]], np.iinfo(basis.dtype).max), axis = 1)
+
+        go = ~optimal & ~unbounded
+        active[problems[~go]] = False
+        if not go.any():
+            break
+
+        # a pivot row with zero right-hand side makes a degenerate pivot
+        bland[problems[go]] = T[problems[go], pivot_rows[go] + 1, -1] <= tol
+        batch_pivot(T, problems[go], pivot_rows[go] + 1, pivot_cols[go])
+        basis[problems[go], pivot_rows[go]] = pivot_cols[go]
+        iteration += 1
+
+    return status
+
+
+def solve_batch(n_var, T, free_var = [], func_type = 'Minimize', tol = 1e-9, max_iter = None):
+    '''
+        Function solves a stack of linear programming problems of the same shape at once.
+    Every pivot is made on all unfinished problems together, problems which are optimal,
+    unbounded or infeasible are masked out of the following pivots.
+    Input:
+        n_var: number of original variables.
+        T: stack of original tableaux of shape (k, m+1, n+1) (see transfer_to_standard_form)
+        free_var: python list include indeces of free variables (shared by all problems).
+        func_type: type of objective function
+        tol: optimality and pivot tolerance
+        max_iter: maximal number of pivots of each phase
+    Output:
+        status: array of "optimal", "unbounded", "infeasible" or "iteration_limit"
+        z: optimal values (nan if not optimal)
+        solver: optimal solutions of shape (k, n_var) (nan if not optimal)
+    '''
+    T = np.asarray(T, dtype = float)
+    k, m, n = T.shape[0], T.shape[1] - 1, T.shape[2] - 1
+
+    # working stack: constraint columns, one artificial column per row, right-hand side
+    W = np.zeros((k, m + 1, n + m + 1))
+    W[:, :, :n] = T[:, :, :-1]
+    W[:, :, -1] = T[:, :, -1]
+
+    # make right-hand side nonnegative
+    negative = W[:, 1:, -1] < 0
+    W[:, 1:, :][negative] *= -1
+
+    # rows without a unit column start with their artificial variable in the basis
+    basis = find_batch_basis(W)
+    missing = basis < 0
+    problem, row = np.where(missing)
+    W[problem, row + 1, n + row] = 1.0
+    basis[problem, row] = n + row
+
+    status = np.full(k, "optimal", dtype = object)
+
+    # phase 1: minimize the sum of the artificial variables
+    phase_1 = missing.any(axis = 1)
+    if phase_1.any():
+        costs = W[:, 0, :].copy()
+        W[:, 0, :] = -np.einsum('kr,krj->kj', missing.astype(float), W[:, 1:, :])
+        W[:, 0, n:-1] = 0.0
+
+        limit = batch_simplex_iterations(W, basis, phase_1, n, tol, max_iter) == "iteration_limit"
+        status[limit] = "iteration_limit"
+        infeasible = phase_1 & ~limit & (-W[:, 0, -1] > tol*np.maximum(1.0, np.abs(T[:, 1:, -1]).max(axis = 1)))
+        status[infeasible] = "infeasible"
+        infeasible |= limit
+
+        # drive artificial variables left in the basis (at zero level) out of it
+        for r in range(m):
+            problems = np.where((basis[:, r] >= n) & ~infeasible)[0]
+            if len(problems) == 0:
+                continue
+            row = np.abs(W[problems, r + 1, :n])
+            cols = np.argmax(row, axis = 1)
+            pivotable = row[np.arange(len(problems)), cols] > tol
+            if not pivotable.any():
+                continue
+            batch_pivot(W, problems[pivotable], np.full(pivotable.sum(), r + 1), cols[pivotable])
+            basis[problems[pivotable], r] = cols[pivotable]
+
+        # phase 2 objective in canonical form
+        W[:, 0, :] = costs
+        cost_basis = np.where(basis < n, np.take_along_axis(costs, np.minimum(basis, n - 1), axis = 1), 0.0)
+        W[:, 0, :] -= np.einsum('kr,krj->kj', cost_basis, W[:, 1:, :])
+    else:
+        infeasible = np.zeros(k, dtype = bool)
+
+    # phase 2: original objective, artificial columns never enter
+    phase_2 = ~infeasible
+    status[phase_2] = batch_simplex_iterations(W, basis, phase_2, n, tol, max_iter)[phase_2]
+
+    # get solutions of optimal problems
+    optimal = status == "optimal"
+    x = np.zeros((k, n))
+    problem, row = np.where(basis < n)
+    x[problem, basis[problem, row]] = W[problem, row + 1, -1]
+
+    for i in free_var:
+        x[:, i] -= x[:, i + 1]
+    x = np.delete(x, [i + 1 for i in free_var], axis = 1)[:, :n_var]
+    x[~optimal] = np.nan
+
+    # get optimal values
+    z = -W[:, 0, -1] if func_type == 'Minimize' else W[:, 0, -1].copy()
+    z[~optimal] = np.nan
+
+    return status.astype(str), z, x
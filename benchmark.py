@@ -0,0 +1,341 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+try:
+    import scipy.sparse as sp
+except ImportError:
+    sp = None
+
+from linear_programming_functions import is_sparse, find_unit_basis, transfer_to_standard_form, solve_linear_programming_problem
+from bounded_simplex import solve_bounded_problem
+from network_simplex import is_network
+from instrumentation import SolveObserver
+
+
+# ---------------------------------------------------------------- generators
+# every generator returns a problem dict (same keys as batch_runner) with its family,
+# its expected status and, when it is known, its optimal value
+
+def problem_dict(name, family, func_type, func_coef, constraints, constraint_signs, variable_cons, expected = 'optimal', z = None):
+    return {'id': name, 'family': family, 'n_var': len(func_coef), 'n_constraint': len(constraint_signs),
+            'func_type': func_type, 'func_coef': list(func_coef), 'constraints': constraints,
+            'constraint_signs': list(constraint_signs), 'variable_cons': list(variable_cons),
+            'expected': expected, 'z': z}
+
+
+def random_dense(n_var, n_constraint, seed = 0):
+    '''
+        Function generates a feasible and bounded dense problem: maximize c*x subject to C*x <= b, x >= 0
+    with positive C, b and c.
+    '''
+    rng = np.random.default_rng(seed)
+    C = rng.uniform(0.1, 1.0, (n_constraint, n_var))
+    b = rng.uniform(1.0, 10.0, n_constraint)*n_var
+    c = rng.uniform(0.1, 1.0, n_var)
+    return problem_dict(f'dense_{n_var}x{n_constraint}_{seed}', 'random_dense', 'Maximize', c,
+                        np.hstack((C, b[:, None])).tolist(), ['<=']*n_constraint, ['>= 0']*n_var)
+
+
+def random_sparse(n_var, n_constraint, density = 0.05, seed = 0):
+    '''
+        Function generates a feasible and bounded sparse problem (constraints as a scipy sparse matrix):
+    maximize c*x subject to C*x <= b, x >= 0, every variable appears in at least one row.
+    '''
+    rng = np.random.default_rng(seed)
+    C = (rng.random((n_constraint, n_var)) < density)*rng.uniform(0.1, 1.0, (n_constraint, n_var))
+    C[rng.integers(0, n_constraint, n_var), np.arange(n_var)] = rng.uniform(0.1, 1.0, n_var)
+    b = rng.uniform(1.0, 10.0, n_constraint)
+    c = rng.uniform(0.1, 1.0, n_var)
+    constraints = np.hstack((C, b[:, None]))
+    if sp is not None:
+        constraints = sp.csr_matrix(constraints)
+    return problem_dict(f'sparse_{n_var}x{n_constraint}_{seed}', 'random_sparse', 'Maximize', c,
+                        constraints, ['<=']*n_constraint, ['>= 0']*n_var)
+
+
+def klee_minty(n):
+    '''
+        Function generates the Klee-Minty cube of dimension n, on which Dantzig's rule visits all 2^n
+    vertices: maximize sum 2^(n-j) x_j subject to sum_{j<i} 2^(i-j+1) x_j + x_i <= 5^i.
+    The optimal value is 5^n.
+    '''
+    constraints = []
+    for i in range(1, n + 1):
+        row = [2.0**(i - j + 1) for j in range(1, i)] + [1.0] + [0.0]*(n - i) + [5.0**i]
+        constraints.append(row)
+    c = [2.0**(n - j) for j in range(1, n + 1)]
+    return problem_dict(f'klee_minty_{n}', 'klee_minty', 'Maximize', c, constraints, ['<=']*n, ['>= 0']*n, z = 5.0**n)
+
+
+def assignment(n, seed = 0):
+    '''
+        Function generates a (highly degenerate) assignment problem of n workers and n jobs:
+    minimize sum c_ij x_ij subject to every worker and every job being assigned exactly once.
+    '''
+    rng = np.random.default_rng(seed)
+    cost = rng.integers(1, 20, (n, n)).astype(float)
+    constraints = []
+    for i in range(n):
+        row = np.zeros(n*n + 1)
+        row[i*n:(i + 1)*n] = 1.0
+        row[-1] = 1.0
+        constraints.append(row.tolist())
+    for j in range(n):
+        row = np.zeros(n*n + 1)
+        row[j:n*n:n] = 1.0
+        row[-1] = 1.0
+        constraints.append(row.tolist())
+    return problem_dict(f'assignment_{n}_{seed}', 'assignment', 'Minimize', cost.ravel(), constraints, ['=']*(2*n), ['>= 0']*(n*n))
+
+
+def transportation(n_supply, n_demand, seed = 0):
+    '''
+        Function generates a balanced transportation problem: minimize the shipping cost subject to
+    shipping at most the supply of each source and at least the demand of each destination.
+    '''
+    rng = np.random.default_rng(seed)
+    demand = rng.integers(5, 30, n_demand).astype(float)
+    supply = np.full(n_supply, demand.sum()//n_supply)
+    supply[0] += demand.sum() - supply.sum()
+    cost = rng.integers(1, 20, (n_supply, n_demand)).astype(float)
+    n = n_supply*n_demand
+    constraints = []
+    for i in range(n_supply):
+        row = np.zeros(n + 1)
+        row[i*n_demand:(i + 1)*n_demand] = 1.0
+        row[-1] = supply[i]
+        constraints.append(row.tolist())
+    for j in range(n_demand):
+        row = np.zeros(n + 1)
+        row[j:n:n_demand] = 1.0
+        row[-1] = demand[j]
+        constraints.append(row.tolist())
+    return problem_dict(f'transportation_{n_supply}x{n_demand}_{seed}', 'transportation', 'Minimize', cost.ravel(),
+                        constraints, ['<=']*n_supply + ['>=']*n_demand, ['>= 0']*n)
+
+
+def infeasible(n_var, seed = 0):
+    '''
+        Function generates an infeasible problem: sum x_j >= 2n together with sum x_j <= n.
+    '''
+    rng = np.random.default_rng(seed)
+    c = rng.uniform(0.1, 1.0, n_var)
+    constraints = [[1.0]*n_var + [2.0*n_var], [1.0]*n_var + [float(n_var)]]
+    return problem_dict(f'infeasible_{n_var}_{seed}', 'infeasible', 'Minimize', c, constraints, ['>=', '<='], ['>= 0']*n_var,
+                        expected = 'no_solution')
+
+
+def unbounded(n_var, seed = 0):
+    '''
+        Function generates an unbounded problem: maximize sum x_j subject to x_1 - x_2 <= 1 (and
+    more rows of the same kind).
+    '''
+    rng = np.random.default_rng(seed)
+    constraints = []
+    for i in range(n_var - 1):
+        row = [0.0]*n_var + [float(rng.integers(1, 10))]
+        row[i], row[i + 1] = 1.0, -1.0
+        constraints.append(row)
+    return problem_dict(f'unbounded_{n_var}_{seed}', 'unbounded', 'Maximize', [1.0]*n_var, constraints,
+                        ['<=']*(n_var - 1), ['>= 0']*n_var, expected = 'no_solution')
+
+
+SUITES = {
+    'small': lambda: [random_dense(10, 8, 0), random_dense(20, 15, 1), random_sparse(40, 30, 0.1, 0),
+                      klee_minty(6), assignment(4), transportation(3, 4), infeasible(5), unbounded(5)],
+    'medium': lambda: [random_dense(100, 80, 0), random_dense(200, 150, 1), random_sparse(400, 300, 0.02, 0),
+                       klee_minty(10), assignment(10), transportation(10, 15), infeasible(50), unbounded(50)],
+    'large': lambda: [random_dense(500, 400, 0), random_sparse(2000, 1500, 0.005, 0), klee_minty(14),
+                      assignment(25), transportation(30, 40), infeasible(500), unbounded(500)],
+}
+
+ENGINES = ['primal', 'two_phase', 'dual', 'revised', 'interior_point', 'bounded', 'network', 'auto']
+
+
+# ---------------------------------------------------------------- measurement
+
+def applicable(engine, A, tol = 1e-9):
+    '''
+        Function checks if an engine can start on a tableau: the primal and dual simplex need a unit
+    column in every row, the primal simplex needs b >= 0 and the dual simplex reduced costs >= 0,
+    the network simplex needs a network (see network_simplex.network_structure).
+    '''
+    if engine == 'network':
+        return is_network(A)
+    if engine not in ('primal', 'dual'):
+        return True
+    A = A.toarray() if is_sparse(A) else A
+    if np.any(find_unit_basis(A[1:, :-1]) < 0):
+        return False
+    if engine == 'primal':
+        return bool(np.all(A[1:, -1] >= -tol))
+    return bool(np.all(A[0, :-1] >= -tol))
+
+
+def run_once(problem, engine, A, free_var, trace = False):
+    '''
+        Function solves a problem once with an engine.
+    Input:
+        trace: count the pivots with an observer and trace the memory (slower, not for timing)
+    Output:
+        B, z, solver: result of solve_linear_programming_problem
+        seconds: wall time
+        pivots: number of pivots (None if not traced)
+        peak: peak of traced memory in bytes (None if not traced)
+    '''
+    observer = SolveObserver() if trace else None
+    A = A.copy()
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        if engine == 'bounded':
+            # the bounded-variable simplex starts from the original form, its conversion is timed too
+            B, z, solver = solve_bounded_problem(problem['n_var'], problem['n_constraint'], problem['func_type'], problem['func_coef'],
+                                                 problem['constraints'], problem['constraint_signs'], problem['variable_cons'],
+                                                 observer = observer)
+        else:
+            B, z, solver = solve_linear_programming_problem(problem['n_var'], A, free_var, problem['func_type'], engine, observer = observer)
+    seconds = time.perf_counter() - start
+    if not trace:
+        return B, z, solver, seconds, None, None
+
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return B, z, solver, seconds, observer.total_pivots, peak
+
+
+def benchmark_problem(problem, engine, repeat = 3):
+    '''
+        Function measures one engine on one problem: best wall time of repeat runs, then one traced
+    run for the pivot count and the peak memory.
+    Output:
+        result: python dict of the measurements
+    '''
+    result = {'problem': problem['id'], 'family': problem['family'], 'engine': engine,
+              'n_var': problem['n_var'], 'n_constraint': problem['n_constraint'], 'expected': problem['expected']}
+    try:
+        A, free_var = transfer_to_standard_form(problem['n_var'], problem['n_constraint'], problem['func_type'], problem['func_coef'],
+                                                problem['constraints'], problem['constraint_signs'], problem['variable_cons'])
+        if not applicable(engine, A):
+            result['status'] = 'skipped'
+            return result
+
+        times = []
+        for _ in range(repeat):
+            B, z, solver, seconds, pivots, peak = run_once(problem, engine, A, free_var)
+            times.append(seconds)
+        B, z, solver, seconds, pivots, peak = run_once(problem, engine, A, free_var, trace = True)
+    except Exception as e:
+        result.update({'status': 'error', 'message': f'{type(e).__name__}: {e}'})
+        return result
+
+    status = 'optimal' if isinstance(B, np.ndarray) else 'no_solution'
+    correct = status == problem['expected']
+    if correct and problem['z'] is not None:
+        correct = same_value(z, problem['z'])
+    result.update({'status': status, 'correct': bool(correct), 'z': None if z is None else float(z),
+                   'time': min(times), 'pivots': pivots, 'peak_bytes': peak})
+    return result
+
+
+def same_value(z, reference, tol = 1e-6):
+    return abs(z - reference) <= tol*max(1.0, abs(reference))
+
+
+def check_agreement(results):
+    '''
+        Function marks the optimal values of a problem which disagree with the value found by most
+    engines (for problems whose optimal value is not known in advance).
+    '''
+    values = [r['z'] for r in results if r['status'] == 'optimal']
+    if not values:
+        return
+    reference = max(values, key = lambda z: sum(same_value(v, z) for v in values))
+    for r in results:
+        if r['status'] == 'optimal' and not same_value(r['z'], reference):
+            r['correct'] = False
+
+
+def run_benchmarks(problems, engines = ENGINES, repeat = 3, log = None):
+    '''
+        Function benchmarks every engine on every problem.
+    Input:
+        problems: iterable of problems built by the generators
+        engines: methods of solve_linear_programming_problem
+        repeat: number of timed runs (the best time is kept)
+        log: file to print progress lines to (None: silent)
+    Output:
+        report: python dict with the environment ("meta") and the measurements ("results")
+    '''
+    results = []
+    for problem in problems:
+        problem_results = [benchmark_problem(problem, engine, repeat) for engine in engines]
+        if problem['z'] is None:
+            check_agreement(problem_results)
+        results += problem_results
+
+        if log is not None:
+            for r in problem_results:
+                print(f"{r['problem']:28s} {r['engine']:15s} {r['status']:12s} {r.get('correct', '')!s:6s} "
+                      f"{r.get('time', float('nan')):10.5f}s {r.get('pivots')}", file = log)
+
+    meta = {'python': platform.python_version(), 'numpy': np.__version__, 'platform': platform.platform(),
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S'), 'repeat': repeat}
+    return {'meta': meta, 'results': results}
+
+
+def compare(report, baseline, time_tolerance = 0.25, min_time = 1e-3):
+    '''
+        Function compares a report with a stored baseline report.
+    A regression is a result which became wrong or failed, needs more pivots, or is slower than
+    (1 + time_tolerance) times the baseline (times below min_time are ignored as noise).
+    Output:
+        regressions: list of python dicts describing each regression
+    '''
+    old = {(r['problem'], r['engine']): r for r in baseline['results']}
+    regressions = []
+    for r in report['results']:
+        b = old.get((r['problem'], r['engine']))
+        if b is None or b['status'] in ('skipped', 'error'):
+            continue
+        key = {'problem': r['problem'], 'engine': r['engine']}
+        if r['status'] == 'error' or (b.get('correct') and not r.get('correct')):
+            regressions.append(dict(key, kind = 'correctness', baseline = b['status'], current = r['status']))
+            continue
+        if b.get('pivots') is not None and r.get('pivots') is not None and r['pivots'] > b['pivots']:
+            regressions.append(dict(key, kind = 'pivots', baseline = b['pivots'], current = r['pivots']))
+        if r.get('time') is not None and max(r['time'], b['time']) > min_time and r['time'] > (1 + time_tolerance)*b['time']:
+            regressions.append(dict(key, kind = 'time', baseline = b['time'], current = r['time']))
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Benchmark the linear programming engines on generated problems.")
+    parser.add_argument('--suite', default = 'small', choices = sorted(SUITES), help = "problem suite")
+    parser.add_argument('--engines', default = ','.join(ENGINES), help = "comma separated engines")
+    parser.add_argument('--repeat', type = int, default = 3, help = "timed runs per problem and engine")
+    parser.add_argument('-o', '--output', default = None, help = "JSON result file")
+    parser.add_argument('--baseline', default = None, help = "JSON result file to compare with")
+    parser.add_argument('--time-tolerance', type = float, default = 0.25, help = "allowed relative slowdown")
+    args = parser.parse_args()
+
+    report = run_benchmarks(SUITES[args.suite](), args.engines.split(','), args.repeat, log = sys.stderr)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent = 1)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.time_tolerance)
+        for r in regressions:
+            print(json.dumps(r))
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,342 @@
+from time import perf_counter
+
+import numpy as np
+
+from linear_programming_functions import is_sparse, find_unit_basis, pivot, get_optimal_value
+from pricing import make_pricing
+
+
+def variable_bounds(n_var, variable_cons = None, lower = None, upper = None):
+    '''
+        Function computes the bounds of the original variables.
+    Input:
+        n_var: number of variables
+        variable_cons: constraints of variables ("<= 0", ">= 0", "Free"), None for ">= 0" everywhere
+        lower: lower bounds of variables (-inf if none), intersected with variable_cons if given
+        upper: upper bounds of variables (inf if none), intersected with variable_cons if given
+    Output:
+        lower, upper: numpy arrays of bounds
+    '''
+    if variable_cons is None:
+        variable_cons = ['>= 0']*n_var
+    variable_cons = np.array(variable_cons[:n_var])
+    low = np.where(variable_cons == '>= 0', 0.0, -np.inf)
+    up = np.where(variable_cons == '<= 0', 0.0, np.inf)
+    if lower is not None:
+        low = np.maximum(low, np.array(lower, dtype = float))
+    if upper is not None:
+        up = np.minimum(up, np.array(upper, dtype = float))
+    return low, up
+
+
+def transfer_to_bounded_form(n_var, n_constraint, func_type, func_coef, constraints, constraint_signs, variable_cons = None,
+                             lower = None, upper = None):
+    '''
+        Function transfers a problem into the form of the bounded-variable simplex
+            min c*x  subject to  C*x + s = b, lower <= (x, s) <= upper
+    Negative, free and bounded variables keep their single column, their bounds are attributes of the
+    column. Every constraint gets one slack column: in [0, inf) for "<=", in (-inf, 0] for ">=" and
+    fixed at 0 for "=".
+    Input:
+        same as transfer_to_standard_form, with optional lower and upper bounds of variables (see variable_bounds)
+    Output:
+        A: tableau of n_constraint + 1 rows and n_var + n_constraint + 1 columns (costs in row 0, right-hand side in the last column)
+        lower, upper: bounds of the n_var + n_constraint columns
+    The inputs are not modified.
+    '''
+    func_coef = np.array(func_coef[:n_var], dtype = float)
+    if func_type == "Maximize":
+        func_coef = -func_coef
+
+    if is_sparse(constraints):
+        constraints = constraints.toarray()
+    constraints = np.array(constraints, dtype = float).reshape(n_constraint, n_var + 1)
+    signs = np.array(constraint_signs[:n_constraint])
+
+    A = np.zeros((n_constraint + 1, n_var + n_constraint + 1))
+    A[0, :n_var] = func_coef
+    A[1:, :n_var] = constraints[:, :n_var]
+    A[1:, n_var:-1] = np.eye(n_constraint)
+    A[1:, -1] = constraints[:, n_var]
+
+    low, up = variable_bounds(n_var, variable_cons, lower, upper)
+    lower = np.concatenate((low, np.where(signs == '<=', 0.0, np.where(signs == '>=', -np.inf, 0.0))))
+    upper = np.concatenate((up, np.where(signs == '>=', 0.0, np.where(signs == '<=', np.inf, 0.0))))
+    return A, lower, upper
+
+
+def bounded_ratio_test(x, basis, lower, upper, column, entering, direction, tol = 1e-9, ties = None):
+    '''
+        Function finds how far the entering variable can move before a basic variable or the entering
+    variable itself reaches a bound.
+    Input:
+        x: values of all variables
+        basis: index of the basic variable of each row
+        lower, upper: bounds of all variables
+        column: constraint part of the entering column of the tableau
+        entering: index of the entering variable
+        direction: 1 if the entering variable increases, -1 if it decreases
+        ties: if given (basis), ratio ties are broken by the smallest basic variable index
+    Output:
+        step: length of the move (inf if the objective is unbounded)
+        row: index of the leaving row (None for a bound flip of the entering variable)
+    '''
+    # x_B moves by -direction*step*column
+    alpha = direction*column
+    x_B = x[basis]
+    ratios = np.full(len(basis), np.inf)
+    with np.errstate(invalid = 'ignore'):
+        decrease = (alpha > tol) & np.isfinite(lower[basis])
+        increase = (alpha < -tol) & np.isfinite(upper[basis])
+        ratios[decrease] = (x_B[decrease] - lower[basis][decrease])/alpha[decrease]
+        ratios[increase] = (upper[basis][increase] - x_B[increase])/(-alpha[increase])
+    np.maximum(ratios, 0.0, out = ratios)
+
+    row = np.argmin(ratios) if len(ratios) else None
+    if row is not None and ties is not None and np.isfinite(ratios[row]):
+        candidates = np.where(ratios <= ratios[row] + tol)[0]
+        row = candidates[np.argmin(ties[candidates])]
+    step = ratios[row] if row is not None else np.inf
+
+    flip = upper[entering] - lower[entering]
+    if flip <= step:
+        return flip, None
+    return step, row
+
+
+def bounded_iterations(W, x, basis, cost, lower, upper, n_candidates, pricing = None, tol = 1e-9, max_iter = None, observer = None):
+    '''
+        Function runs the bounded-variable primal simplex on a tableau. A nonbasic variable rests at
+    one of its bounds (free variables at zero), and it either enters the basis or, when it reaches
+    its opposite bound first, just flips to that bound without a basis change.
+    Input:
+        W: tableau without right-hand side, row 0 holds the reduced costs, changed in place
+        x: values of all variables (basic variables consistent with the nonbasic ones), changed in place
+        basis: index of the basic variable of each row, changed in place
+        cost: cost vector, used for the objective value reported to the observer
+        lower, upper: bounds of all variables
+        n_candidates: only columns with index < n_candidates may enter the basis
+        pricing: pricing strategy choosing the entering column (see pricing.make_pricing)
+        tol: optimality and pivot tolerance
+        max_iter: maximal number of iterations
+        observer: instrumentation.SolveObserver told about every pivot and bound flip (None: no instrumentation)
+    Output:
+        status: "optimal", "unbounded" or "iteration_limit"
+    '''
+    pricing = make_pricing(pricing)
+    pricing.start(n_candidates, np.einsum('ij,ij->j', W[1:, :n_candidates], W[1:, :n_candidates])
+                  if pricing.needs_products else None)
+    ties = basis if pricing.lowest_index_leaving else None
+    nonbasic = np.ones(W.shape[1], dtype = bool)
+    nonbasic[basis] = False
+
+    iteration = 0
+    while max_iter is None or iteration < max_iter:
+        if observer is not None:
+            start = perf_counter()
+
+        # a nonbasic variable is attractive if it can move against the sign of its reduced cost
+        d = W[0]
+        can_increase = nonbasic & (x < upper - tol)
+        can_decrease = nonbasic & (x > lower + tol)
+
+        def price(cols):
+            return np.where(can_increase[cols] & (d[cols] < 0), d[cols],
+                            np.where(can_decrease[cols] & (d[cols] > 0), -d[cols], 0.0))
+
+        entering = pricing.select(price, n_candidates, tol)
+        if entering is None:
+            return "optimal"
+        direction = 1.0 if d[entering] < 0 else -1.0
+
+        if observer is not None:
+            priced = perf_counter()
+
+        column = W[1:, entering]
+        step, row = bounded_ratio_test(x, basis, lower, upper, column, entering, direction, tol, ties)
+        if step == np.inf:
+            return "unbounded"
+
+        # move the entering variable and the basic variables
+        x[basis] -= direction*step*column
+        x[entering] += direction*step
+
+        if observer is not None:
+            tested = perf_counter()
+
+        if row is None:
+            # bound flip: the entering variable stays nonbasic at its other bound
+            x[entering] = upper[entering] if direction > 0 else lower[entering]
+            leaving = entering
+        else:
+            leaving = basis[row]
+            x[leaving] = lower[leaving] if direction*column[row] > 0 else upper[leaving]
+
+            if pricing.needs_pivot_row:
+                products = W[1:, :n_candidates].T @ column if pricing.needs_products else None
+                pricing.update(W[1 + row, :n_candidates], entering, column, products)
+
+            pivot(W, 1 + row, entering)
+            basis[row] = entering
+            nonbasic[entering] = False
+            nonbasic[leaving] = True
+
+        iteration += 1
+        if observer is not None:
+            observer.pivot(entering, leaving, -1 if row is None else row, cost @ x, priced - start, tested - priced,
+                           perf_counter() - tested)
+
+    return "iteration_limit"
+
+
+def bounded_simplex_algorithm(n_var, A, lower, upper, func_type = 'Minimize', pricing = None, tol = 1e-9, max_iter = None,
+                              observer = None, start = None, return_state = False):
+    '''
+        Function using the bounded-variable simplex algorithm finds optimal solution for linear programming
+    problems whose variables have lower and upper bounds (possibly infinite) instead of sign constraints.
+    A phase 1 minimizing the sum of artificial variables is run on the rows whose starting basic
+    variable violates its bounds.
+    Input:
+        n_var: number of original variables.
+        A: tableau of transfer_to_bounded_form (dense), or the optimal tableau of a previous solve if start is given
+        lower, upper: bounds of all columns of A
+        func_type: type of objective function
+        pricing: pricing strategy choosing pivot column
+        tol: feasibility and optimality tolerance
+        max_iter: maximal number of iterations of each phase
+        observer: instrumentation.SolveObserver (None: no instrumentation)
+        start: state returned with the optimal tableau A by a previous solve of the same constraints,
+               whose bounds may have changed since (warm start: only the rows whose basic variable
+               now violates its bounds need phase 1)
+        return_state: also return the state of the optimal solution, for a warm start
+    Output:
+        A: optimal tableau, its last column holds the values of the basic variables
+        z: optimal value
+        solver: optimal solution X1..Xn
+        state: (basis, values of all variables, costs) or None if a redundant row keeps an artificial variable
+               (only if return_state)
+    '''
+    failed = (None, None, None, None) if return_state else (None, None, None)
+    lower = np.array(lower, dtype = float)
+    upper = np.array(upper, dtype = float)
+    if np.any(lower > upper + tol):
+        return failed
+
+    T = A[1:, :-1].copy()
+    m, n = T.shape
+    if start is None:
+        cost = A[0, :-1].copy()
+
+        # nonbasic variables start at their finite bound closest to zero, free variables at zero
+        x = np.where(np.isfinite(lower), lower, np.where(np.isfinite(upper), upper, 0.0))
+        closer = np.isfinite(upper) & (np.abs(upper) < np.abs(x))
+        x[closer] = upper[closer]
+
+        # a unit column in each row is the starting basic variable, values holds its value (the residual of the row if none)
+        basis = find_unit_basis(T)
+        x[basis[basis >= 0]] = 0.0
+        values = A[1:, -1] - T @ x
+    else:
+        basis, x, cost = start
+        basis = basis.copy()
+        x = x.copy()
+
+        # nonbasic variables outside their new bounds move to the nearest bound
+        nonbasic = np.ones(n, dtype = bool)
+        nonbasic[basis] = False
+        moved = np.where(nonbasic & ((x < lower) | (x > upper)))[0]
+        new = np.clip(x[moved], lower[moved], upper[moved])
+        x[basis] -= T[:, moved] @ (new - x[moved])
+        x[moved] = new
+        values = x[basis]
+    scale = 1.0 + np.abs(values).max(initial = 0.0)
+
+    # the basic variables respecting their bounds are kept
+    in_bounds = np.zeros(m, dtype = bool)
+    rows = np.where(basis >= 0)[0]
+    in_bounds[rows] = (values[rows] >= lower[basis[rows]] - tol) & (values[rows] <= upper[basis[rows]] + tol)
+    x[basis[in_bounds]] = values[in_bounds]
+
+    # the other rows get an artificial variable, the basic variable they replace rests at its bound nearest to its value
+    artificial = np.where(~in_bounds)[0]
+    residual = values[artificial].copy()
+    for k, r in enumerate(artificial):
+        if basis[r] >= 0:
+            j = basis[r]
+            x[j] = min(max(values[r], lower[j]), upper[j])
+            residual[k] = values[r] - x[j]
+    n_art = len(artificial)
+    sign = np.where(residual < 0, -1.0, 1.0)
+    T[artificial] *= sign[:, None]
+
+    W = np.zeros((m + 1, n + n_art))
+    W[1:, :n] = T
+    W[1 + artificial, n + np.arange(n_art)] = 1.0
+    basis[artificial] = n + np.arange(n_art)
+    x = np.concatenate((x, np.abs(residual)))
+    lower = np.concatenate((lower, np.zeros(n_art)))
+    upper = np.concatenate((upper, np.full(n_art, np.inf)))
+    cost = np.concatenate((cost, np.zeros(n_art)))
+
+    if n_art:
+        # phase 1: minimize the sum of the artificial variables
+        W[0, n:] = 1.0
+        W[0] -= W[0, basis] @ W[1:]
+        phase_cost = np.concatenate((np.zeros(n), np.ones(n_art)))
+        if observer is not None:
+            observer.start_phase('phase_1', n_artificial = n_art)
+        status = bounded_iterations(W, x, basis, phase_cost, lower, upper, n, pricing, tol, max_iter, observer)
+        feasible = status == "optimal" and x[n:].sum() <= tol*scale
+        if observer is not None:
+            observer.end_phase('optimal' if feasible else 'infeasible')
+        if not feasible:
+            return failed
+
+        # artificial variables are fixed at zero, basic ones are pivoted out where possible
+        upper[n:] = 0.0
+        x[n:] = 0.0
+        for r in np.where(basis >= n)[0]:
+            candidates = np.where(np.abs(W[1 + r, :n]) > tol)[0]
+            candidates = candidates[np.isin(candidates, basis, invert = True)]
+            if len(candidates):
+                j = candidates[np.argmax(np.abs(W[1 + r, candidates]))]
+                pivot(W, 1 + r, j)
+                basis[r] = j
+
+    # phase 2: reduced costs of the original objective
+    W[0] = cost
+    W[0] -= cost[basis] @ W[1:]
+    if observer is not None:
+        observer.start_phase('phase_2' if n_art else 'primal')
+    status = bounded_iterations(W, x, basis, cost, lower, upper, n, pricing, tol, max_iter, observer)
+    if observer is not None:
+        observer.end_phase(status)
+    if status != "optimal":
+        return failed
+
+    # optimal tableau of the original columns, the right-hand side column holds the basic values
+    B = np.zeros((m + 1, n + 1))
+    B[:, :-1] = W[:, :n]
+    B[0, -1] = -(cost @ x)
+    B[1:, -1] = x[basis]
+    if not return_state:
+        return B, get_optimal_value(B, func_type), x[:n_var].tolist()
+    state = (basis, x[:n], cost[:n]) if np.all(basis < n) else None
+    return B, get_optimal_value(B, func_type), x[:n_var].tolist(), state
+
+
+def solve_bounded_problem(n_var, n_constraint, func_type, func_coef, constraints, constraint_signs, variable_cons = None,
+                          lower = None, upper = None, pricing = None, observer = None):
+    '''
+        Function solves a problem in original form with the bounded-variable simplex.
+    Input:
+        same as transfer_to_bounded_form
+        pricing, observer: see bounded_simplex_algorithm
+    Output:
+        A: optimal tableau
+        z: optimal value
+        solver: optimal solution X1..Xn
+    '''
+    A, lower, upper = transfer_to_bounded_form(n_var, n_constraint, func_type, func_coef, constraints, constraint_signs,
+                                               variable_cons, lower, upper)
+    return bounded_simplex_algorithm(n_var, A, lower, upper, func_type, pricing, observer = observer)
@@ -0,0 +1,235 @@
+import heapq
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+import numpy as np
+
+from linear_programming_functions import get_optimal_value
+from bounded_simplex import transfer_to_bounded_form, bounded_simplex_algorithm
+
+INTEGER_TYPES = ('Integer', 'Binary')
+NODE_SELECTIONS = ('best_bound', 'depth_first')
+
+# problem of the worker processes, set once per process by init_worker
+WORKER_PROBLEM = None
+
+
+def is_mixed_integer(variable_cons):
+    '''
+        Function checks whether a problem has integer or binary variables.
+    '''
+    return variable_cons is not None and any(con in INTEGER_TYPES for con in variable_cons)
+
+
+def relax_variable_cons(n_var, variable_cons):
+    '''
+        Function computes the LP relaxation of the constraints of variables.
+    Input:
+        n_var: number of variables
+        variable_cons: constraints of variables ("<= 0", ">= 0", "Free", "Integer" for integers >= 0, "Binary" for 0 or 1)
+    Output:
+        relaxed_cons: constraints of variables of the relaxation ("Integer" and "Binary" become ">= 0")
+        upper: upper bounds of variables (1 for binary variables, inf otherwise)
+        integer: boolean numpy array, True for integer and binary variables
+    '''
+    variable_cons = list(variable_cons[:n_var])
+    integer = np.array([con in INTEGER_TYPES for con in variable_cons], dtype = bool)
+    upper = np.array([1.0 if con == 'Binary' else np.inf for con in variable_cons])
+    relaxed_cons = ['>= 0' if con in INTEGER_TYPES else con for con in variable_cons]
+    return relaxed_cons, upper, integer
+
+
+class Node:
+    '''
+        Open node of the search tree.
+    Attributes:
+        lower, upper: bounds of the original variables at the node
+        bound: optimal value (minimization form) of the parent's relaxation, a lower bound of the node
+        depth: number of branchings from the root
+        start: (optimal tableau, state) of the parent's relaxation for a warm start, None for a cold start
+    '''
+    def __init__(self, lower, upper, bound, depth, start = None):
+        self.lower = lower
+        self.upper = upper
+        self.bound = bound
+        self.depth = depth
+        self.start = start
+
+
+def solve_relaxation(problem, lower, upper, start = None, observer = None):
+    '''
+        Function solves the LP relaxation of a node with the bounded-variable simplex.
+    Input:
+        problem: (A, lower and upper bounds of the slack columns, n_var) of transfer_to_bounded_form
+        lower, upper: bounds of the original variables at the node
+        start: (optimal tableau, state) of the parent's relaxation (None: cold start from A)
+        observer: instrumentation.SolveObserver (None: no instrumentation)
+    Output:
+        z: optimal value of the minimization form (None if the relaxation has no optimal solution)
+        x: numpy array of the values of the original variables
+        B: optimal tableau
+        state: state of the optimal solution for the warm start of the children (None if none)
+    '''
+    A, slack_lower, slack_upper, n_var = problem
+    lower = np.concatenate((lower, slack_lower))
+    upper = np.concatenate((upper, slack_upper))
+    if start is not None:
+        B, state = start
+        B, z, solver, state = bounded_simplex_algorithm(n_var, B, lower, upper, observer = observer, start = state,
+                                                        return_state = True)
+    else:
+        B, z, solver, state = bounded_simplex_algorithm(n_var, A, lower, upper, observer = observer, return_state = True)
+    if B is None:
+        return None, None, None, None
+    return z, np.array(solver), B, state
+
+
+def init_worker(problem):
+    global WORKER_PROBLEM
+    WORKER_PROBLEM = problem
+
+
+def solve_node(lower, upper, start):
+    '''
+        Function solves the relaxation of a node in a worker process (see solve_relaxation).
+    '''
+    return solve_relaxation(WORKER_PROBLEM, lower, upper, start)
+
+
+def branch_and_bound(n_var, n_constraint, func_type, func_coef, constraints, constraint_signs, variable_cons,
+                     node_selection = 'best_bound', gap = 1e-6, time_limit = None, max_nodes = None, workers = 1,
+                     int_tol = 1e-6, observer = None, return_info = False):
+    '''
+        Function finds optimal solution for mixed integer linear programming problems by branch and bound.
+    The relaxation of every node is solved by the bounded-variable simplex; a child only changes one
+    bound of its parent, so it is warm-started from the parent's optimal tableau and basis: only the row
+    whose basic variable violates the new bound gets an artificial variable, and a short phase 1 and
+    phase 2 from the parent's basis replace a full solve. The search branches on the most fractional variable.
+    Input:
+        same as transfer_to_standard_form, variable_cons may also be "Integer" (integers >= 0) or "Binary" (0 or 1)
+        node_selection: "best_bound" (open node with the lowest bound first, proves optimality with few nodes)
+                        or "depth_first" (newest node first, finds solutions early and keeps few open nodes)
+        gap: relative gap between the best solution and the best bound at which the search stops
+        time_limit: seconds after which the search stops with the best solution found (None: no limit)
+        max_nodes: maximal number of solved nodes (None: no limit)
+        workers: number of processes solving open nodes in parallel (1: in this process)
+        int_tol: distance to the nearest integer below which a value is integral
+        observer: instrumentation.SolveObserver of the relaxations (only with workers = 1)
+        return_info: also return the statistics of the search
+    Output:
+        A: optimal tableau of the relaxation of the best node
+        z: optimal value (value of the best solution found if a limit stopped the search)
+        solver: optimal solution X1..Xn
+        info: python dict with "status" ("optimal", "time_limit", "node_limit", "infeasible" or "no_solution"
+              if the root relaxation is infeasible or unbounded), "nodes",
+              "bound" (best bound of the objective), "gap" and "time" (only if return_info)
+    '''
+    if node_selection not in NODE_SELECTIONS:
+        raise ValueError("Unknown node selection: %s" % node_selection)
+    start_time = time.perf_counter()
+    relaxed_cons, int_upper, integer = relax_variable_cons(n_var, variable_cons)
+    A, lower, upper = transfer_to_bounded_form(n_var, n_constraint, func_type, func_coef, constraints, constraint_signs,
+                                               relaxed_cons, upper = int_upper)
+    problem = (A, lower[n_var:], upper[n_var:], n_var)
+    integer = np.where(integer)[0]
+    # integer variables keep integer bounds, so branching always cuts off the fractional value
+    lower[:n_var][integer] = np.ceil(lower[:n_var][integer] - int_tol)
+    upper[:n_var][integer] = np.floor(upper[:n_var][integer] + int_tol)
+
+    # open nodes are ordered by bound (best bound) or by reverse creation order (depth first)
+    open_nodes = []
+    counter = 0
+
+    def push(node):
+        nonlocal counter
+        counter += 1
+        key = node.bound if node_selection == 'best_bound' else -counter
+        heapq.heappush(open_nodes, (key, counter, node))
+
+    push(Node(lower[:n_var].copy(), upper[:n_var].copy(), -np.inf, 0))
+    best = (np.inf, None, None)
+    running = {}
+    n_nodes = 0
+    status = None
+
+    def cutoff():
+        # nodes whose bound is within the gap of the best solution cannot improve it enough
+        z = best[0]
+        return z - gap*max(1.0, abs(z)) if z < np.inf else np.inf
+
+    def process(node, result):
+        nonlocal best, n_nodes, status
+        n_nodes += 1
+        z, x, B, state = result
+        if z is None and node.depth == 0:
+            status = 'no_solution'
+        if z is None or z >= cutoff():
+            return
+        values = x[integer]
+        fraction = np.abs(values - np.round(values))
+        if len(integer) == 0 or fraction.max() <= int_tol:
+            x[integer] = np.round(values) + 0.0
+            best = (z, x, B)
+            return
+
+        # two children split the most fractional variable, the nearer side is solved first by depth first
+        j = integer[np.argmax(fraction)]
+        start = (B, state) if state is not None else None
+        down_upper = node.upper.copy()
+        down_upper[j] = math.floor(x[j])
+        up_lower = node.lower.copy()
+        up_lower[j] = math.ceil(x[j])
+        down = Node(node.lower, down_upper, z, node.depth + 1, start)
+        up = Node(up_lower, node.upper, z, node.depth + 1, start)
+        for child in ((up, down) if x[j] - math.floor(x[j]) < 0.5 else (down, up)):
+            push(child)
+
+    executor = None
+    if workers > 1:
+        executor = ProcessPoolExecutor(workers, initializer = init_worker, initargs = (problem,))
+    try:
+        while open_nodes or running:
+            if time_limit is not None and time.perf_counter() - start_time >= time_limit:
+                status = 'time_limit'
+                break
+            if max_nodes is not None and n_nodes >= max_nodes:
+                status = 'node_limit'
+                break
+
+            if executor is None:
+                key, _, node = heapq.heappop(open_nodes)
+                if node.bound < cutoff():
+                    process(node, solve_relaxation(problem, node.lower, node.upper, node.start, observer))
+                continue
+
+            while open_nodes and len(running) < workers:
+                key, _, node = heapq.heappop(open_nodes)
+                if node.bound < cutoff():
+                    running[executor.submit(solve_node, node.lower, node.upper, node.start)] = node
+            if running:
+                remaining = None if time_limit is None else max(0.0, time_limit - (time.perf_counter() - start_time))
+                done, _ = wait(running, timeout = remaining, return_when = FIRST_COMPLETED)
+                for future in done:
+                    process(running.pop(future), future.result())
+    finally:
+        # nodes still running are not waited for, so the time limit holds; their late results are dropped
+        if executor is not None:
+            executor.shutdown(wait = False, cancel_futures = True)
+
+    z, x, B = best
+    pending = [node.bound for _, _, node in open_nodes] + [node.bound for node in running.values()]
+    bound = min(min(pending, default = z), z)
+    if status is None:
+        status = 'optimal' if B is not None else 'infeasible'
+    info = {'status': status, 'nodes': n_nodes, 'time': time.perf_counter() - start_time,
+            'bound': None, 'gap': None}
+    if np.isfinite(bound):
+        info['bound'] = float(-bound if func_type == 'Maximize' else bound)
+    if B is not None and np.isfinite(bound):
+        info['gap'] = float((z - bound)/max(1.0, abs(z)))
+
+    if B is None:
+        return (None, None, None, info) if return_info else (None, None, None)
+    result = (B, get_optimal_value(B, func_type), x.tolist())
+    return result + (info,) if return_info else result
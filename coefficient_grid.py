@@ -0,0 +1,349 @@
+import tkinter as tk
+from tkinter import ttk
+from tkinter import messagebox
+
+import numpy as np
+
+CONSTRAINT_SIGNS = ['<=', '>=', '=']
+VARIABLE_SIGNS = ['>= 0', '<= 0', 'Free', 'Integer', 'Binary']
+
+
+def parse_block(text, delimiter = None):
+    '''
+        Function splits pasted or imported text into a block of cells.
+    Input:
+        text: lines of cells separated by tabs, commas, semicolons or spaces
+        delimiter: cell separator (None: guessed from the first line)
+    Output:
+        block: list of rows (lists of stripped cell strings)
+    '''
+    lines = [line for line in text.splitlines() if line.strip()]
+    if delimiter is None and lines:
+        delimiter = next((d for d in ('\t', ',', ';') if d in lines[0]), None)
+    return [[cell.strip() for cell in line.split(delimiter)] for line in lines]
+
+
+class CoefficientGrid(ttk.Frame):
+    """ a scrollable grid of the coefficients of a problem which only draws its visible cells
+
+    Rows: objective function, one row per constraint, constraints of variables.
+    Columns: X1..Xn, sign of the constraint, right-hand side.
+    The values are kept in numpy arrays, empty cells are nan.
+    """
+    cell_width = 64
+    cell_height = 24
+    header_width = 56
+    header_height = 24
+
+    def __init__(self, parent, n_var, n_constraint):
+        ttk.Frame.__init__(self, parent)
+        self.n_var = n_var
+        self.n_constraint = n_constraint
+        self.n_rows = n_constraint + 2
+        self.n_cols = n_var + 2
+
+        # row 0: objective function (last column unused), rows 1..: coefficients and right-hand side
+        self.values = np.full((n_constraint + 1, n_var + 1), np.nan)
+        self.signs = np.array(['<=']*n_constraint, dtype = object)
+        self.variable_cons = np.array(['>= 0']*n_var, dtype = object)
+
+        self.canvas = tk.Canvas(self, bg='#FFFFFF', highlightthickness=0,
+                                xscrollincrement=self.cell_width, yscrollincrement=self.cell_height)
+        self.x_scroll = ttk.Scrollbar(self, orient='horizontal', command=self.scroll_x)
+        self.y_scroll = ttk.Scrollbar(self, orient='vertical', command=self.scroll_y)
+        self.canvas.configure(xscrollcommand=self.x_scroll.set, yscrollcommand=self.y_scroll.set,
+                              scrollregion=(0, 0, self.header_width + self.n_cols*self.cell_width,
+                                            self.header_height + self.n_rows*self.cell_height))
+
+        self.canvas.grid(row=0, column=0, sticky='nsew')
+        self.y_scroll.grid(row=0, column=1, sticky='ns')
+        self.x_scroll.grid(row=1, column=0, sticky='ew')
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        # one entry is moved to the cell being edited
+        self.editor = tk.Entry(self.canvas, bd=0, justify='right')
+        self.editor.bind('<Return>', lambda e: self.move_edit(1, 0))
+        self.editor.bind('<Tab>', lambda e: self.move_edit(0, 1))
+        self.editor.bind('<Shift-Tab>', lambda e: self.move_edit(0, -1))
+        self.editor.bind('<Escape>', lambda e: self.stop_edit(commit=False))
+        self.editor.bind('<FocusOut>', lambda e: self.stop_edit())
+        self.editor.bind('<<Paste>>', self.on_paste)
+        self.editing = None
+        self.anchor = (0, 0)
+
+        self.canvas.bind('<Configure>', lambda e: self.redraw())
+        self.canvas.bind('<Button-1>', self.click)
+        self.canvas.bind('<<Paste>>', self.on_paste)
+        self.canvas.bind('<MouseWheel>', lambda e: self.scroll_y('scroll', -int(e.delta/120) or (-1 if e.delta > 0 else 1), 'units'))
+        self.canvas.bind('<Shift-MouseWheel>', lambda e: self.scroll_x('scroll', -int(e.delta/120) or (-1 if e.delta > 0 else 1), 'units'))
+        self.canvas.bind('<Button-4>', lambda e: self.scroll_y('scroll', -1, 'units'))
+        self.canvas.bind('<Button-5>', lambda e: self.scroll_y('scroll', 1, 'units'))
+
+    # ------------------------------------------------------------ cells
+
+    def cell_kind(self, row, col):
+        """ 'number', 'sign', 'variable' or None for the unused cells """
+        if row == 0:
+            return 'number' if col < self.n_var else None
+        if row <= self.n_constraint:
+            return 'sign' if col == self.n_var else 'number'
+        return 'variable' if col < self.n_var else None
+
+    def value_index(self, row, col):
+        """ index of a number cell in self.values """
+        return row, (col if col < self.n_var else self.n_var)
+
+    def cell_text(self, row, col):
+        kind = self.cell_kind(row, col)
+        if kind == 'number':
+            value = self.values[self.value_index(row, col)]
+            return '' if np.isnan(value) else f'{value:g}'
+        if kind == 'sign':
+            return self.signs[row - 1]
+        if kind == 'variable':
+            return self.variable_cons[col]
+        return ''
+
+    def check_cell(self, row, col, text):
+        """ converted value of a cell, raises ValueError if text does not fit the cell """
+        kind = self.cell_kind(row, col)
+        if kind == 'number':
+            return float(text) if text != '' else np.nan
+        if kind == 'sign' and text in CONSTRAINT_SIGNS:
+            return text
+        if kind == 'variable' and text in VARIABLE_SIGNS:
+            return text
+        raise ValueError(f'"{text}" does not fit cell ({row}, {col})')
+
+    def set_cell(self, row, col, value):
+        kind = self.cell_kind(row, col)
+        if kind == 'number':
+            self.values[self.value_index(row, col)] = value
+        elif kind == 'sign':
+            self.signs[row - 1] = value
+        elif kind == 'variable':
+            self.variable_cons[col] = value
+
+    # ------------------------------------------------------------ drawing
+
+    def cell_box(self, row, col):
+        x = self.header_width + col*self.cell_width
+        y = self.header_height + row*self.cell_height
+        return x, y, x + self.cell_width, y + self.cell_height
+
+    def visible_range(self):
+        """ rows and columns intersecting the visible part of the canvas """
+        x0, y0 = self.canvas.canvasx(0), self.canvas.canvasy(0)
+        width, height = self.canvas.winfo_width(), self.canvas.winfo_height()
+        first_col = max(0, int((x0 - self.header_width)//self.cell_width))
+        last_col = min(self.n_cols, int((x0 + width - self.header_width)//self.cell_width) + 1)
+        first_row = max(0, int((y0 - self.header_height)//self.cell_height))
+        last_row = min(self.n_rows, int((y0 + height - self.header_height)//self.cell_height) + 1)
+        return range(first_row, last_row), range(first_col, last_col), x0, y0
+
+    def row_name(self, row):
+        if row == 0:
+            return 'Obj'
+        if row <= self.n_constraint:
+            return f'C{row}'
+        return 'Var'
+
+    def col_name(self, col):
+        if col < self.n_var:
+            return f'X{col + 1}'
+        return 'sign' if col == self.n_var else 'b'
+
+    def redraw(self):
+        canvas = self.canvas
+        canvas.delete('cell')
+        rows, cols, x0, y0 = self.visible_range()
+
+        for row in rows:
+            for col in cols:
+                x1, y1, x2, y2 = self.cell_box(row, col)
+                kind = self.cell_kind(row, col)
+                fill = '#FFFFFF' if kind == 'number' else '#F0F0F0' if kind else '#D9D9D9'
+                if (row, col) == self.anchor:
+                    fill = '#DDEEFF'
+                canvas.create_rectangle(x1, y1, x2, y2, fill=fill, outline='#BBBBBB', tags='cell')
+                canvas.create_text(x2 - 4 if kind == 'number' else (x1 + x2)/2, (y1 + y2)/2, text=self.cell_text(row, col),
+                                   anchor='e' if kind == 'number' else 'center', tags='cell')
+
+        # headers stay on the top and left edges of the view
+        for col in cols:
+            x1, _, x2, _ = self.cell_box(0, col)
+            canvas.create_rectangle(x1, y0, x2, y0 + self.header_height, fill='#333333', outline='#555555', tags='cell')
+            canvas.create_text((x1 + x2)/2, y0 + self.header_height/2, text=self.col_name(col), fill='#FFFFFF', tags='cell')
+        for row in rows:
+            _, y1, _, y2 = self.cell_box(row, 0)
+            canvas.create_rectangle(x0, y1, x0 + self.header_width, y2, fill='#333333', outline='#555555', tags='cell')
+            canvas.create_text(x0 + self.header_width/2, (y1 + y2)/2, text=self.row_name(row), fill='#FFFFFF', tags='cell')
+        canvas.create_rectangle(x0, y0, x0 + self.header_width, y0 + self.header_height, fill='#333333', outline='#555555', tags='cell')
+        if self.editing is not None:
+            canvas.tag_raise('editor')
+
+    def scroll_x(self, *args):
+        self.canvas.xview(*args)
+        self.redraw()
+
+    def scroll_y(self, *args):
+        self.canvas.yview(*args)
+        self.redraw()
+
+    # ------------------------------------------------------------ editing
+
+    def click(self, event):
+        # an invalid value stays in the editor until it is fixed or cancelled
+        if not self.stop_edit():
+            return
+        x, y = self.canvas.canvasx(event.x), self.canvas.canvasy(event.y)
+        col = int((x - self.header_width)//self.cell_width)
+        row = int((y - self.header_height)//self.cell_height)
+        if x < self.canvas.canvasx(0) + self.header_width or y < self.canvas.canvasy(0) + self.header_height:
+            return
+        if not (0 <= row < self.n_rows and 0 <= col < self.n_cols):
+            return
+
+        self.anchor = (row, col)
+        kind = self.cell_kind(row, col)
+        # signs cycle through their options on every click
+        if kind == 'sign':
+            self.signs[row - 1] = CONSTRAINT_SIGNS[(CONSTRAINT_SIGNS.index(self.signs[row - 1]) + 1) % 3]
+        elif kind == 'variable':
+            self.variable_cons[col] = VARIABLE_SIGNS[(VARIABLE_SIGNS.index(self.variable_cons[col]) + 1) % len(VARIABLE_SIGNS)]
+        if kind == 'number':
+            self.start_edit(row, col)
+        else:
+            self.canvas.focus_set()
+        self.redraw()
+
+    def start_edit(self, row, col):
+        self.editing = (row, col)
+        self.anchor = (row, col)
+        x1, y1, x2, y2 = self.cell_box(row, col)
+        self.canvas.delete('editor')
+        self.canvas.create_window(x1 + 1, y1 + 1, window=self.editor, anchor='nw',
+                                  width=self.cell_width - 2, height=self.cell_height - 2, tags='editor')
+        self.editor.delete(0, 'end')
+        self.editor.insert(0, self.cell_text(row, col))
+        self.editor.select_range(0, 'end')
+        self.editor.focus_set()
+
+    def stop_edit(self, commit = True):
+        if self.editing is None:
+            return True
+        row, col = self.editing
+        if commit:
+            try:
+                self.set_cell(row, col, self.check_cell(row, col, self.editor.get().strip()))
+            except ValueError:
+                self.editor.configure(bg='#FFCCCC')
+                return False
+        self.editor.configure(bg='#FFFFFF')
+        self.editing = None
+        self.canvas.delete('editor')
+        self.redraw()
+        return True
+
+    def move_edit(self, d_row, d_col):
+        if self.editing is None:
+            return 'break'
+        row, col = self.editing
+        if not self.stop_edit():
+            return 'break'
+
+        # skip the cells which are not numbers
+        row, col = row + d_row, col + d_col
+        while 0 <= row < self.n_rows and 0 <= col < self.n_cols and self.cell_kind(row, col) != 'number':
+            row, col = row + d_row, col + d_col
+        if 0 <= row < self.n_rows and 0 <= col < self.n_cols:
+            self.see(row, col)
+            self.start_edit(row, col)
+        return 'break'
+
+    def see(self, row, col):
+        """ scroll the view so that a cell is visible """
+        rows, cols, x0, y0 = self.visible_range()
+        if row not in rows[:-1]:
+            self.canvas.yview_moveto(max(0, row - 1)*self.cell_height/(self.header_height + self.n_rows*self.cell_height))
+        if col not in cols[:-1]:
+            self.canvas.xview_moveto(max(0, col - 1)*self.cell_width/(self.header_width + self.n_cols*self.cell_width))
+        self.redraw()
+
+    # ------------------------------------------------------------ bulk input
+
+    def paste_block(self, block, row = None, col = None):
+        '''
+            Function fills the grid with a block of cells whose top-left cell goes to (row, col)
+        (the selected cell by default). Nothing is changed if any cell does not fit.
+        Input:
+            block: list of rows of cell strings (see parse_block)
+        Output:
+            n: number of filled cells
+        '''
+        if row is None:
+            row, col = self.anchor
+        if row + len(block) > self.n_rows or col + max(map(len, block), default = 0) > self.n_cols:
+            raise ValueError(f'A block of {len(block)} rows and {max(map(len, block), default = 0)} columns '
+                             f'does not fit from cell ({row}, {col}).')
+
+        # check every cell first, then fill
+        checked = [[self.check_cell(row + i, col + j, text) for j, text in enumerate(cells)]
+                   for i, cells in enumerate(block)]
+        n = 0
+        for i, cells in enumerate(checked):
+            for j, value in enumerate(cells):
+                self.set_cell(row + i, col + j, value)
+                n += 1
+        self.redraw()
+        return n
+
+    def paste_clipboard(self, event = None):
+        """ paste the clipboard at the selected cell, single values go to the open editor """
+        try:
+            text = self.clipboard_get()
+        except tk.TclError:
+            return 'break'
+        block = parse_block(text)
+        if self.editing is not None and len(block) == 1 and len(block[0]) == 1:
+            return None
+        self.stop_edit(commit=False)
+        self.paste_block(block)
+        return 'break'
+
+    def on_paste(self, event):
+        """ paste from the keyboard shortcut, a bad cell is reported like the Paste button does """
+        try:
+            return self.paste_clipboard(event)
+        except ValueError as e:
+            messagebox.showerror("PASTE ERROR!", str(e))
+            return 'break'
+
+    def import_csv(self, path):
+        """ fill the grid from a CSV file, starting at the selected cell """
+        with open(path) as f:
+            block = parse_block(f.read())
+        self.stop_edit(commit=False)
+        return self.paste_block(block)
+
+    def get_problem(self):
+        '''
+            Function reads the problem from the grid.
+        Output:
+            func_coef: coefficients of the objective function
+            constraints: numpy array of the coefficients and right-hand side of each constraint
+            constraint_signs: signs of the constraints
+            variable_cons: constraints of the variables
+        Raises ValueError if a cell is empty.
+        '''
+        self.stop_edit()
+        if np.isnan(self.values[0, :self.n_var]).any() or np.isnan(self.values[1:]).any():
+            raise ValueError('Every coefficient must be filled in.')
+        return (self.values[0, :self.n_var].tolist(), self.values[1:].copy(),
+                list(self.signs), list(self.variable_cons))
+
+    def preferred_size(self):
+        """ size of the grid without scrolling """
+        return (self.header_width + self.n_cols*self.cell_width + 20,
+                self.header_height + self.n_rows*self.cell_height + 20)
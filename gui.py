@@ -1,7 +1,16 @@
+import threading
 import tkinter as tk
 from tkinter import ttk
 from tkinter import messagebox
+from tkinter import filedialog
 from linear_programming_functions import *
+from sensitivity import solve_with_sensitivity
+from branch_and_bound import is_mixed_integer, branch_and_bound
+from instrumentation import ProgressObserver, SolveCancelled
+from coefficient_grid import CoefficientGrid
+
+# interval between two checks of a running solve (ms)
+POLL_INTERVAL = 100
 
 # store data throughout program
 class Data:
@@ -10,10 +19,8 @@ class Data:
         self.n_var = tk.IntVar()
         self.n_constraint = tk.IntVar()
         self.func_type = tk.StringVar()
-        self.func = []
-        self.constraints = []
-        self.constraint_signs = []
-        self.variable_constraints =  []
+        # grid of the coefficients, signs and constraints of variables
+        self.grid = None
 
     @property
     def n_var(self):
@@ -31,12 +38,46 @@ class Data:
     def n_constraint(self, n_constraint):
         self._n_constraint = n_constraint
     
-     
+
+# solve a problem away from the Tk main thread
+class SolveWorker(threading.Thread):
+    """ a thread solving one problem, cancelled through its observer """
+    def __init__(self, problem):
+        threading.Thread.__init__(self, daemon=True)
+        self.problem = problem
+        self.observer = ProgressObserver()
+        self.result = None
+        self.sensitivity = None
+        self.error = None
+        self.cancelled = False
+
+    def run(self):
+        n_var, n_constraint, func_type, func_coef, constraint_coef, cons_signs, var_con_list = self.problem
+        try:
+            if is_mixed_integer(var_con_list):
+                # nodes are solved in this thread: the relaxations report to the observer, so cancel() still works
+                self.result = branch_and_bound(n_var, n_constraint, func_type, func_coef, constraint_coef, cons_signs,
+                                               var_con_list, observer=self.observer)
+            else:
+                # the constraints of variables are bounds of the bounded-variable simplex, no extra rows or columns
+                B, z, solution, self.sensitivity = solve_with_sensitivity(n_var, n_constraint, func_type, func_coef,
+                                                                          constraint_coef, cons_signs, var_con_list,
+                                                                          observer=self.observer)
+                self.result = B, z, solution
+        except SolveCancelled:
+            self.cancelled = True
+        except Exception as e:
+            self.error = e
+
+    def cancel(self):
+        self.observer.cancel()
+
 
 class SampleApp(tk.Tk):
     def __init__(self, *args, **kwargs):
         tk.Tk.__init__(self, *args, **kwargs)
         self.data = Data()
+        self.worker = None
 
         container = ttk.Frame(self)
         container.pack(side="top", fill="both", expand=True)
@@ -55,8 +96,11 @@ class SampleApp(tk.Tk):
 
         self.frames["PageOne"].button.config(command= self.clear_and_move)
         self.frames["PageOne"].button_2.config(command= self.solve_and_move)
+        self.frames["PageOne"].import_button.config(command= self.import_csv)
+        self.frames["PageOne"].paste_button.config(command= self.paste_clipboard)
 
         self.frames["PageTwo"].button.config(command= self.back_to_start_page)
+        self.frames["PageTwo"].cancel_button.config(command= self.cancel_solve)
         self.show_frame("StartPage")
 
 
@@ -80,137 +124,123 @@ class SampleApp(tk.Tk):
                 #print(self.data.n_var.get())
                 #print(self.data.n_constraint.get())
 
-                self.create_func_widget(self.data.n_var.get())
-                self.create_constraint_widget(self.data.n_var.get(),self.data.n_constraint.get())
-                self.create_variable_constraints_widget(self.data.n_var.get(),self.data.n_constraint.get())
-                self.configure_width()
+                self.create_grid_widget(self.data.n_var.get(), self.data.n_constraint.get())
                 self.show_frame("PageOne")
 
         except:
             messagebox.showerror("INPUT ERROR!", "Inputs must be interger numbers")
 
-    ## create widgets in Page One when clicking "Continue" in StartPage
-    def create_func_widget(self, n_var):
-        row = 1
-        col = 1
-        for i in range(n_var):
-            var_entry = tk.Entry(self.frames["PageOne"], width= 3)
-            var_entry.grid(row= row, column= col)
-
-            var_label = tk.Label(self.frames["PageOne"], text=f'X{i+1} +' if i != (n_var - 1) else f'X{i+1}',  width= 3, font=('Arial', 16))
-            var_label.grid(row= row, column= col + 1)
-
-
-            self.data.func.append(var_entry)
-            col += 2
-
-    def create_constraint_widget(self, n_var, n_constraint):
-        row = 2
-
-        label = tk.Label(self.frames["PageOne"], text= "Constraints: ", font=('Arial', 16))
-        label.grid(row = 2, column=0)
-
-        for i in range(n_constraint):
-            col = 1
-            ref = []
+    ## create the coefficient grid in Page One when clicking "Continue" in StartPage
+    def create_grid_widget(self, n_var, n_constraint):
+        self.data.grid = CoefficientGrid(self.frames["PageOne"], n_var, n_constraint)
+        self.data.grid.grid(row= 1, column= 0, columnspan= 4, sticky= 'nsew', padx= 10)
 
-            for j in range(n_var):
-                var_entry = tk.Entry(self.frames["PageOne"],  width= 3)
-                var_entry.grid(row= row, column= col)
+        # window fits the grid, large grids scroll
+        width, height = self.data.grid.preferred_size()
+        self.geometry(f'{min(max(width + 40, 740), 1200)}x{min(max(height + 160, 440), 800)}')
 
-                var_label = tk.Label(self.frames["PageOne"], text= f'X{j+1} +' if j != (n_var - 1) else f'X{j+1}',  width= 3, font=('Arial', 16))
-                var_label.grid(row= row, column= col + 1)
-
-                ref.append(var_entry)
-                col += 2
-                   
-            sign_str = tk.StringVar(value= '<=')
-            sign_box = tk.OptionMenu(self.frames["PageOne"], sign_str,*['<=', '>=', '='])
-            sign_box.config( fg='#333333', bg='#FFFFFF', font=('Arial', 16))
-
-            sign_box.grid(row = row, column= col)
-            self.data.constraint_signs.append(sign_str)
-
-            entry = tk.Entry(self.frames["PageOne"], width= 3)
-            entry.grid(row = row, column= col + 1)
-            ref.append(entry)
-            row += 1
-
-            self.data.constraints.append(ref) 
-
-
-    def create_variable_constraints_widget(self, n_var, n_constraint):
-        row = 2 + n_constraint
-        col = 1
-        for i in range(n_var):
-            var_label = tk.Label(self.frames["PageOne"], text=f'X{i+1}',  width= 3, font=('Arial', 16))
-            var_label.grid(row= row, column= col)
-
-            sign_str = tk.StringVar(value= '>= 0')
-            sign_box = tk.OptionMenu(self.frames["PageOne"], sign_str, *['<= 0', '>= 0', 'Free'])
-            sign_box.config( fg='#333333', bg='#FFFFFF', font=('Arial', 16))
-            sign_box.grid(row = row, column= col + 1)
-
-            self.data.variable_constraints.append(sign_str)
-            col += 2
+    # fill the grid from a CSV file, starting at the selected cell
+    def import_csv(self):
+        path = filedialog.askopenfilename(filetypes= [("CSV files", "*.csv"), ("Text files", "*.txt"), ("All files", "*")])
+        if not path:
+            return
+        try:
+            self.data.grid.import_csv(path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("IMPORT ERROR!", str(e))
 
-        self.frames["PageOne"].button.grid(row = row + 1, column = col, pady = 10)
-        self.frames["PageOne"].button_2.grid(row = row + 1, column = col + 1, pady = 10)
-    
-    # configure window width in Page One
-    def configure_width(self):
-        obj_label_width = self.frames["PageOne"].obj_label.winfo_reqwidth()
-        obj_width = self.frames["PageOne"].objective.winfo_reqwidth()
-        
-        constraint_width = sum(coef.winfo_reqwidth() for coef in self.data.constraints[0])
-        
-        new_width = (obj_label_width + obj_width + constraint_width)*2 + int((obj_label_width + obj_width + constraint_width)/4)
-        self.geometry(f'{new_width}x440')
+    # fill the grid from the clipboard (e.g. cells copied from a spreadsheet), starting at the selected cell
+    def paste_clipboard(self):
+        try:
+            self.data.grid.paste_clipboard()
+        except ValueError as e:
+            messagebox.showerror("PASTE ERROR!", str(e))
 
     # clear widgets in Page One and move to Start Page when click 'Back'
     def clear_and_move(self):
         # clear widgets
-        for row in range(1, 3 + self.data.n_constraint.get()):
-            for col in range(1, self.data.n_var.get()*2 + 3):
-                for widget in self.frames["PageOne"].grid_slaves(row = row, column= col):
-                    widget.destroy()
-
-        self.data.func = []
-        self.data.constraints = []
-        self.data.constraint_signs = []
-        self.data.variable_constraints = []
+        if self.data.grid is not None:
+            self.data.grid.destroy()
+            self.data.grid = None
 
         self.geometry('740x440')
         # move to Start Page
         self.show_frame("StartPage")
 
     def back_to_start_page(self):
+        # a running solve is abandoned
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker = None
+
         for widget in self.frames["PageTwo"].pack_slaves():
             widget.pack_forget()
 
         self.clear_and_move()
 
-    # solve problem and move to Page Two  
+    # start solving problem in a worker thread and move to Page Two  
     def solve_and_move(self):
-        n_var, n_constraint, func_type, func_coef, constraint_coef, cons_signs, var_con_list = self.get_input()
+        problem = self.get_input()
+        n_var, n_constraint, func_type, func_coef, constraint_coef, cons_signs, var_con_list = problem
+
+        if func_type is not None and func_coef is not None and constraint_coef is not None and cons_signs is not None and var_con_list is not None: 
+            self.worker = SolveWorker(problem)
 
-        if func_type != None and func_coef != None and constraint_coef != None and cons_signs != None and var_con_list != None: 
-                
-            A, free_var = transfer_to_standard_form(n_var, n_constraint, func_type, func_coef, constraint_coef, cons_signs, var_con_list)
+            self.frames["PageTwo"].progress_label.config(text= "Solving...")
+            self.frames["PageTwo"].progress_label.pack()
+            self.frames["PageTwo"].cancel_button.pack()
 
-            B, z, solution = solve_linear_programming_problem(n_var, A, free_var)
+            self.geometry('740x440')
 
+            # switch to Page Two Frame  
+            self.show_frame("PageTwo")
+
+            self.worker.start()
+            self.after(POLL_INTERVAL, self.poll_solve, self.worker)
+
+    # show progress of a running solve, show its result once it has finished
+    def poll_solve(self, worker):
+        # the solve has been abandoned
+        if worker is not self.worker:
+            return
+
+        if worker.is_alive():
+            if not worker.observer.cancelled.is_set():
+                progress = worker.observer.progress
+                text = f"Solving... {progress['phase'] or ''}  pivots: {progress['pivots']}"
+                if progress['objective'] is not None:
+                    # the engines report the objective of the minimization form
+                    objective = -progress['objective'] if worker.problem[2] == 'Maximize' else progress['objective']
+                    text += f"  objective: {objective:.6g}"
+                self.frames["PageTwo"].progress_label.config(text= text)
+            self.after(POLL_INTERVAL, self.poll_solve, worker)
+            return
+
+        self.worker = None
+        self.frames["PageTwo"].progress_label.pack_forget()
+        self.frames["PageTwo"].cancel_button.pack_forget()
+
+        if worker.cancelled:
+            err_label =  tk.Label(self.frames["PageTwo"], text=  "Solve cancelled.")
+            err_label.pack()
+        elif worker.error is not None:
+            err_label =  tk.Label(self.frames["PageTwo"], text=  f"Error: {worker.error}")
+            err_label.pack()
+        else:
+            B, z, solution = worker.result
             if not isinstance(B, np.ndarray):  
                 err_label =  tk.Label(self.frames["PageTwo"], text=  "Cannot find the optimal solutions.")
                 err_label.pack()
             else:
-                self.create_solution_widget(z, solution)
+                self.create_solution_widget(z, solution, worker.sensitivity)
 
-            self.geometry('740x440')
-            self.frames["PageTwo"].button.pack()
+        self.frames["PageTwo"].button.pack()
 
-            # switch to Page Two Frame  
-            self.show_frame("PageTwo")
+    # stop the running solve at its next pivot
+    def cancel_solve(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            self.frames["PageTwo"].progress_label.config(text= "Cancelling...")
     
     # get input from Page One
     def get_input(self):
@@ -223,36 +253,8 @@ class SampleApp(tk.Tk):
             self.data.func_type.set(self.frames["PageOne"].func_str.get())
             func_type = self.data.func_type.get()
 
-            # get coefficients of objective function
-            func_coef = []
-            for num in self.data.func:
-                func_coef.append(float(num.get()))
-
-            #print(func_coef)
-
-            # get coefficients of constraints
-            constraint_coef = []
-            for constraint in self.data.constraints:
-                l = []
-                for i in constraint:
-                    l.append(float(i.get()))
-                constraint_coef.append(l)
-
-            #print(constraint_coef)
-
-            # get signs of constraints 
-            cons_signs = []
-            for sign in self.data.constraint_signs:
-                cons_signs.append(str(sign.get()))
-
-            #print(cons_signs)
-
-            # get the constraints of variable
-            var_con_list = []
-            for var_con in self.data.variable_constraints:
-                var_con_list.append(str(var_con.get()))
-
-            #print(var_con_list)
+            # get coefficients, signs of constraints and constraints of variables from the grid
+            func_coef, constraint_coef, cons_signs, var_con_list = self.data.grid.get_problem()
 
             return n_var, n_constraint, func_type, func_coef, constraint_coef, cons_signs, var_con_list
         except:
@@ -261,13 +263,34 @@ class SampleApp(tk.Tk):
 
 
     # create widgets in Page Two
-    def create_solution_widget(self, z, solution):
+    def create_solution_widget(self, z, solution, sensitivity=None):
         z_label =  tk.Label(self.frames["PageTwo"], text= f'Optimal Value = {z}')
         z_label.pack()
 
-        for i in range(len(solution)):
-            solution_label =  tk.Label(self.frames["PageTwo"], text= f'X{i + 1} = {solution[i]}')
-            solution_label.pack()
+        if sensitivity is None:
+            for i in range(len(solution)):
+                solution_label =  tk.Label(self.frames["PageTwo"], text= f'X{i + 1} = {solution[i]}')
+                solution_label.pack()
+            return
+
+        # sensitivity report: the ranges keep the solution (variables) or the shadow prices (constraints) valid
+        variables = self.create_report_table(("Variable", "Value", "Reduced cost", "Cost decrease", "Cost increase"),
+                                             [(f'X{i + 1}', solution[i], sensitivity['reduced_costs'][i],
+                                               *sensitivity['cost_ranges'][i]) for i in range(len(solution))])
+        variables.pack(pady=5)
+        constraints = self.create_report_table(("Constraint", "Shadow price", "RHS decrease", "RHS increase"),
+                                               [(f'C{i + 1}', sensitivity['shadow_prices'][i], *sensitivity['rhs_ranges'][i])
+                                                for i in range(len(sensitivity['shadow_prices']))])
+        constraints.pack(pady=5)
+
+    def create_report_table(self, columns, rows):
+        table = ttk.Treeview(self.frames["PageTwo"], columns=columns, show='headings', height=min(len(rows), 6))
+        for column in columns:
+            table.heading(column, text=column)
+            table.column(column, width=110, anchor='e')
+        for row in rows:
+            table.insert('', 'end', values=(row[0],) + tuple('inf' if value == np.inf else f'{value:.6g}' for value in row[1:]))
+        return table
     
 
 class StartPage(ttk.Frame):
@@ -317,14 +340,21 @@ class PageOne(ttk.Frame):
         self.objective.config( fg='#333333', bg='#FFFFFF', font=('Arial', 16))
         self.objective.grid(row= 0, column= 1, pady= 30)
 
-        self.func_label = tk.Label(self, text='Function:', font=('Arial', 16))
-        self.func_label.grid(row= 1, column= 0 ,pady=10)
+        # the coefficient grid goes to row 1
+        self.grid_rowconfigure(1, weight=1)
+        self.grid_columnconfigure(3, weight=1)
+
+        self.import_button = tk.Button(self, text="Import CSV",  fg='#333333', bg='#FFFFFF', font=('Arial', 16))
+        self.import_button.grid(row = 2, column = 0, pady = 10)
+
+        self.paste_button = tk.Button(self, text="Paste",  fg='#333333', bg='#FFFFFF', font=('Arial', 16))
+        self.paste_button.grid(row = 2, column = 1, pady = 10)
         
         self.button = tk.Button(self, text="Back",  fg='#333333', bg='#FFFFFF', font=('Arial', 16))
-        self.button.grid(row = 2, column = 2)
+        self.button.grid(row = 2, column = 2, pady = 10)
 
         self.button_2 = tk.Button(self, text="Continue",  fg='#333333', bg='#FFFFFF', font=('Arial', 16))
-        self.button_2.grid(row = 2, column = 3)
+        self.button_2.grid(row = 2, column = 3, pady = 10, sticky = 'w')
 
 class PageTwo(ttk.Frame):
     def __init__(self, parent, controller, data):
@@ -333,3 +363,6 @@ class PageTwo(ttk.Frame):
         
         self.button = tk.Button(self, text="Back to Start Page",  fg='#333333', bg='#FFFFFF', font=('Arial', 16))
 
+        self.progress_label = tk.Label(self, text="Solving...", font=('Arial', 16))
+        self.cancel_button = tk.Button(self, text="Cancel",  fg='#333333', bg='#FFFFFF', font=('Arial', 16))
+
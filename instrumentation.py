@@ -0,0 +1,152 @@
+import json
+import sys
+import threading
+import time
+
+
+class SolveObserver:
+    '''
+        Base class of solve observers. The engines report every pivot and the start and end of every
+    phase to the observer given to solve_linear_programming_problem; without an observer they take
+    no timings and build no events. Subclasses override on_pivot() and on_phase().
+    Pivot events: {"event": "pivot", "phase", "iteration", "entering", "leaving", "row", "objective",
+                   "pricing_time", "ratio_test_time", "elimination_time"}
+        entering/leaving: column indices of the standard form (leaving is -1 if unknown)
+        row: index of the pivot row (1-based in the tableau engines, 0-based in the revised and bounded engines,
+             -1 for a bound flip of the bounded engine, whose leaving variable is the entering one)
+        objective: objective value of the standard form (minimization) after the pivot
+    Phase events: {"event": "phase_start" or "phase_end", "phase", "iterations", "status", ...}
+    '''
+    def __init__(self):
+        self.phase = None
+        self.iteration = 0
+        self.total_pivots = 0
+
+    def start_phase(self, phase, **info):
+        self.phase = phase
+        self.iteration = 0
+        self.on_phase(dict(event = 'phase_start', phase = phase, time = time.perf_counter(), **info))
+
+    def end_phase(self, status, **info):
+        self.on_phase(dict(event = 'phase_end', phase = self.phase, iterations = self.iteration, status = status,
+                           time = time.perf_counter(), **info))
+
+    def pivot(self, entering, leaving, row, objective, pricing_time, ratio_test_time, elimination_time):
+        self.iteration += 1
+        self.total_pivots += 1
+        self.on_pivot({'event': 'pivot', 'phase': self.phase, 'iteration': self.iteration,
+                       'entering': int(entering), 'leaving': int(leaving), 'row': int(row), 'objective': float(objective),
+                       'pricing_time': pricing_time, 'ratio_test_time': ratio_test_time, 'elimination_time': elimination_time})
+
+    def on_pivot(self, event):
+        pass
+
+    def on_phase(self, event):
+        pass
+
+
+class CallbackObserver(SolveObserver):
+    '''
+        Observer calling plain functions with the events.
+    Input:
+        on_pivot: function called with every pivot event (or None)
+        on_phase: function called with every phase event (or None)
+    '''
+    def __init__(self, on_pivot = None, on_phase = None):
+        SolveObserver.__init__(self)
+        self.pivot_callback = on_pivot
+        self.phase_callback = on_phase
+
+    def on_pivot(self, event):
+        if self.pivot_callback is not None:
+            self.pivot_callback(event)
+
+    def on_phase(self, event):
+        if self.phase_callback is not None:
+            self.phase_callback(event)
+
+
+class SolveCancelled(Exception):
+    '''
+        Raised inside a solve by a ProgressObserver whose solve has been cancelled.
+    '''
+    pass
+
+
+class ProgressObserver(SolveObserver):
+    '''
+        Observer keeping the latest progress of a solve for another thread to read. Once cancel() has
+    been called, the solve is stopped at its next pivot or phase event by a SolveCancelled exception.
+    Attributes:
+        progress: python dict with the current "phase", "iteration", "objective" and "pivots"
+    '''
+    def __init__(self):
+        SolveObserver.__init__(self)
+        self.cancelled = threading.Event()
+        self.progress = {'phase': None, 'iteration': 0, 'objective': None, 'pivots': 0}
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def on_pivot(self, event):
+        if self.cancelled.is_set():
+            raise SolveCancelled()
+        # a new dict is assigned at once, so readers never see a half updated one
+        self.progress = {'phase': event['phase'], 'iteration': event['iteration'], 'objective': event['objective'],
+                         'pivots': self.total_pivots}
+
+    def on_phase(self, event):
+        if self.cancelled.is_set():
+            raise SolveCancelled()
+        self.progress = dict(self.progress, phase = event['phase'])
+
+
+class TraceWriter(SolveObserver):
+    '''
+        Observer writing every event as one JSON line. Lines are buffered and written in blocks of
+    buffer_size events, so tracing costs little more than the json encoding of the events.
+    Input:
+        target: path of the trace file, an open text file or "-" for standard error
+        buffer_size: number of events kept before writing
+        pivots: also write pivot events (otherwise only phase events)
+    '''
+    def __init__(self, target, buffer_size = 1024, pivots = True):
+        SolveObserver.__init__(self)
+        if target == '-':
+            self.file, self.owned = sys.stderr, False
+        elif isinstance(target, str):
+            self.file, self.owned = open(target, 'w'), True
+        else:
+            self.file, self.owned = target, False
+        self.buffer_size = buffer_size
+        self.pivots = pivots
+        self.lines = []
+
+    def write(self, event):
+        self.lines.append(json.dumps(event))
+        if len(self.lines) >= self.buffer_size:
+            self.flush()
+
+    def on_pivot(self, event):
+        if self.pivots:
+            self.write(event)
+
+    def on_phase(self, event):
+        self.write(event)
+
+    def flush(self):
+        if self.lines:
+            self.file.write('\n'.join(self.lines) + '\n')
+            self.lines = []
+        self.file.flush()
+
+    def close(self):
+        self.flush()
+        if self.owned:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
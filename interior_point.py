@@ -0,0 +1,224 @@
+import numpy as np
+
+try:
+    from scipy.linalg import cho_factor, cho_solve
+except ImportError:
+    cho_factor = None
+    cho_solve = None
+
+from linear_programming_functions import is_sparse, recover_solution, get_optimal_value
+from revised_simplex import Basis, read_tableau, warm_start, cold_start, basis_tableau
+
+
+def normal_matrix(M, d):
+    '''
+        Function builds the matrix M*diag(d)*M^T of the normal equations.
+    '''
+    if is_sparse(M):
+        return (M.multiply(d[None, :]) @ M.T).toarray()
+    return (M*d) @ M.T
+
+
+def cholesky(N, reg = 1e-14):
+    '''
+        Function factorizes a symmetric positive (semi)definite matrix. If the factorization fails
+    (dependent rows make N singular), a growing multiple of the identity is added to N.
+    Output:
+        L: Cholesky factor
+    '''
+    scale = max(1.0, np.abs(np.diag(N)).max(initial = 0.0))
+    shift = 0.0
+    while True:
+        try:
+            R = N + shift*scale*np.eye(N.shape[0]) if shift else N
+            if cho_factor is not None:
+                return cho_factor(R, lower = True, check_finite = False)
+            return np.linalg.cholesky(R)
+        except np.linalg.LinAlgError:
+            shift = 100*shift if shift else reg
+            if shift > 1e-2:
+                raise
+
+
+def cholesky_solve(L, r):
+    '''
+        Function solves N*x = r from the Cholesky factor of N.
+    '''
+    if cho_solve is not None:
+        return cho_solve(L, r, check_finite = False)
+    return np.linalg.solve(L.T, np.linalg.solve(L, r))
+
+
+def max_step(v, dv):
+    '''
+        Function finds the largest step in [0, 1] keeping v + step*dv nonnegative.
+    '''
+    negative = dv < 0
+    if not negative.any():
+        return 1.0
+    with np.errstate(over = 'ignore'):
+        return min(1.0, np.min(-v[negative]/dv[negative]))
+
+
+def mehrotra_iterations(M, b, c, tol = 1e-8, max_iter = 100):
+    '''
+        Function runs Mehrotra's primal-dual predictor-corrector method on
+            min c*x  subject to  M*x = b, x >= 0
+    Each iteration factorizes the normal equations M*(X/S)*M^T once (Cholesky) and solves them
+    twice, for the affine scaling (predictor) and the centering-corrector directions.
+    Input:
+        M, b, c: constraint matrix (dense or scipy sparse), right-hand side and cost vector
+        tol: tolerance of the relative primal/dual residuals and of the relative duality gap
+        max_iter: maximal number of iterations
+    Output:
+        status: "optimal", "diverged" (infeasible or unbounded problem) or "iteration_limit"
+        x, y, s: primal solution, dual solution and reduced costs
+    '''
+    m, n = M.shape
+
+    # Mehrotra's starting point: least-squares solutions shifted into the positive orthant
+    L = cholesky(normal_matrix(M, np.ones(n)))
+    x = M.T @ cholesky_solve(L, b)
+    y = cholesky_solve(L, M @ c)
+    s = c - M.T @ y
+    x += max(0.0, -1.5*x.min(initial = 0.0))
+    s += max(0.0, -1.5*s.min(initial = 0.0))
+    if x @ s <= 0:
+        x += 1.0
+        s += 1.0
+    x += 0.5*(x @ s)/s.sum()
+    s += 0.5*(x @ s)/x.sum()
+
+    b_norm = 1.0 + np.linalg.norm(b)
+    c_norm = 1.0 + np.linalg.norm(c)
+
+    for iteration in range(max_iter):
+        r_p = b - M @ x
+        r_d = c - M.T @ y - s
+        gap = x @ s
+        mu = gap/n
+
+        if (np.linalg.norm(r_p)/b_norm < tol and np.linalg.norm(r_d)/c_norm < tol
+                and gap/(1.0 + abs(c @ x)) < tol):
+            return "optimal", x, y, s
+        if np.abs(x).max() > 1e12/tol or np.abs(y).max(initial = 0.0) > 1e12/tol:
+            return "diverged", x, y, s
+
+        d = x/s
+        L = cholesky(normal_matrix(M, d))
+
+        def direction(r_xs):
+            # eliminate ds and dx from the Newton system, solve for dy
+            dy = cholesky_solve(L, r_p - M @ ((r_xs - x*r_d)/s))
+            ds = r_d - M.T @ dy
+            dx = (r_xs - x*ds)/s
+            return dx, dy, ds
+
+        # predictor: affine scaling direction
+        dx, dy, ds = direction(-x*s)
+        alpha_p = max_step(x, dx)
+        alpha_d = max_step(s, ds)
+        mu_aff = (x + alpha_p*dx) @ (s + alpha_d*ds)/n
+        sigma = (mu_aff/mu)**3
+
+        # corrector: second order term and centering
+        dx, dy, ds = direction(-x*s - dx*ds + sigma*mu)
+        alpha_p = min(1.0, 0.99*max_step(x, dx))
+        alpha_d = min(1.0, 0.99*max_step(s, ds))
+
+        x += alpha_p*dx
+        y += alpha_d*dy
+        s += alpha_d*ds
+
+    return "iteration_limit", x, y, s
+
+
+def crossover(M, b, c, x, s, tol = 1e-9, observer = None):
+    '''
+        Function moves from an interior solution to an optimal basic solution. The columns are ranked
+    by x/(x+s), the first linearly independent ones form the starting basis, and the revised
+    simplex finishes from it (primal simplex if it is primal feasible, dual simplex if dual feasible).
+    Output:
+        factor: BasisFactorization of an optimal basis
+        status: status of the simplex iterations
+    '''
+    m, n = M.shape
+    order = np.argsort(-x/np.maximum(x + s, 1e-300))
+
+    # greedy choice of independent columns (Gram-Schmidt)
+    Q = np.zeros((m, 0))
+    chosen = []
+    for j in order:
+        a = M[:, j].toarray().ravel() if is_sparse(M) else M[:, j]
+        r = a - Q @ (Q.T @ a)
+        norm = np.linalg.norm(r)
+        if norm > 1e-9*max(1.0, np.linalg.norm(a)):
+            Q = np.column_stack((Q, r/norm))
+            chosen.append(j)
+            if len(chosen) == m:
+                break
+
+    if len(chosen) == m:
+        factor, status = warm_start(M, b.copy(), c, Basis(np.array(chosen), (m, n)), tol = tol, observer = observer)
+        if factor is not None:
+            return M, b, factor, status
+    return cold_start(M.copy(), b.copy(), c, tol = tol, observer = observer)
+
+
+def interior_point_algorithm(n_var, A, free_var = [], func_type = 'Minimize', crossover_basis = True, tol = 1e-8, max_iter = 100,
+                             observer = None):
+    '''
+        Function using Mehrotra's predictor-corrector interior point method finds optimal solution for
+    linear programming problems. The number of iterations hardly grows with the size of the problem.
+    Input:
+        n_var: number of original variables.
+        A: original tableau (dense or scipy sparse).
+        free_var: python list include indeces of free variables.
+        func_type: type of objective function
+        crossover_basis: finish with a crossover to an optimal basic solution and its tableau,
+                         otherwise the tableau keeps the original constraint rows and its objective
+                         row holds the reduced costs of the interior solution
+        tol: tolerance of the residuals and of the duality gap
+        max_iter: maximal number of iterations
+        observer: instrumentation.SolveObserver told about the phases and the pivots of the crossover
+    Output:
+        A: optimal tableau
+        z: optimal value
+        solver: optimal solution
+    '''
+    c, M, b = read_tableau(A)
+    m, n = M.shape
+
+    # empty columns (e.g. slack columns of "=" rows) stay at zero, or make the problem unbounded
+    norms = np.asarray(abs(M).sum(axis = 0)).ravel()
+    used = np.where(norms > 0)[0]
+    if np.any(c[norms == 0] < -tol):
+        return None, None, None
+
+    M_used = M[:, used]
+    if observer is not None:
+        observer.start_phase('interior_point')
+    status, x_used, y, s_used = mehrotra_iterations(M_used, b, c[used], tol, max_iter)
+    if observer is not None:
+        observer.end_phase(status, objective = float(c[used] @ x_used))
+    if status != "optimal":
+        return None, None, None
+
+    x = np.zeros(n)
+    x[used] = x_used
+    s = c - M.T @ y
+
+    if crossover_basis:
+        M, b, factor, status = crossover(M, b, c, np.maximum(x, 0.0), np.maximum(s, 0.0), observer = observer)
+        if status != "optimal":
+            return None, None, None
+        B, solver = basis_tableau(M, b, c, factor)
+    else:
+        B = np.empty((m + 1, n + 1))
+        B[0, :-1] = s
+        B[0, -1] = -(c @ x)
+        B[1:, :-1] = M.toarray() if is_sparse(M) else M
+        B[1:, -1] = b
+        solver = x
+
+    return B, get_optimal_value(B, func_type), recover_solution(solver, n_var, free_var)
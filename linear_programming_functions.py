@@ -1,5 +1,23 @@
+import sys
+from time import perf_counter
+
 import numpy as np
 
+from pricing import make_pricing
+
+# largest number of tableau entries updated at once by a pivot
+PIVOT_BLOCK_SIZE = 1 << 18
+
+
+def is_sparse(A):
+    '''
+        Function checks whether A is a scipy sparse matrix. A sparse matrix can only exist once
+    scipy.sparse has been imported, so the (slow) import of scipy is left to the callers using it.
+    '''
+    sp = sys.modules.get('scipy.sparse')
+    return sp is not None and sp.issparse(A)
+
+
 def transfer_to_standard_form(n_var, n_constraint, func_type, func_coef, constraints, constraint_signs, variable_cons):
     '''
         Function transfers form orginal form into stard form of linear programming problem
@@ -8,108 +26,283 @@ def transfer_to_standard_form(n_var, n_constraint, func_type, func_coef, constra
         n_constraint: number of contraints of equality/inequality
         func_type: Type of objective function ("Maximize", "Minimize")
         func_coef: coefficient of equality/inequality constraints
+        constraints: rows of coefficients followed by the right-hand side, as python lists or a numpy array,
+                     or as a scipy sparse (CSR/CSC) matrix of shape (n_constraint, n_var + 1)
         constraint_signs: sign of equality/inequality constraints ("<=", ">=", "=") 
         variable_cons: constraints of variables ("<= 0", ">= 0", "Free")
     Output:
-        A: stardard form
+        A: stardard form (scipy sparse CSC matrix if constraints is sparse)
         free_var: list including indeces of free variables  
+    The inputs are not modified.
     '''
+    if is_sparse(constraints):
+        return transfer_to_sparse_standard_form(n_var, n_constraint, func_type, func_coef, constraints, constraint_signs, variable_cons)
 
     # transfer from maximize to minimize
+    func_coef = np.array(func_coef[:n_var], dtype = float)
     if func_type == "Maximize":
+        func_coef = -func_coef
+
+    constraints = np.array(constraints, dtype = float).reshape(n_constraint, n_var + 1)
+    signs = np.array(constraint_signs[:n_constraint])
+    position, col_sign, free, free_var = standard_form_columns(n_var, variable_cons)
+    n_col = n_var + len(free_var)
+
+    A = np.zeros((n_constraint + 1, n_col + n_constraint + 1))
 
-        func_type = "Minimize"
-        func_coef = [- coef for coef in func_coef]
+    # objective, negative variables flipped and free variables split into two positive variables
+    A[0, position] = col_sign*func_coef
+    A[0, position[free] + 1] = -func_coef[free]
 
     # transfer all constraints sign ">=" to "<="
-    for i in range(n_constraint):
-        if constraint_signs[i] == ">=":
-            constraints[i] =  [- coef for coef in constraints[i]]
+    row_sign = np.where(signs == ">=", -1.0, 1.0)
+    A[1:, position] = row_sign[:, None]*constraints[:, :n_var]*col_sign
+    A[1:, position[free] + 1] = -A[1:, position[free]]
+    A[1:, -1] = row_sign*constraints[:, n_var]
 
     # complement slack variables
-    for i in range(n_constraint):
-        slack_coef = [0.0 for k in range(n_constraint)] 
-        if constraint_signs[i] != '=':
-            slack_coef[i] = 1.0
-        slack_coef.reverse()
-
-        for coef in  slack_coef:
-            constraints[i].insert(n_var, coef)
-
-    free_var = []
-
-    for i in range(n_var):
-        # transfer negative variable into positive variables
-        if variable_cons[i] == "<= 0":
-            for constraint in constraints:
-                constraint[i] = -1*constraint[i]
-
-        # transfer each free variable into two positives variables   
-        elif variable_cons[i] == 'Free':
-            for constraint in constraints:
-                constraint.insert(i + 1, -constraint[i])
-            l = len(free_var)
-            free_var.append(i + l)
-
-
-    for i in range(len(constraints[0]) - n_var):
-        func_coef.append(0)
-
-    A = []
-    A.append(func_coef)
-    for constraint in constraints:
-        A.append(constraint)
-    
-    A = np.array(A, dtype = float)
+    slack = np.where(signs != '=')[0]
+    A[1 + slack, n_col + slack] = 1.0
+
+    return A, free_var
+
+
+def standard_form_columns(n_var, variable_cons):
+    '''
+        Function computes the column layout of the original variables in the standard form.
+    Input:
+        n_var: number of varialbes
+        variable_cons: constraints of variables ("<= 0", ">= 0", "Free")
+    Output:
+        position: column of each original variable
+        col_sign: -1 for negative variables, 1 otherwise
+        free: boolean mask of free variables, split into columns position and position + 1
+        free_var: list including indeces of free variables
+    '''
+    variable_cons = np.array(variable_cons[:n_var])
+    free = variable_cons == 'Free'
+    col_sign = np.where(variable_cons == "<= 0", -1.0, 1.0)
+    position = np.arange(n_var) + np.cumsum(free) - free
+    return position, col_sign, free, position[free].tolist()
+
+
+def split_bounds(lower, upper):
+    '''
+        Function expresses bounds of variables with the constraints of variables of the original form.
+    Bounds which are neither ">= 0", "<= 0" nor "Free" need extra constraint rows.
+    Input:
+        lower: lower bounds of variables (-inf if none)
+        upper: upper bounds of variables (inf if none)
+    Output:
+        variable_cons: constraints of variables ("<= 0", ">= 0", "Free")
+        bound_rows: list of (variable index, sign, value) of the extra constraints
+    '''
+    variable_cons = []
+    bound_rows = []
+    for j, (low, up) in enumerate(zip(lower, upper)):
+        if low == 0.0:
+            variable_cons.append('>= 0')
+        elif low == -np.inf and up <= 0.0:
+            variable_cons.append('<= 0')
+        elif low > 0.0:
+            variable_cons.append('>= 0')
+            bound_rows.append((j, '>=', low))
+        else:
+            variable_cons.append('Free')
+            if low != -np.inf:
+                bound_rows.append((j, '>=', low))
+
+        if up != np.inf and not (variable_cons[-1] == '<= 0' and up == 0.0):
+            bound_rows.append((j, '<=', up))
+
+    return variable_cons, bound_rows
+
+
+def transfer_to_sparse_standard_form(n_var, n_constraint, func_type, func_coef, constraints, constraint_signs, variable_cons):
+    '''
+        Function transfers a problem with sparse constraints into a sparse standard form.
+    Slack and free-variable columns are built as sparse blocks, no dense copy of the constraints is made.
+    Input:
+        same as transfer_to_standard_form, constraints is a scipy sparse matrix of shape (n_constraint, n_var + 1)
+    Output:
+        A: stardard form as scipy sparse CSC matrix
+        free_var: list including indeces of free variables
+    '''
+    import scipy.sparse as sp
+
+    constraints = sp.csr_matrix(constraints, dtype = float)
+    coef = constraints[:, :n_var]
+    b = constraints[:, n_var].toarray().ravel()
+
+    # transfer from maximize to minimize
+    func_coef = np.array(func_coef, dtype = float)
+    if func_type == "Maximize":
+        func_coef = -func_coef
+
+    # transfer all constraints sign ">=" to "<="
+    signs = np.array(constraint_signs[:n_constraint])
+    row_sign = np.where(signs == ">=", -1.0, 1.0)
+    coef = sp.diags(row_sign) @ coef
+    b = row_sign*b
+
+    # column map of the original variables: negative variables are flipped,
+    # each free variable is split into two positive variables
+    position, col_sign, free, free_var = standard_form_columns(n_var, variable_cons)
+    n_col = n_var + len(free_var)
+    rows = np.concatenate((np.arange(n_var), np.where(free)[0]))
+    cols = np.concatenate((position, position[free] + 1))
+    vals = np.concatenate((col_sign, -np.ones(len(free_var))))
+    P = sp.csr_matrix((vals, (rows, cols)), shape = (n_var, n_col))
+
+    # complement slack variables
+    slack = sp.diags((signs != '=').astype(float), format = 'csr')
+    slack.eliminate_zeros()
+
+    objective = np.concatenate((P.T @ func_coef, np.zeros(n_constraint + 1)))
+    A = sp.vstack((
+        sp.csr_matrix(objective),
+        sp.hstack((coef @ P, slack, sp.csr_matrix(b).T)),
+    ), format = 'csc')
     return A, free_var
 
     
 
-def pivot_operation(A):
+def find_unit_basis(M, tol = 1e-12):
+    '''
+        Function finds, for each row, a column of M that is a unit vector with its 1 in that row.
+    Input:
+        M: constraint matrix (dense or sparse)
+    Output:
+        basis: index of the unit column of each row (-1 if the row has none)
+    '''
+    m, n = M.shape
+    if is_sparse(M):
+        M = M.tocsc(copy = True)
+        M.data[np.abs(M.data) <= tol] = 0.0
+        M.eliminate_zeros()
+        single = np.diff(M.indptr) == 1
+        rows = np.zeros(n, dtype = int)
+        values = np.zeros(n)
+        rows[single] = M.indices[M.indptr[:-1][single]]
+        values[single] = M.data[M.indptr[:-1][single]]
+        unit = single & (np.abs(values - 1.0) <= tol)
+    else:
+        nonzero = np.abs(M) > tol
+        rows = np.argmax(nonzero, axis = 0)
+        unit = (nonzero.sum(axis = 0) == 1) & (np.abs(M[rows, np.arange(n)] - 1.0) <= tol)
+
+    basis = np.full(m, -1)
+    for j in np.where(unit)[0][::-1]:
+        basis[rows[j]] = j
+    return basis
+
+
+def find_pivot_row(A, pivot_col, tol = 1e-9, basis = None):
+    '''
+        Function finds pivot row by the minimum ratio test.
+    Input:
+        A: tableau
+        pivot_col: index of pivot column
+        tol: entries of pivot column not greater than tol are ignored
+        basis: index of the basic variable of each row, if given ties are broken by the smallest index
+    Output:
+        pivot_row: index of pivot row (None if pivot column has no positive entry)
+    '''
+    col = A[1:, pivot_col]
+    mask = col > tol
+    if not mask.any():
+        return None
+
+    ratios = np.full(col.shape, np.inf)
+    np.divide(A[1:, -1], col, out = ratios, where = mask)
+    pivot_row = np.argmin(ratios)
+
+    if basis is not None:
+        ties = np.where(ratios <= ratios[pivot_row] + tol)[0]
+        pivot_row = ties[np.argmin(basis[ties])]
+    return 1 + pivot_row
+
+
+def pivot(A, pivot_row, pivot_col):
+    '''
+        Function makes pivot operation on tableau in place.
+    Input:
+        A: tableau
+        pivot_row: index of pivot row
+        pivot_col: index of pivot column
+    Output:
+        A: tableau after pivot operation
+    '''
+    A[pivot_row, :] /= A[pivot_row, pivot_col]
+
+    # eliminate pivot column from other rows with rank-1 updates, by blocks of rows so that
+    # the temporary product stays small next to a large tableau
+    col = A[:, pivot_col].copy()
+    col[pivot_row] = 0.0
+    row = A[pivot_row, :]
+    step = max(1, PIVOT_BLOCK_SIZE//A.shape[1])
+    for start in range(0, A.shape[0], step):
+        A[start:start + step] -= np.outer(col[start:start + step], row)
+    return A
+
+
+def pivot_operation(A, tol = 1e-9, pricing = None, observer = None, basis = None):
     '''
         Function finds optimal tableau
     Input:
         A: original tableau
+        tol: reduced costs greater than -tol are considered nonnegative
+        pricing: pricing strategy choosing pivot column (see pricing.make_pricing)
+        observer: instrumentation.SolveObserver told about every pivot (None: no instrumentation)
+        basis: index of the basic variable of each row (see find_unit_basis), updated in place
+               through every pivot; found from the unit columns of A if None
     Output:
         B: optimal tableau
     '''
-    while np.any(A[0,:-1] < 0):
+    pricing = make_pricing(pricing)
+    n_col = A.shape[1] - 1
+    pricing.start(n_col, np.einsum('ij,ij->j', A[1:, :-1], A[1:, :-1]) if pricing.needs_products else None)
+
+    if basis is None:
+        basis = find_unit_basis(A[:, :-1])[1:]
+    tie_basis = basis if pricing.lowest_index_leaving else None
+
+    while True:
+        if observer is not None:
+            start = perf_counter()
+
         # find pivot column
-        pivot_col = np.where(A[0] == min(A[0,:-1]))[0][0]
+        pivot_col = pricing.select(lambda cols: A[0, cols], n_col, tol)
+        if pivot_col is None:
+            return A
+
+        if observer is not None:
+            priced = perf_counter()
 
-        # check whether all ai < 0
-        if np.all(A[:, pivot_col] < 0):
+        # find pivot row, no positive entry => objective is unbounded
+        pivot_row = find_pivot_row(A, pivot_col, tol, tie_basis)
+        if pivot_row is None:
             #sys.exit("Ham Muc tieu khong gioi noi tren mien chap nhan duoc.\nBai toan Vo nghiem'")
             return None
-        
-        # find pivot row
-        pivot_row = 1
-        for i in range(1, A.shape[0]):
-            if A[i, pivot_col] < 0:
-                continue
-            try: 
-                frac = A[i, pivot_col]/A[i,-1]
-            except ZeroDivisionError:
-                frac = 1.00e100
-
-            if frac > A[pivot_row, pivot_col]/A[pivot_row, -1]:
-                    pivot_row = i
-        # Pivot element
-        pivot = A[pivot_row, pivot_col]
-
-        # Pivot Operation
-        A[pivot_row, :] = A[pivot_row, :]/pivot
-
-        for i in range(A.shape[0]):
-            if i == pivot_row:
-                continue
-            A[i, :] = A[i, :] - A[i, pivot_col]*A[pivot_row, :]
 
-    return A
+        if pricing.needs_pivot_row:
+            products = A[1:, :-1].T @ A[1:, pivot_col] if pricing.needs_products else None
+            pricing.update(A[pivot_row, :-1], pivot_col, A[1:, pivot_col], products)
+
+        if observer is not None:
+            tested = perf_counter()
+
+        pivot(A, pivot_row, pivot_col)
+        leaving = basis[pivot_row - 1]
+        basis[pivot_row - 1] = pivot_col
+
+        if observer is not None:
+            observer.pivot(pivot_col, leaving, pivot_row, -A[0, -1], priced - start, tested - priced, perf_counter() - tested)
 
 
 
-def simplex_algorithm(n_var, A,  free_var = [], func_type = 'Minimize'):
+def simplex_algorithm(n_var, A,  free_var = [], func_type = 'Minimize', pricing = None, observer = None, phase = 'primal',
+                      basis = None, tol = 1e-9):
     '''
         Function using Simplex algotithm of Danzig finds solution for linear programming problems.
     Input: 
@@ -117,6 +310,11 @@ def simplex_algorithm(n_var, A,  free_var = [], func_type = 'Minimize'):
         A: original tableau.
         free_var: python list include indeces of free variables. 
         func_type: type of objective function
+        pricing: pricing strategy choosing pivot column
+        observer: instrumentation.SolveObserver (None: no instrumentation)
+        phase: name of the phase reported to the observer
+        basis: index of the basic variable of each row (None: found from the unit columns of A)
+        tol: pivot and optimality tolerance
     Output:
         A: optimal tableau
         z: optimal value
@@ -130,176 +328,405 @@ def simplex_algorithm(n_var, A,  free_var = [], func_type = 'Minimize'):
         return None, None, None
 
 
-    # pivot operation
-    A = pivot_operation(A)
+    # pivot operation, every row needs a basic variable
+    if basis is None:
+        basis = find_unit_basis(A[:, :-1])[1:]
+        if np.any(basis < 0):
+            return None, None, None
+    if observer is not None:
+        observer.start_phase(phase)
+    A = pivot_operation(A, tol, pricing, observer, basis)
+    if observer is not None:
+        observer.end_phase('optimal' if isinstance(A, np.ndarray) else 'unbounded')
     if not isinstance(A, np.ndarray):
         return None, None, None
 
-    # get solution
-    index = np.where(A[0,:-1] == 0)[0]
-    solver = [0 for i in range(A.shape[1] - 1)]
-    
+    return  A, get_optimal_value(A, func_type), recover_solution(get_tableau_solution(A, basis), n_var, free_var)
 
-    for i in index:
-        j = np.where(A[:,i] == 1)[0]
-        if j.any() != True:
-            solver[i] = 1.00e100
-        else:
-            idx = j[0]
-            solver[i] = A[idx, -1]
-    
 
-    if len(free_var) != 0:
-        for i in free_var:
-            solver[i] = solver[i] - solver[i + 1]
-        k = 0
-        for i in free_var:
-            solver.remove(solver[i + 1 - k])
-            k += 1
-    
-    # get optimal value
-    if func_type == 'Minimize':
-        z = -A[0, -1]
-    else:
-        z = A[0, -1]
-        
-    return  A, z, solver[:n_var]
+def get_tableau_solution(A, basis = None):
+    '''
+        Function reads the values of all variables of the standard form from an optimal tableau.
+    Input:
+        A: optimal tableau
+        basis: index of the basic variable of each row kept by the pivot routines
+               (None: found from the unit columns of A, within a tolerance)
+    Output:
+        solver: values of all variables of the standard form (nonbasic variables are zero)
+    '''
+    if basis is None:
+        basis = find_unit_basis(A[:, :-1], 1e-9)[1:]
+
+    # basic variables take the right-hand side of their row, rows without one (-1) are skipped
+    solver = np.zeros(A.shape[1] - 1)
+    rows = np.where(basis >= 0)[0]
+    solver[basis[rows]] = A[1 + rows, -1]
+    return solver.tolist()
 
 
-def build_complementary_problem(A):
+def dual_pivot_operation(A, tol = 1e-9, observer = None, basis = None):
     '''
-        Function builds complementary problem from original problem 
+        Function finds optimal tableau with dual simplex algorithm
+    Input:
+        A: dual feasible tableau (all reduced costs >= 0)
+        tol: right-hand sides greater than -tol are considered nonnegative
+        observer: instrumentation.SolveObserver told about every pivot (None: no instrumentation)
+        basis: index of the basic variable of each row, updated in place through every pivot
+    Output:
+        B: optimal tableau (None if the problem is infeasible)
+    '''
+    if basis is None:
+        basis = find_unit_basis(A[:, :-1])[1:]
+
+    while True:
+        if observer is not None:
+            start = perf_counter()
+
+        # find pivot row: the most negative right-hand side
+        pivot_row = 1 + np.argmin(A[1:, -1])
+        if A[pivot_row, -1] >= -tol:
+            return A
+
+        if observer is not None:
+            priced = perf_counter()
+
+        # find pivot column, no negative entry => problem is infeasible
+        row = A[pivot_row, :-1]
+        mask = row < -tol
+        if not mask.any():
+            return None
+
+        ratios = np.full(row.shape, np.inf)
+        np.divide(np.maximum(A[0, :-1], 0.0), -row, out = ratios, where = mask)
+        pivot_col = np.argmin(ratios)
+
+        if observer is not None:
+            tested = perf_counter()
+
+        pivot(A, pivot_row, pivot_col)
+        leaving = basis[pivot_row - 1]
+        basis[pivot_row - 1] = pivot_col
+
+        if observer is not None:
+            observer.pivot(pivot_col, leaving, pivot_row, -A[0, -1], priced - start, tested - priced, perf_counter() - tested)
+
+
+def dual_simplex_algorithm(n_var, A, free_var = [], func_type = 'Minimize', tol = 1e-9, observer = None):
+    '''
+        Function using dual simplex algorithm finds optimal solution for linear programming problems
+    whose starting tableau is dual feasible, without building an auxiliary problem.
+    Input: 
+        n_var: number of original variables.
+        A: original tableau (all reduced costs >= 0).
+        free_var: python list include indeces of free variables. 
+        func_type: type of objective function
+        tol: feasibility tolerance
+        observer: instrumentation.SolveObserver (None: no instrumentation)
+    Output:
+        A: optimal tableau
+        z: optimal value
+        solver: optimal soluitons 
+    '''
+    # check is there any reduced cost < 0
+    if np.any(A[0, :-1] < -tol):
+        return None, None, None
+
+    basis = find_unit_basis(A[:, :-1])[1:]
+    if np.any(basis < 0):
+        return None, None, None
+    if observer is not None:
+        observer.start_phase('dual')
+    A = dual_pivot_operation(A, tol, observer, basis)
+    if observer is not None:
+        observer.end_phase('optimal' if isinstance(A, np.ndarray) else 'infeasible')
+    if not isinstance(A, np.ndarray):
+        return None, None, None
+
+    return  A, get_optimal_value(A, func_type), recover_solution(get_tableau_solution(A, basis), n_var, free_var)
+
+
+def choose_method(A, tol = 1e-9):
+    '''
+        Function chooses the simplex engine from the starting tableau.
     Input:
         A: original tableau
     Output:
-        B: taleau of complementary problem
+        method: "primal" if the tableau is primal feasible, "dual" if it is dual feasible,
+                "two_phase" otherwise, "revised" if some rows have no basic variable (equality rows)
     '''
-    dim = A.shape
-    
-    z_new = np.zeros(dim[1] + 1)
-    z_new[-2] = 1.0
-    
-    B = A[1:,:].copy()
-    B = np.vstack((z_new, np.insert(B, -1, -1, axis = 1)))
-    return B
+    if np.any(find_unit_basis(A[:, :-1])[1:] < 0):
+        return 'revised'
+    if not np.any(A[1:, -1] < -tol):
+        return 'primal'
+    if not np.any(A[0, :-1] < -tol):
+        return 'dual'
+    return 'two_phase'
 
 
-def solve_complementary_problem(B):
+def recover_solution(solver, n_var, free_var = []):
     '''
-       Function solves complementary problem.
+        Function maps a solution of the standard form back onto the original variables.
     Input:
-        n_var: number of original varialbes
-        B: tableau of complementary problem
+        solver: values of all variables of the standard form
+        n_var: number of original variables.
+        free_var: python list include indeces of free variables.
     Output:
-        B: optimal tableau of complementary problem
+        solver: values of X1..Xn
     '''
-    z_new = B[0,:].copy()
-    
-    # pivot column
-    pivot_col = -2 
-    
-    # pivot row
-    pivot_row =  np.where(B[:,-1] == min(B[:,-1]))[0][0]
+    solver = list(solver)
 
-    
-    # pivot element
-    pivot = B[pivot_row, pivot_col]
+    # merge each pair of positive variables into its free variable
+    for i in free_var:
+        solver[i] = solver[i] - solver[i + 1]
+    for i in reversed(free_var):
+        del solver[i + 1]
+
+    return solver[:n_var]
 
-    # Thuc hien phep xoay ban dau
-    B[pivot_row, :] = B[pivot_row, :]/pivot
 
-    for i in range(B.shape[0]):
-        if i == pivot_row:
+def restore_signs(solver, variable_cons):
+    '''
+        Function flips back the values of the "<= 0" variables, whose columns transfer_to_standard_form negates.
+    Input:
+        solver: values of X1..Xn returned by an engine
+        variable_cons: constraints of variables ("<= 0", ">= 0", "Free")
+    Output:
+        solver: values of X1..Xn
+    '''
+    return [-x if con == "<= 0" and x else x for x, con in zip(solver, variable_cons)]
+
+
+def get_optimal_value(A, func_type = 'Minimize'):
+    '''
+        Function reads the optimal value from an optimal tableau.
+    Input:
+        A: optimal tableau
+        func_type: type of objective function
+    Output:
+        z: optimal value
+    '''
+    if func_type == 'Minimize':
+        return -A[0, -1]
+    return A[0, -1]
+
+
+def complete_basis(A, basis, tol = 1e-9):
+    '''
+        Function pivots a basic variable into every row without one (e.g. rows of "=" constraints),
+    on the largest entry of the row. The right-hand side may become negative, which phase 1 repairs.
+    Input:
+        A: tableau, changed in place
+        basis: index of the basic variable of each row (-1 if none), updated in place
+    Output:
+        feasible: False if a row has no nonzero coefficient but a nonzero right-hand side;
+                  zero rows (redundant constraints) keep -1 as basic variable
+    '''
+    for r in np.where(basis < 0)[0]:
+        row = np.abs(A[1 + r, :-1])
+        pivot_col = np.argmax(row)
+        if row[pivot_col] <= tol:
+            if abs(A[1 + r, -1]) > tol:
+                return False
+            A[1 + r] = 0.0
             continue
-        B[i, :] = B[i, :] - B[i, pivot_col]*B[pivot_row, :]
+        pivot(A, 1 + r, pivot_col)
+        basis[r] = pivot_col
+    return True
+
+
+def build_complementary_problem(A, dtype = np.float64, tol = 1e-9):
+    '''
+        Function builds complementary problem from original problem in a single buffer. Column 0
+    is reserved for x0, so phase 2 runs on the view B[:, 1:] without copying the tableau.
+    Input:
+        A: original tableau
+        dtype: precision of the buffer
+        tol: pivot tolerance of complete_basis
+    Output:
+        B: taleau of complementary problem (None if a constraint row is inconsistent)
+        basis: index of the basic variable of each row of B (-1 for redundant rows)
+    '''
+    B = np.empty((A.shape[0], A.shape[1] + 1), dtype = dtype)
+    B[:, 1:] = A
+
+    # every row needs a basic variable
+    basis = find_unit_basis(B[:, 1:-1])[1:]
+    if not complete_basis(B[:, 1:], basis, tol):
+        return None, None
+
+    # x0 is subtracted from every row but the redundant (zero) ones and is the only cost
+    B[0] = 0.0
+    B[0, 0] = 1.0
+    B[1:, 0] = np.where(basis < 0, 0.0, -1.0)
+    return B, np.where(basis < 0, -1, basis + 1)
+
+
+def solve_complementary_problem(B, pricing = None, observer = None, basis = None, tol = 1e-9):
+    '''
+       Function solves complementary problem.
+    Input:
+        B: tableau of complementary problem (x0 in column 0)
+        pricing: pricing strategy choosing pivot column
+        observer: instrumentation.SolveObserver (None: no instrumentation)
+        basis: index of the basic variable of each row, updated in place (None: found from the unit columns of B)
+        tol: feasibility tolerance
+    Output:
+        B: optimal tableau of complementary problem, x0 is not basic in it
+    '''
+    x0 = 0
+    if basis is None:
+        basis = find_unit_basis(B[:, :-1])[1:]
+
+    # pivot row
+    pivot_row = 1 + np.argmin(B[1:, -1])
+
+    if observer is not None:
+        observer.start_phase('phase_1')
+
+    # Thuc hien phep xoay ban dau (not needed if every b_i >= 0)
+    if B[pivot_row, -1] < 0:
+        if observer is not None:
+            start = perf_counter()
+        pivot(B, pivot_row, x0)
+        leaving = basis[pivot_row - 1]
+        basis[pivot_row - 1] = x0
+        if observer is not None:
+            observer.pivot(x0, leaving, pivot_row, -B[0, -1], 0.0, 0.0, perf_counter() - start)
  
-    B = pivot_operation(B)
+    B = pivot_operation(B, tol, pricing = pricing, observer = observer, basis = basis)
     if not isinstance(B, np.ndarray):
+        if observer is not None:
+            observer.end_phase('unbounded')
         return None
 
-    # if only x0 exists on objective function
-    if (B[0,:] == z_new).all():
-        return B
-    else:
+    # the original problem is feasible iff x0 = 0 at the optimum of the complementary problem
+    feasible = abs(B[0, -1]) <= tol*(1.0 + np.abs(B[1:, -1]).max(initial = 0.0))
+    if observer is not None:
+        observer.end_phase('optimal' if feasible else 'infeasible')
+
+    if not feasible:
         #os.system('cls' if os.name == 'nt' else 'clear')
         #sys.exit("Tu vung toi uu cua bai toan bo tro xuat hien cac bien khac tren ham muc tieu. Bai toan Vo nghiem'")   
-        return None 
+        return None
+
+    # x0 still basic at zero level: pivot it out on any nonzero entry of its row
+    for r in np.where(basis == x0)[0]:
+        candidates = 1 + np.where(np.abs(B[1 + r, 1:-1]) > tol)[0]
+        if len(candidates) == 0:
+            # redundant constraint, the row is zero once x0 is removed
+            basis[r] = -1
+            continue
+        pivot_col = candidates[np.argmax(np.abs(B[1 + r, candidates]))]
+        pivot(B, 1 + r, pivot_col)
+        basis[r] = pivot_col
+
+    # round-off may leave right-hand sides slightly below zero
+    np.maximum(B[1:, -1], 0.0, out = B[1:, -1])
+    return B
 
 
-def simplex_phases_2(B, z):
+def simplex_phases_2(B, z, basis):
     '''
         Function makes phase 2 of simplex algorithm
     Input:  
-        B: tableau of complementary problem
+        B: optimal tableau of complementary problem (x0 in column 0)
         z: original objective function
+        basis: index of the basic variable of each row of B (x0 not among them), renumbered in place
     Output:
-        B: new tableau(new objective function and new constraints)
+        B: new tableau(new objective function and new constraints), a view of the input without the column of x0
     '''
 
-    # remove column of x0
-    B = np.delete(B, -2, 1)
-    
-    # new objective function
-    z_new = B[0]
+    # remove column of x0 (no copy) and renumber the basic variables
+    B = B[:, 1:]
+    basis[basis > 0] -= 1
+
+    # new objective function: original costs minus the cost of each basic variable times its row
+    rows = np.where(basis >= 0)[0]
+    costs = np.zeros(len(basis), dtype = B.dtype)
+    costs[rows] = z[basis[rows]]
+    B[0] = z
+    B[0] -= costs @ B[1:]
+    B[0, basis[rows]] = 0.0
+    return B
 
-    index_col = np.where(z != 0)[0]
 
-    for i in index_col:
-        if len(np.where(B[1:, i] == 1)[0]) == 0:
-            temp = np.zeros(len(B[0]), dtype = float)
-            temp[i] = 1.0
-            z_new += temp
-            continue
-        index_row = np.where(B[1:, i] == 1)[0][0] + 1
-        
-        row = B[index_row, :].copy()
-        for j in range(len(B[0])):
-            if j == i:
-                row[j] = 0.0
-                continue
-            row[j] *= -1
-            
-        z_new += row*z[i]
-    
-    # new tableau
-    B[0] = z_new    
-    return B
+def refine_basis(n_var, A, free_var, func_type, basis, pricing = None, observer = None, tol = 1e-9):
+    '''
+        Function rebuilds in double precision the tableau of a basis found in single precision and
+    finishes with the simplex algorithm, which usually needs few or no pivots.
+    Input:
+        n_var, free_var, func_type, pricing, observer: see simplex_algorithm
+        A: original tableau in double precision, changed in place only if the basis can be used
+        basis: index of the basic variable of each row
+    Output:
+        A: optimal tableau
+        z: optimal value
+        solver: optimal solution (None, None, None if the basis is singular or not primal feasible)
+    '''
+    if np.any(basis < 0):
+        return None, None, None
+    try:
+        rows = np.linalg.solve(A[1:, basis], A[1:])
+    except np.linalg.LinAlgError:
+        return None, None, None
+    if np.any(rows[:, -1] < -tol*(1.0 + np.abs(rows[:, -1]).max(initial = 0.0))):
+        return None, None, None
+
+    A[1:] = rows
+    del rows
+    np.maximum(A[1:, -1], 0.0, out = A[1:, -1])
+    A[0] -= A[0, basis] @ A[1:]
+    A[0, basis] = 0.0
+    return simplex_algorithm(n_var, A, free_var, func_type, pricing, observer, 'refinement', basis, tol)
 
 
-def simplex_2_phases_algorithm(n_var, A, free_var = [], func_type = 'Minimize'):
+def simplex_2_phases_algorithm(n_var, A, free_var = [], func_type = 'Minimize', pricing = None, observer = None, dtype = np.float64):
     '''
         Function using Simplex 2 phase algotithm finds optimal solution for linear programming problems.
+    Both phases run in one preallocated buffer, phase 2 on a view of it without the column of x0.
     Input: 
         n_var: number of original variables.
         A: original tableau.
         free_var: python list include indeces of free variables. 
         func_type: type of objective function
-        solvable: flag using to check problem is solvable or not
-        err_name:
+        pricing: pricing strategy choosing pivot column
+        observer: instrumentation.SolveObserver (None: no instrumentation)
+        dtype: precision of the buffer; with np.float32 the phases use half the memory, the optimal
+               basis is then refined in double precision on A, and the problem is solved again in
+               double precision if that fails (or if the single precision solve finds no optimum)
     Output:
         A: optimal tableau
         z: optimal value
         solver: optimal solution
     '''
-    # get original objective function
-    z = A[0].copy()
+    single = np.dtype(dtype) != np.float64
+    tol = 100*np.finfo(dtype).eps if single else 1e-9
 
     # build and solve complementary problem
-    B = build_complementary_problem(A)
-    
-    B = solve_complementary_problem(B)
-    
-    if not isinstance(B, np.ndarray):
-        return None, None, None
-    # if complementary problem is solvable => phase 2
-    B = simplex_phases_2(B, z)
-    if not isinstance(B, np.ndarray):
-        return None, None, None
-
-    # using simplex algorithm to find optimal solution
-    return simplex_algorithm(n_var, B, free_var, func_type)
-
-def solve_linear_programming_problem(n_var, A, free_var = [], func_type = 'min'):
+    B, basis = build_complementary_problem(A, dtype, tol)
+    if B is not None:
+        B = solve_complementary_problem(B, pricing, observer, basis, tol)
+
+    result = None, None, None
+    if isinstance(B, np.ndarray):
+        # if complementary problem is solvable => phase 2, using simplex algorithm to find optimal solution
+        B = simplex_phases_2(B, A[0], basis)
+        result = simplex_algorithm(n_var, B, free_var, func_type, pricing, observer, 'phase_2', basis, tol)
+    if not single:
+        return result
+
+    # free the single precision buffer before the double precision tableau is built
+    found = isinstance(result[0], np.ndarray)
+    B = result = None
+    if found:
+        result = refine_basis(n_var, A, free_var, func_type, basis, pricing, observer)
+        if isinstance(result[0], np.ndarray):
+            return result
+    return simplex_2_phases_algorithm(n_var, A, free_var, func_type, pricing, observer)
+
+def solve_linear_programming_problem(n_var, A, free_var = [], func_type = 'min', method = 'auto', pricing = None,
+                                     basis = None, return_basis = False, observer = None, dtype = np.float64, bounds = None,
+                                     tableau = None):
     '''
         Function summarizing all linear programming algorithm solves any linear programing problem 
     Input:
@@ -307,18 +734,83 @@ def solve_linear_programming_problem(n_var, A, free_var = [], func_type = 'min')
         A: original tableau.
         free_var: python list include indeces of free variables. 
         func_type: type of objective function
+        method: solver engine ("primal", "dual", "two_phase", "tableau", "revised", "interior_point", "network",
+                "bounded"),
+                "tableau" uses primal simplex if b >= 0 and every row has a basic variable and the two-phase
+                algorithm otherwise, "auto" uses the network simplex for network problems (see
+                network_simplex.network_structure), the revised simplex for other sparse problems or warm
+                starts and choose_method otherwise; problems with bounds always use the bounded simplex
+        pricing: pricing strategy choosing pivot column ("dantzig", "bland", "partial", "devex",
+                 "steepest_edge" or a pricing.PricingStrategy instance)
+        basis: revised_simplex.Basis returned by a previous solve of the same model, the revised
+               simplex resumes from it after changes of the costs or of the right-hand side
+        return_basis: also return the optimal basis
+        observer: instrumentation.SolveObserver told about every pivot and phase (None: no instrumentation)
+        dtype: precision of the two-phase tableau, np.float32 halves its memory (the result is refined
+               in double precision, see simplex_2_phases_algorithm)
+        bounds: (lower, upper) bounds of the columns of A for the bounded-variable simplex, which keeps
+                them as attributes of the columns instead of constraint rows (default: every column >= 0)
+        tableau: build the constraint rows of the optimal tableau of the revised simplex (default: only if A
+                 is dense, a sparse A only gets the objective row, see revised_simplex_algorithm)
     Output:
         A: optimal tableau
         z: optimal value
         solver: optimal solution
+        basis: optimal basis (only if return_basis)
     '''
-    
-    if not np.any(A[1:,-1] < 0):
-        B, z, solver = simplex_algorithm(n_var, A, free_var, func_type) 
-    else: 
-        B, z, solver = simplex_2_phases_algorithm(n_var, A, free_var, func_type) 
+    if method == 'auto' and bounds is not None:
+        method = 'bounded'
+    if method == 'auto' and basis is None:
+        from network_simplex import is_network
+        if is_network(A):
+            method = 'network'
+    if method == 'auto':
+        method = 'revised' if is_sparse(A) or basis is not None else choose_method(A)
+
+    # tableau pivoting fills in, so the tableau engines work on a dense copy
+    if method not in ('revised', 'interior_point', 'network') and is_sparse(A):
+        A = A.toarray()
+
+    if method == 'tableau':
+        method = 'two_phase' if np.any(A[1:,-1] < 0) or np.any(find_unit_basis(A[:, :-1])[1:] < 0) else 'primal'
+
+    if method == 'revised':
+        from revised_simplex import revised_simplex_algorithm
+        B, z, solver, opt_basis = revised_simplex_algorithm(n_var, A, free_var, func_type, pricing = pricing,
+                                                             basis = basis, return_basis = True, observer = observer,
+                                                             tableau = tableau)
+    elif method == 'network':
+        from network_simplex import network_simplex_algorithm
+        B, z, solver, tree = network_simplex_algorithm(n_var, A, free_var, func_type, observer = observer, return_basis = True)
+    elif method == 'bounded':
+        from bounded_simplex import bounded_simplex_algorithm
+        n = A.shape[1] - 1
+        lower, upper = bounds if bounds is not None else (np.zeros(n), np.full(n, np.inf))
+        B, z, solver = bounded_simplex_algorithm(n, A, lower, upper, func_type, pricing, observer = observer)
+        if isinstance(B, np.ndarray):
+            solver = recover_solution(solver, n_var, free_var)
+    elif method == 'interior_point':
+        from interior_point import interior_point_algorithm
+        B, z, solver = interior_point_algorithm(n_var, A, free_var, func_type, observer = observer)
+    elif method == 'primal':
+        B, z, solver = simplex_algorithm(n_var, A, free_var, func_type, pricing, observer)
+    elif method == 'dual':
+        B, z, solver = dual_simplex_algorithm(n_var, A, free_var, func_type, observer = observer)
+    elif method == 'two_phase': 
+        B, z, solver = simplex_2_phases_algorithm(n_var, A, free_var, func_type, pricing, observer, dtype)
+    else:
+        raise ValueError(f"Unknown method: {method}")
 
     if not isinstance(B, np.ndarray):
         print("Cannot find the optimal solutions.")
-    else: 
-        return B, z, solver 
+        return (None, None, None, None) if return_basis else (None, None, None)
+
+    if not return_basis:
+        return B, z, solver
+    if method == 'network':
+        from revised_simplex import Basis
+        opt_basis = None if tree is None else Basis(tree, (B.shape[0] - 1, B.shape[1] - 1))
+    elif method != 'revised':
+        from revised_simplex import Basis
+        opt_basis = Basis.from_tableau(B)
+    return B, z, solver, opt_basis
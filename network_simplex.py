@@ -0,0 +1,282 @@
+from time import perf_counter
+
+import numpy as np
+
+from linear_programming_functions import is_sparse, get_optimal_value, recover_solution
+
+
+def network_structure(A, tol = 1e-9):
+    '''
+        Function detects network structure in a standard form: after flipping the signs of some rows,
+    every column has at most one +1 and at most one -1, i.e. it is an arc leaving the node of its +1 row
+    and entering the node of its -1 row (a single entry connects to a root node, like a slack column).
+    Transportation and assignment columns, with a +1 in a supply row and a +1 in a demand row, become
+    arcs once the demand rows are flipped.
+    Input:
+        A: standard form (dense or scipy sparse)
+        tol: zero tolerance of the entries
+    Output:
+        row_sign: sign (1 or -1) of each constraint row
+        tail, head: node of the +1 and of the -1 entry of each column (m, the root node, if none)
+        None, None, None if A is not a network
+    '''
+    m, n = A.shape[0] - 1, A.shape[1] - 1
+    if is_sparse(A):
+        T = A[1:, :-1].tocsc()
+        cols = np.repeat(np.arange(n), np.diff(T.indptr))
+        rows, values = T.indices, T.data
+        keep = np.abs(values) > tol
+        cols, rows, values = cols[keep], rows[keep], values[keep]
+    else:
+        T = np.asarray(A[1:, :-1])
+        cols, rows = np.nonzero(np.abs(T.T) > tol)
+        values = T[rows, cols]
+    counts = np.bincount(cols, minlength = n)
+    if counts.max(initial = 0) > 2 or np.any(np.abs(np.abs(values) - 1.0) > tol):
+        return None, None, None
+
+    # the two rows of a column need opposite signed entries: a union-find with parity 2-colours the rows
+    first = np.cumsum(counts) - counts
+    pairs = first[counts == 2]
+    p, q = rows[pairs], rows[pairs + 1]
+    flip = np.sign(values[pairs]) == np.sign(values[pairs + 1])
+    parent = list(range(m))
+    parity = [False]*m
+
+    def find(r):
+        flipped = False
+        path = []
+        while parent[r] != r:
+            path.append(r)
+            flipped ^= parity[r]
+            r = parent[r]
+        # path compression keeps the parity of every node relative to the new parent
+        acc = flipped
+        for node in path:
+            old = parity[node]
+            parent[node], parity[node] = r, acc
+            acc ^= old
+        return r, flipped
+
+    for a, b, f in zip(p.tolist(), q.tolist(), flip.tolist()):
+        root_a, flip_a = find(a)
+        root_b, flip_b = find(b)
+        if root_a == root_b:
+            if flip_a ^ flip_b != f:
+                return None, None, None
+        else:
+            parent[root_b], parity[root_b] = root_a, flip_a ^ flip_b ^ f
+    row_sign = np.array([-1.0 if find(r)[1] else 1.0 for r in range(m)])
+
+    signed = values*row_sign[rows]
+    tail = np.full(n, m)
+    head = np.full(n, m)
+    tail[cols[signed > 0]] = rows[signed > 0]
+    head[cols[signed < 0]] = rows[signed < 0]
+    return row_sign, tail, head
+
+
+def is_network(A, tol = 1e-9):
+    '''
+        Function checks whether a standard form is a network (see network_structure).
+    '''
+    return network_structure(A, tol)[0] is not None
+
+
+def network_simplex(tail, head, cost, supply, tol = 1e-9, max_iter = None, observer = None):
+    '''
+        Function using the network simplex method finds a minimum cost flow
+            min cost*x  subject to  (flow out of node) - (flow into node) = supply, x >= 0
+    on nodes 0..m-1 and a root node m, whose supply balances the others. The basis is a spanning tree
+    kept as parent pointers with depths and node potentials: a pivot walks the cycle of the entering arc
+    and re-hangs one subtree, instead of updating a tableau. It starts from artificial arcs between
+    every node and the root (big-M costs) and follows the strongly feasible leaving rule, which
+    prevents cycling on the many degenerate pivots of transportation and assignment problems.
+    Input:
+        tail, head: nodes of the arcs (flow goes from tail to head)
+        cost: costs of the arcs
+        supply: supplies of the nodes 0..m-1 (negative for demands)
+        tol: optimality and feasibility tolerance
+        max_iter: maximal number of pivots
+        observer: instrumentation.SolveObserver (None: no instrumentation)
+    Output:
+        status: "optimal", "infeasible", "unbounded" or "iteration_limit"
+        flow: flows of the arcs
+        potential: potentials of the nodes 0..m (duals of the node rows, 0 at the root)
+        tree: arc of each node 0..m-1 to its parent in the final tree (len(cost) + v for the artificial arc of node v)
+    '''
+    m = len(supply)
+    n_arc = len(cost)
+    root = m
+    max_cost = max(1.0, np.abs(cost).max(initial = 0.0))
+    big_m = 1.0 + 2.0*(m + 1)*max_cost
+
+    # artificial arc of node v carries its supply to (or its demand from) the root
+    nodes = np.arange(m)
+    tail = np.concatenate((tail, np.where(supply >= 0, nodes, root))).astype(np.int64)
+    head = np.concatenate((head, np.where(supply >= 0, root, nodes))).astype(np.int64)
+    cost = np.concatenate((cost, np.full(m, big_m)))
+    flow = np.concatenate((np.zeros(n_arc), np.abs(supply)))
+    total = n_arc + m
+
+    parent = [root]*m + [-1]
+    pred = list(range(n_arc, total)) + [-1]
+    depth = [1]*m + [0]
+    children = [set() for _ in range(m)] + [set(range(m))]
+    potential = np.append(np.where(supply >= 0, big_m, -big_m), 0.0)
+
+    block = max(64, int(np.sqrt(total)))
+    position = 0
+    iteration = 0
+    status = "iteration_limit"
+    objective = cost @ flow
+    while max_iter is None or iteration < max_iter:
+        start = perf_counter()
+
+        # block pricing: the first block holding an arc of negative reduced cost gives the entering arc
+        entering = -1
+        examined = 0
+        while examined < total:
+            stop = min(position + block, total)
+            reduced = cost[position:stop] - potential[tail[position:stop]] + potential[head[position:stop]]
+            k = np.argmin(reduced)
+            examined += stop - position
+            position = stop % total
+            if reduced[k] < -tol*max_cost:
+                entering = stop - len(reduced) + k
+                reduced_cost = reduced[k]
+                break
+        if entering < 0:
+            status = "optimal"
+            break
+        priced = perf_counter()
+
+        # cycle of the entering arc: s -> t, then up the tree from t to the apex and down from the apex to s
+        s, t = int(tail[entering]), int(head[entering])
+        path_s, path_t = [], []
+        u, v = s, t
+        while u != v:
+            if depth[u] >= depth[v]:
+                path_s.append(u)
+                u = parent[u]
+            else:
+                path_t.append(v)
+                v = parent[v]
+
+        # blocking arcs are the ones the cycle's flow runs against; the last one from the apex leaves
+        leaving, leaving_node, delta = -1, -1, np.inf
+        for w in reversed(path_s):
+            a = pred[w]
+            if tail[a] == w and flow[a] <= delta:
+                leaving, leaving_node, delta = a, w, flow[a]
+        for w in path_t:
+            a = pred[w]
+            if tail[a] != w and flow[a] <= delta:
+                leaving, leaving_node, delta = a, w, flow[a]
+        if leaving < 0:
+            status = "unbounded"
+            break
+        tested = perf_counter()
+
+        # push delta around the cycle
+        if delta > 0:
+            flow[entering] += delta
+            for w in path_s:
+                a = pred[w]
+                flow[a] += -delta if tail[a] == w else delta
+            for w in path_t:
+                a = pred[w]
+                flow[a] += delta if tail[a] == w else -delta
+            objective += reduced_cost*delta
+
+        # the subtree below the leaving arc hangs from the entering arc, re-rooted at its endpoint
+        if leaving_node in path_s:
+            u_new, v_new, shift = s, t, reduced_cost
+        else:
+            u_new, v_new, shift = t, s, -reduced_cost
+        children[parent[leaving_node]].discard(leaving_node)
+        w, new_parent, new_pred = u_new, v_new, entering
+        while True:
+            old_parent, old_pred = parent[w], pred[w]
+            if w != leaving_node:
+                children[old_parent].discard(w)
+            parent[w], pred[w] = new_parent, new_pred
+            children[new_parent].add(w)
+            if w == leaving_node:
+                break
+            w, new_parent, new_pred = old_parent, w, old_pred
+
+        # depths and potentials of the moved subtree
+        depth[u_new] = depth[v_new] + 1
+        subtree = [u_new]
+        for w in subtree:
+            for child in children[w]:
+                depth[child] = depth[w] + 1
+                subtree.append(child)
+        potential[subtree] += shift
+
+        iteration += 1
+        if observer is not None:
+            observer.pivot(entering, leaving, leaving_node, objective, priced - start, tested - priced, perf_counter() - tested)
+
+    if status == "optimal" and np.any(flow[n_arc:] > tol*(1.0 + np.abs(supply).max(initial = 0.0))):
+        status = "infeasible"
+    return status, flow[:n_arc], potential, np.array(pred[:m])
+
+
+def network_simplex_algorithm(n_var, A, free_var = [], func_type = 'Minimize', tol = 1e-9, max_iter = None, observer = None,
+                              return_basis = False):
+    '''
+        Function solves a standard form with network structure (see network_structure) by the network simplex.
+    Input:
+        n_var: number of original variables.
+        A: original tableau (dense or scipy sparse), which must be a network
+        free_var: python list include indeces of free variables.
+        func_type: type of objective function
+        tol: optimality and feasibility tolerance
+        max_iter: maximal number of pivots
+        observer: instrumentation.SolveObserver (None: no instrumentation)
+        return_basis: also return the columns of the final spanning tree
+    Output:
+        A: optimal tableau, which keeps the original constraint rows; its objective row holds the reduced costs
+        z: optimal value
+        solver: optimal solution
+        basis: column of each tree arc, None if an artificial arc stays in the tree (only if return_basis)
+    '''
+    row_sign, tail, head = network_structure(A, tol)
+    if row_sign is None:
+        raise ValueError("The standard form is not a network")
+    failed = (None, None, None, None) if return_basis else (None, None, None)
+
+    if is_sparse(A):
+        c = A[0, :-1].toarray().ravel()
+        b = A[1:, -1].toarray().ravel()
+    else:
+        c, b = np.array(A[0, :-1], dtype = float), np.array(A[1:, -1], dtype = float)
+    m, n = len(b), len(c)
+
+    # empty columns (e.g. slack columns of "=" rows) stay at zero, or make the problem unbounded
+    arcs = np.where((tail != m) | (head != m))[0]
+    if np.any(c[np.setdiff1d(np.arange(n), arcs)] < -tol):
+        return failed
+
+    if observer is not None:
+        observer.start_phase('network', nodes = m + 1, arcs = len(arcs))
+    status, flow, potential, tree = network_simplex(tail[arcs], head[arcs], c[arcs], row_sign*b, tol, max_iter, observer)
+    if observer is not None:
+        observer.end_phase(status)
+    if status != "optimal":
+        return failed
+
+    x = np.zeros(n)
+    x[arcs] = flow
+    B = np.empty((m + 1, n + 1))
+    B[0, :-1] = c - potential[tail] + potential[head]
+    B[0, -1] = -(c @ x)
+    B[1:, :-1] = A[1:, :-1].toarray() if is_sparse(A) else A[1:, :-1]
+    B[1:, -1] = b
+
+    result = (B, get_optimal_value(B, func_type), recover_solution(x, n_var, free_var))
+    if not return_basis:
+        return result
+    return result + (arcs[tree] if np.all(tree < len(arcs)) else None,)
@@ -0,0 +1,266 @@
+import numpy as np
+
+from linear_programming_functions import split_bounds, transfer_to_standard_form, solve_linear_programming_problem, restore_signs
+
+
+class Postsolve:
+    '''
+        Record of the reductions made by presolve, used to map a solution of the reduced problem
+    back onto the original variables X1..Xn: X[kept] = shift + solution of the reduced problem.
+    '''
+    def __init__(self, n_var, kept, fixed, offset, shift = None):
+        self.n_var = n_var
+        self.kept = kept
+        self.fixed = fixed
+        self.offset = offset
+        self.shift = np.zeros(len(kept)) if shift is None else shift
+
+
+def activity_bounds(C, lower, upper):
+    '''
+        Function computes the minimal and maximal activity of every row over the bounds of the variables.
+    Input:
+        C: coefficients of constraints
+        lower, upper: bounds of variables
+    Output:
+        min_act, max_act: minimal and maximal value of each row (may be infinite)
+    '''
+    positive = np.where(C > 0, C, 0.0)
+    negative = np.where(C < 0, C, 0.0)
+    with np.errstate(invalid = 'ignore'):
+        min_act = np.nansum(np.where(C > 0, positive*lower, 0.0) + np.where(C < 0, negative*upper, 0.0), axis = 1)
+        max_act = np.nansum(np.where(C > 0, positive*upper, 0.0) + np.where(C < 0, negative*lower, 0.0), axis = 1)
+    return min_act, max_act
+
+
+def presolve(n_var, n_constraint, func_type, func_coef, constraints, constraint_signs, variable_cons, tol = 1e-9, max_passes = 20):
+    '''
+        Function reduces a problem in original form before transfer_to_standard_form.
+    Empty and duplicate rows are removed, singleton rows become bounds of their variable, fixed variables
+    (and variables forced to one value by the bounds implied by the constraints) are substituted, and
+    constraints dominated by the bounds of the variables are dropped. The passes repeat until nothing changes.
+    Every kept variable is then shifted onto its finite bound (x = lower + x' with x' >= 0, or x = upper + x'
+    with x' <= 0), so bounds only need a constraint row if a variable has both a lower and an upper bound.
+    Input:
+        same as transfer_to_standard_form (constraints as python lists or numpy array)
+        tol: tolerance of the feasibility checks
+        max_passes: maximal number of presolve passes
+    Output:
+        problem: reduced problem as a tuple of the inputs of transfer_to_standard_form (None if infeasible)
+        postsolve: Postsolve record of the reductions
+    '''
+    c = np.array(func_coef[:n_var], dtype = float)
+    data = np.array(constraints, dtype = float).reshape(n_constraint, n_var + 1)
+    C = data[:, :n_var].copy()
+    b = data[:, n_var].copy()
+    signs = np.array(constraint_signs[:n_constraint], dtype = object)
+
+    variable_cons = np.array(variable_cons[:n_var])
+    lower = np.where(variable_cons == '<= 0', -np.inf, np.where(variable_cons == 'Free', -np.inf, 0.0))
+    upper = np.where(variable_cons == '<= 0', 0.0, np.inf)
+
+    row_alive = np.ones(n_constraint, dtype = bool)
+    col_alive = np.ones(n_var, dtype = bool)
+    fixed = {}
+    offset = 0.0
+
+    def infeasible():
+        return None, Postsolve(n_var, np.where(col_alive)[0], fixed, offset)
+
+    for _ in range(max_passes):
+        changed = False
+
+        # fixed variables: substitute their value
+        for j in np.where(col_alive & (upper - lower <= tol))[0]:
+            value = lower[j]
+            b -= C[:, j]*value
+            offset += c[j]*value
+            C[:, j] = 0.0
+            col_alive[j] = False
+            fixed[j] = value
+            changed = True
+
+        nonzero = (np.abs(C) > tol) & col_alive & row_alive[:, None]
+        count = nonzero.sum(axis = 1)
+
+        # empty rows: drop them if 0 satisfies them
+        for i in np.where(row_alive & (count == 0))[0]:
+            if (signs[i] == '<=' and b[i] < -tol) or (signs[i] == '>=' and b[i] > tol) or (signs[i] == '=' and abs(b[i]) > tol):
+                return infeasible()
+            row_alive[i] = False
+            changed = True
+
+        # singleton rows: a*x_j (sign) b becomes a bound of x_j
+        for i in np.where(row_alive & (count == 1))[0]:
+            j = np.where(nonzero[i])[0][0]
+            if not col_alive[j]:
+                continue
+            value = b[i]/C[i, j]
+            sign = signs[i]
+            if C[i, j] < 0 and sign != '=':
+                sign = '<=' if sign == '>=' else '>='
+            if sign in ('<=', '='):
+                upper[j] = min(upper[j], value)
+            if sign in ('>=', '='):
+                lower[j] = max(lower[j], value)
+            if lower[j] > upper[j] + tol:
+                return infeasible()
+            upper[j] = max(upper[j], lower[j])
+            row_alive[i] = False
+            changed = True
+
+        # duplicate rows: rows equal up to a scale factor are merged
+        groups = {}
+        for i in np.where(row_alive)[0]:
+            row = C[i, col_alive]
+            first = row[np.argmax(np.abs(row) > tol)]
+            key = np.round(row/first, 12).tobytes()
+
+            # interval of the scaled row, dividing by a negative number flips the sign
+            sign = signs[i]
+            if first < 0 and sign != '=':
+                sign = '<=' if sign == '>=' else '>='
+            low = b[i]/first if sign in ('>=', '=') else -np.inf
+            up = b[i]/first if sign in ('<=', '=') else np.inf
+            groups.setdefault(key, []).append((i, first, low, up))
+
+        for rows in groups.values():
+            if len(rows) == 1:
+                continue
+            low = max(r[2] for r in rows)
+            up = min(r[3] for r in rows)
+            if low > up + tol:
+                return infeasible()
+
+            # keep the first row (scaled to a leading 1) for one side, the second one for the other side
+            i, first = rows[0][0], rows[0][1]
+            C[i] /= first
+            if up - low <= tol:
+                signs[i], b[i] = '=', low
+                keep = [i]
+            elif low == -np.inf:
+                signs[i], b[i] = '<=', up
+                keep = [i]
+            elif up == np.inf:
+                signs[i], b[i] = '>=', low
+                keep = [i]
+            else:
+                k = rows[1][0]
+                C[k] = C[i]
+                signs[i], b[i] = '>=', low
+                signs[k], b[k] = '<=', up
+                keep = [i, k]
+            for r in rows:
+                if r[0] not in keep:
+                    row_alive[r[0]] = False
+            changed = True
+
+        # dominated constraints: always satisfied within the bounds of the variables
+        min_act, max_act = activity_bounds(C, lower, upper)
+        for i in np.where(row_alive)[0]:
+            if signs[i] in ('<=', '=') and min_act[i] > b[i] + tol:
+                return infeasible()
+            if signs[i] in ('>=', '=') and max_act[i] < b[i] - tol:
+                return infeasible()
+            if (signs[i] == '<=' and max_act[i] <= b[i] + tol) or (signs[i] == '>=' and min_act[i] >= b[i] - tol):
+                row_alive[i] = False
+                changed = True
+
+        # bound tightening: bounds implied by the constraints, variables forced to one value are fixed
+        implied_lower, implied_upper = lower.copy(), upper.copy()
+        with np.errstate(divide = 'ignore', invalid = 'ignore'):
+            for i in np.where(row_alive)[0]:
+                cols = np.where((np.abs(C[i]) > tol) & col_alive)[0]
+                a = C[i, cols]
+                if signs[i] in ('<=', '=') and np.isfinite(min_act[i]):
+                    slack = b[i] - min_act[i]
+                    bound = np.where(a > 0, lower[cols], upper[cols]) + slack/a
+                    implied_upper[cols[a > 0]] = np.minimum(implied_upper[cols[a > 0]], bound[a > 0])
+                    implied_lower[cols[a < 0]] = np.maximum(implied_lower[cols[a < 0]], bound[a < 0])
+                if signs[i] in ('>=', '=') and np.isfinite(max_act[i]):
+                    slack = b[i] - max_act[i]
+                    bound = np.where(a > 0, upper[cols], lower[cols]) + slack/a
+                    implied_lower[cols[a > 0]] = np.maximum(implied_lower[cols[a > 0]], bound[a > 0])
+                    implied_upper[cols[a < 0]] = np.minimum(implied_upper[cols[a < 0]], bound[a < 0])
+
+        if np.any(col_alive & (implied_lower > implied_upper + tol)):
+            return infeasible()
+        forced = col_alive & (implied_upper - implied_lower <= tol) & (upper - lower > tol)
+        lower[forced] = upper[forced] = implied_lower[forced]
+        changed |= bool(forced.any())
+
+        if not changed:
+            break
+
+    # shift the kept variables onto a finite bound: lower + x' (x' >= 0), else upper + x' (x' <= 0)
+    kept = np.where(col_alive)[0]
+    rows = np.where(row_alive)[0]
+    shift = np.where(np.isfinite(lower[kept]), lower[kept], np.where(np.isfinite(upper[kept]), upper[kept], 0.0))
+    b -= C[:, kept] @ shift
+    offset += c[kept] @ shift
+
+    # reduced problem in original form, only boxed variables keep a bound row
+    variable_cons, bound_rows = split_bounds(lower[kept] - shift, upper[kept] - shift)
+    reduced = [list(C[i, kept]) + [b[i]] for i in rows]
+    reduced_signs = [signs[i] for i in rows]
+    for j, sign, value in bound_rows:
+        row = [0.0]*len(kept)
+        row[j] = 1.0
+        reduced.append(row + [value])
+        reduced_signs.append(sign)
+
+    problem = (len(kept), len(reduced), func_type, list(c[kept]), reduced, reduced_signs, variable_cons)
+    return problem, Postsolve(n_var, kept, fixed, offset, shift)
+
+
+def postsolve(record, z, solver):
+    '''
+        Function maps the solution of a reduced problem back onto the original problem.
+    Input:
+        record: Postsolve record returned by presolve
+        z: optimal value of the reduced problem
+        solver: solution of the reduced problem
+    Output:
+        z: optimal value of the original problem
+        solver: values of X1..Xn
+    '''
+    x = np.zeros(record.n_var)
+    x[record.kept] = record.shift + np.asarray(solver, dtype = float)
+    for j, value in record.fixed.items():
+        x[j] = value
+    return z + record.offset, list(x)
+
+
+def solve_with_presolve(n_var, n_constraint, func_type, func_coef, constraints, constraint_signs, variable_cons, method = 'auto', pricing = None):
+    '''
+        Function presolves, solves and postsolves a problem in original form.
+    Input:
+        same as transfer_to_standard_form
+        method, pricing: see solve_linear_programming_problem
+    Output:
+        A: optimal tableau of the reduced problem
+        z: optimal value
+        solver: optimal solution X1..Xn
+    '''
+    problem, record = presolve(n_var, n_constraint, func_type, func_coef, constraints, constraint_signs, variable_cons)
+    if problem is None:
+        return None, None, None
+
+    n_var, n_constraint = problem[0], problem[1]
+
+    # every variable was fixed: nothing left to solve
+    if n_var == 0:
+        z, solver = postsolve(record, 0.0, [])
+        return np.zeros((1, 1)), z, solver
+
+    # no constraint left: the standard form still needs one row
+    if n_constraint == 0:
+        problem = (n_var, 1, func_type, problem[3], [[0.0]*n_var + [0.0]], ['<='], problem[6])
+
+    A, free_var = transfer_to_standard_form(*problem)
+    B, z, solver = solve_linear_programming_problem(n_var, A, free_var, func_type, method, pricing)
+    if not isinstance(B, np.ndarray):
+        return None, None, None
+
+    z, solver = postsolve(record, z, restore_signs(solver, problem[6]))
+    return B, z, solver
@@ -0,0 +1,176 @@
+import numpy as np
+
+
+class PricingStrategy:
+    '''
+        Base class of pricing strategies choosing the entering column of a simplex iteration.
+    A solver calls start() once per solve, select() before every pivot and update() after
+    the ratio test of every pivot.
+    Attributes:
+        lowest_index_leaving: ratio test ties are broken by the smallest basic variable index
+        needs_pivot_row: update() needs the pivot row of the tableau
+        needs_products: update() needs the products of the entering column with every column
+    '''
+    lowest_index_leaving = False
+    needs_pivot_row = False
+    needs_products = False
+
+    def start(self, n_col, column_norms = None):
+        '''
+            Function resets the strategy for a new solve.
+        Input:
+            n_col: number of candidate columns
+            column_norms: squared norms of the constraint part of every column of the tableau
+        '''
+        pass
+
+    def select(self, price, n_col, tol):
+        '''
+            Function chooses the entering column.
+        Input:
+            price: function returning the reduced costs of a slice of columns
+            n_col: number of candidate columns
+            tol: reduced costs greater than -tol are considered nonnegative
+        Output:
+            entering: index of entering column (None if the tableau is optimal)
+        '''
+        raise NotImplementedError
+
+    def update(self, pivot_row, entering, entering_col = None, products = None):
+        '''
+            Function updates the strategy after a pivot has been chosen (before it is made).
+        Input:
+            pivot_row: pivot row of the tableau over the candidate columns
+            entering: index of entering column
+            entering_col: constraint part of the entering column of the tableau
+            products: entering_col dotted with the constraint part of every candidate column
+        '''
+        pass
+
+
+class DantzigPricing(PricingStrategy):
+    '''
+        Dantzig's rule: the most negative reduced cost enters.
+    '''
+    def select(self, price, n_col, tol):
+        reduced = price(slice(0, n_col))
+        entering = np.argmin(reduced)
+        if reduced[entering] >= -tol:
+            return None
+        return entering
+
+
+class BlandPricing(PricingStrategy):
+    '''
+        Bland's rule: the lowest index with negative reduced cost enters and ratio test ties leave
+    by lowest basic variable index, which prevents cycling on degenerate problems.
+    '''
+    lowest_index_leaving = True
+
+    def select(self, price, n_col, tol):
+        candidates = np.where(price(slice(0, n_col)) < -tol)[0]
+        if len(candidates) == 0:
+            return None
+        return candidates[0]
+
+
+class PartialPricing(PricingStrategy):
+    '''
+        Partial pricing: the columns are split into segments and only one segment is priced per
+    iteration, starting from the segment of the previous entering column.
+    '''
+    def __init__(self, segment_size = None, n_segments = 8):
+        self.segment_size = segment_size
+        self.n_segments = n_segments
+
+    def start(self, n_col, column_norms = None):
+        self.size = self.segment_size or max(1, -(-n_col//self.n_segments))
+        self.offset = 0
+
+    def select(self, price, n_col, tol):
+        if self.offset >= n_col:
+            self.offset = 0
+
+        for k in range(-(-n_col//self.size)):
+            low = self.offset
+            high = min(low + self.size, n_col)
+            reduced = price(slice(low, high))
+            entering = np.argmin(reduced)
+            if reduced[entering] < -tol:
+                return low + entering
+
+            self.offset = high if high < n_col else 0
+        return None
+
+
+class DevexPricing(PricingStrategy):
+    '''
+        Devex pricing: the reduced costs are scaled by reference weights approximating the norms
+    of the edge directions.
+    '''
+    needs_pivot_row = True
+
+    def start(self, n_col, column_norms = None):
+        self.weights = np.ones(n_col)
+
+    def select(self, price, n_col, tol):
+        reduced = price(slice(0, n_col))
+        candidates = np.where(reduced < -tol)[0]
+        if len(candidates) == 0:
+            return None
+        scores = reduced[candidates]**2/self.weights[candidates]
+        return candidates[np.argmax(scores)]
+
+    def update(self, pivot_row, entering, entering_col = None, products = None):
+        ratio = pivot_row/pivot_row[entering]
+        weight = self.weights[entering]
+        np.maximum(self.weights, ratio**2*weight, out = self.weights)
+        self.weights[entering] = 1.0
+
+
+class SteepestEdgePricing(DevexPricing):
+    '''
+        Steepest edge pricing: the reduced costs are scaled by the exact norms of the edge
+    directions, which are updated with the Goldfarb-Reid recurrence.
+    '''
+    needs_products = True
+
+    def start(self, n_col, column_norms = None):
+        if column_norms is None:
+            self.weights = np.ones(n_col)
+        else:
+            self.weights = 1.0 + np.array(column_norms[:n_col], dtype = float)
+
+    def update(self, pivot_row, entering, entering_col = None, products = None):
+        ratio = pivot_row/pivot_row[entering]
+        weight = 1.0 + entering_col @ entering_col
+        self.weights += ratio*(ratio*weight - 2.0*products)
+        np.maximum(self.weights, 1.0 + ratio**2, out = self.weights)
+        self.weights[entering] = 1.0
+
+
+PRICING_STRATEGIES = {
+    'dantzig': DantzigPricing,
+    'bland': BlandPricing,
+    'partial': PartialPricing,
+    'devex': DevexPricing,
+    'steepest_edge': SteepestEdgePricing,
+}
+
+
+def make_pricing(pricing = None):
+    '''
+        Function builds a pricing strategy.
+    Input:
+        pricing: None (Dantzig), name of a strategy ("dantzig", "bland", "partial", "devex",
+                 "steepest_edge") or a PricingStrategy instance
+    Output:
+        strategy: PricingStrategy instance
+    '''
+    if pricing is None:
+        return DantzigPricing()
+    if isinstance(pricing, PricingStrategy):
+        return pricing
+    if pricing not in PRICING_STRATEGIES:
+        raise ValueError(f"Unknown pricing strategy: {pricing}")
+    return PRICING_STRATEGIES[pricing]()
@@ -0,0 +1,459 @@
+import mmap
+import os
+import re
+
+import numpy as np
+
+try:
+    import scipy.sparse as sp
+except ImportError:
+    sp = None
+
+from linear_programming_functions import is_sparse, split_bounds, transfer_to_standard_form
+
+
+class StandardFormBuilder:
+    '''
+        Builder receiving the coefficients of a problem while a file is parsed.
+    Nonzero coefficients are written into growable COO arrays (row, column, value), rows and
+    variables are numbered in order of appearance.
+    '''
+    def __init__(self, capacity = 1024):
+        self.rows = np.empty(capacity, dtype = np.int64)
+        self.cols = np.empty(capacity, dtype = np.int64)
+        self.vals = np.empty(capacity)
+        self.nnz = 0
+
+        self.var_index = {}
+        self.var_names = []
+        self.objective = {}
+        self.lower = {}
+        self.upper = {}
+
+        self.row_index = {}
+        self.senses = []
+        self.rhs = {}
+        self.ranges = {}
+
+    def var(self, name):
+        '''
+            Function returns the index of a variable, adding it if it is new.
+        '''
+        index = self.var_index.get(name)
+        if index is None:
+            index = len(self.var_names)
+            self.var_index[name] = index
+            self.var_names.append(name)
+        return index
+
+    def add_row(self, name, sense = None):
+        '''
+            Function adds a constraint row with sense "<=", ">=" or "=" and returns its index.
+        '''
+        index = len(self.senses)
+        self.row_index[name] = index
+        self.senses.append(sense)
+        return index
+
+    def add(self, row, col, value):
+        '''
+            Function writes one coefficient of the constraint matrix.
+        '''
+        if self.nnz == len(self.vals):
+            capacity = 2*len(self.vals)
+            self.rows = np.resize(self.rows, capacity)
+            self.cols = np.resize(self.cols, capacity)
+            self.vals = np.resize(self.vals, capacity)
+        self.rows[self.nnz] = row
+        self.cols[self.nnz] = col
+        self.vals[self.nnz] = value
+        self.nnz += 1
+
+    def set_bound(self, col, lower = None, upper = None):
+        if lower is not None:
+            self.lower[col] = lower
+        if upper is not None:
+            self.upper[col] = upper
+
+    def build(self, func_type = 'Minimize', sparse = True, bounds_as_rows = True):
+        '''
+            Function builds the standard form of the parsed problem.
+        Ranged rows and bounds which are neither ">= 0", "<= 0" nor "Free" become extra constraint rows,
+        unless bounds_as_rows is False: then every column keeps its bounds for the bounded-variable simplex.
+        Input:
+            func_type: type of objective function ("Maximize", "Minimize")
+            sparse: return a scipy sparse CSC tableau instead of a dense array (dense without scipy)
+            bounds_as_rows: turn the bounds of variables into constraints of variables and extra rows
+        Output:
+            A: stardard form
+            free_var: list including indeces of free variables
+            n_var: number of original variables
+            variable_cons: constraints of variables ("<= 0", ">= 0", "Free"), restore_signs needs them to flip
+                           back the "<= 0" variables, whose columns transfer_to_standard_form negates
+            bounds: (lower, upper) bounds of the columns of A (only if bounds_as_rows is False)
+        '''
+        n_var = len(self.var_names)
+        rows = self.rows[:self.nnz]
+        cols = self.cols[:self.nnz]
+        vals = self.vals[:self.nnz]
+        senses = list(self.senses)
+        rhs = [self.rhs.get(i, 0.0) for i in range(len(senses))]
+
+        extra_rows, extra_cols, extra_vals = [rows], [cols], [vals]
+
+        # ranged rows: the original row keeps one side, a copy of it gets the other side
+        for i, r in self.ranges.items():
+            if senses[i] == '<=':
+                sense, bound = '>=', rhs[i] - abs(r)
+            elif senses[i] == '>=':
+                sense, bound = '<=', rhs[i] + abs(r)
+            elif r >= 0:
+                senses[i] = '>='
+                sense, bound = '<=', rhs[i] + r
+            else:
+                senses[i] = '<='
+                sense, bound = '>=', rhs[i] + r
+            mask = rows == i
+            extra_rows.append(np.full(mask.sum(), len(senses)))
+            extra_cols.append(cols[mask])
+            extra_vals.append(vals[mask])
+            senses.append(sense)
+            rhs.append(bound)
+
+        # variable bounds
+        lower = np.array([self.lower.get(j, 0.0) for j in range(n_var)], dtype = float)
+        upper = np.array([self.upper.get(j, np.inf) for j in range(n_var)], dtype = float)
+        if bounds_as_rows:
+            variable_cons, bound_rows = split_bounds(lower, upper)
+        else:
+            variable_cons, bound_rows = ['>= 0']*n_var, []
+        for j, sense, bound in bound_rows:
+            extra_rows.append(np.array([len(senses)]))
+            extra_cols.append(np.array([j]))
+            extra_vals.append(np.array([1.0]))
+            senses.append(sense)
+            rhs.append(bound)
+
+        n_constraint = len(senses)
+        rows = np.concatenate(extra_rows)
+        cols = np.concatenate(extra_cols)
+        vals = np.concatenate(extra_vals)
+        rhs = np.array(rhs, dtype = float)
+
+        # constraints laid out as transfer_to_standard_form expects: coefficients then right-hand side
+        nonzero_rhs = np.nonzero(rhs)[0]
+        if sp is not None:
+            constraints = sp.csr_matrix((np.concatenate((vals, rhs[nonzero_rhs])),
+                                         (np.concatenate((rows, nonzero_rhs)), np.concatenate((cols, np.full(len(nonzero_rhs), n_var))))),
+                                        shape = (n_constraint, n_var + 1))
+        else:
+            # without scipy the COO entries are summed into a dense array
+            constraints = np.zeros((n_constraint, n_var + 1))
+            np.add.at(constraints, (rows, cols), vals)
+            constraints[:, n_var] = rhs
+
+        func_coef = np.zeros(n_var)
+        for j, value in self.objective.items():
+            func_coef[j] += value
+
+        A, free_var = transfer_to_standard_form(n_var, n_constraint, func_type, func_coef, constraints, senses, variable_cons)
+        if not sparse and is_sparse(A):
+            A = A.toarray()
+        if bounds_as_rows:
+            return A, free_var, n_var, variable_cons
+
+        # the slack columns are >= 0
+        bounds = (np.concatenate((lower, np.zeros(n_constraint))), np.concatenate((upper, np.full(n_constraint, np.inf))))
+        return A, free_var, n_var, variable_cons, bounds
+
+
+def read_lines(path):
+    '''
+        Function yields the lines of a file through a memory map.
+    '''
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ) as mm:
+            for line in iter(mm.readline, b''):
+                yield line
+
+
+MPS_SENSES = {b'L': '<=', b'G': '>=', b'E': '='}
+
+
+def read_mps(path, sparse = True, bounds_as_rows = True):
+    '''
+        Function reads a free-MPS file in a single streaming pass.
+    Sections NAME, OBJSENSE, ROWS, COLUMNS, RHS, RANGES, BOUNDS and ENDATA are supported,
+    integrality markers are ignored.
+    Input:
+        path: path of MPS file
+        sparse: return a scipy sparse CSC tableau instead of a dense array (dense without scipy)
+        bounds_as_rows: see StandardFormBuilder.build
+    Output:
+        A: stardard form (see transfer_to_standard_form)
+        free_var: list including indeces of free variables
+        n_var: number of original variables
+        variable_cons: constraints of variables ("<= 0", ">= 0", "Free"), see StandardFormBuilder.build
+        func_type: type of objective function
+        var_names: names of the original variables X1..Xn
+        bounds: (lower, upper) bounds of the columns of A (only if bounds_as_rows is False)
+    '''
+    builder = StandardFormBuilder()
+    func_type = 'Minimize'
+    objective = None
+    ignored = set()
+    section = None
+
+    for line in read_lines(path):
+        fields = line.split()
+        if not fields or line.startswith(b'*'):
+            continue
+
+        # section header
+        if line[0] not in b' \t':
+            section = fields[0].upper()
+            if section == b'OBJSENSE' and len(fields) > 1:
+                func_type = 'Maximize' if fields[1].upper().startswith(b'MAX') else 'Minimize'
+            elif section == b'ENDATA':
+                break
+            continue
+
+        if section == b'OBJSENSE':
+            func_type = 'Maximize' if fields[0].upper().startswith(b'MAX') else 'Minimize'
+
+        elif section == b'ROWS':
+            sense, name = fields[0].upper(), fields[1]
+            if sense == b'N':
+                if objective is None:
+                    objective = name
+                else:
+                    ignored.add(name)
+            else:
+                builder.add_row(name, MPS_SENSES[sense])
+
+        elif section == b'COLUMNS':
+            if b"'MARKER'" in fields:
+                continue
+            col = builder.var(fields[0])
+            for k in range(1, len(fields) - 1, 2):
+                row, value = fields[k], float(fields[k + 1])
+                if row == objective:
+                    builder.objective[col] = value
+                elif row not in ignored:
+                    builder.add(builder.row_index[row], col, value)
+
+        elif section in (b'RHS', b'RANGES'):
+            # the name of the vector is optional in free MPS
+            start = len(fields) % 2
+            target = builder.rhs if section == b'RHS' else builder.ranges
+            for k in range(start, len(fields) - 1, 2):
+                row, value = fields[k], float(fields[k + 1])
+                if row in builder.row_index:
+                    target[builder.row_index[row]] = value
+
+        elif section == b'BOUNDS':
+            kind = fields[0].upper()
+            if kind in (b'FR', b'MI', b'PL', b'BV'):
+                col = builder.var(fields[-1])
+                value = None
+            else:
+                col = builder.var(fields[-2])
+                value = float(fields[-1])
+
+            if kind == b'FR':
+                builder.set_bound(col, -np.inf, np.inf)
+            elif kind == b'MI':
+                builder.set_bound(col, lower = -np.inf)
+            elif kind == b'PL':
+                builder.set_bound(col, upper = np.inf)
+            elif kind == b'BV':
+                builder.set_bound(col, 0.0, 1.0)
+            elif kind in (b'LO', b'LI'):
+                builder.set_bound(col, lower = value)
+            elif kind in (b'UP', b'UI'):
+                if value < 0 and builder.lower.get(col, 0.0) == 0.0:
+                    builder.set_bound(col, lower = -np.inf)
+                builder.set_bound(col, upper = value)
+            elif kind == b'FX':
+                builder.set_bound(col, value, value)
+            else:
+                raise ValueError(f"Unknown bound type: {kind.decode()}")
+
+    built = builder.build(func_type, sparse, bounds_as_rows)
+    return built[:4] + (func_type, [name.decode() for name in builder.var_names]) + built[4:]
+
+
+LP_TOKEN = re.compile(rb'''
+    (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+  | (?P<sense><=|>=|=<|=>|<|>|=)
+  | (?P<sign>[+-])
+  | (?P<colon>:)
+  | (?P<name>[A-Za-z_!"\#$%&()/,.;?@'`{}|~][\w!"\#$%&()/,.;?@'`{}|~\[\]\^]*)
+''', re.VERBOSE)
+
+LP_SENSES = {b'<=': '<=', b'=<': '<=', b'<': '<=', b'>=': '>=', b'=>': '>=', b'>': '>=', b'=': '='}
+
+LP_SECTIONS = {
+    b'maximize': 'objective', b'maximum': 'objective', b'max': 'objective',
+    b'minimize': 'objective', b'minimum': 'objective', b'min': 'objective',
+    b'subject': 'constraints', b'such': 'constraints', b'st': 'constraints', b's.t.': 'constraints', b'st.': 'constraints',
+    b'bounds': 'bounds', b'bound': 'bounds',
+    b'general': 'integers', b'generals': 'integers', b'gen': 'integers', b'integer': 'integers', b'integers': 'integers',
+    b'binary': 'binaries', b'binaries': 'binaries', b'bin': 'binaries',
+    b'end': 'end',
+}
+
+
+def tokenize_lp_line(line):
+    '''
+        Function splits a line of an LP file into (kind, value) tokens, comments are dropped.
+    '''
+    line = line.split(b'\\', 1)[0]
+    return [(m.lastgroup, m.group(m.lastgroup)) for m in LP_TOKEN.finditer(line)]
+
+
+def read_lp_bound(builder, tokens):
+    '''
+        Function reads one line of the Bounds section of an LP file.
+    '''
+    items = []
+    sign = 1.0
+    for kind, value in tokens:
+        if kind == 'sign':
+            sign = -1.0 if value == b'-' else 1.0
+        elif kind == 'number':
+            items.append(('number', sign*float(value)))
+            sign = 1.0
+        elif kind == 'name' and value.lower() in (b'inf', b'infinity'):
+            items.append(('number', sign*np.inf))
+            sign = 1.0
+        elif kind == 'name' and value.lower() == b'free':
+            items.append(('free', None))
+        else:
+            items.append((kind, value))
+
+    def apply(col, sense, value):
+        if sense == '<=':
+            builder.set_bound(col, upper = value)
+        elif sense == '>=':
+            builder.set_bound(col, lower = value)
+        else:
+            builder.set_bound(col, value, value)
+
+    flipped = {'<=': '>=', '>=': '<=', '=': '='}
+    kinds = [kind for kind, value in items]
+    if kinds == ['name', 'free']:
+        builder.set_bound(builder.var(items[0][1]), -np.inf, np.inf)
+    elif kinds == ['name', 'sense', 'number']:
+        apply(builder.var(items[0][1]), LP_SENSES[items[1][1]], items[2][1])
+    elif kinds == ['number', 'sense', 'name']:
+        apply(builder.var(items[2][1]), flipped[LP_SENSES[items[1][1]]], items[0][1])
+    elif kinds == ['number', 'sense', 'name', 'sense', 'number']:
+        col = builder.var(items[2][1])
+        apply(col, flipped[LP_SENSES[items[1][1]]], items[0][1])
+        apply(col, LP_SENSES[items[3][1]], items[4][1])
+    elif kinds:
+        raise ValueError(f"Cannot read bound: {b' '.join(str(v).encode() if k == 'number' else v for k, v in items).decode()}")
+
+
+def read_lp(path, sparse = True, bounds_as_rows = True):
+    '''
+        Function reads a CPLEX-LP file in a single streaming pass.
+    Sections objective, Subject To, Bounds, General, Binary and End are supported,
+    integrality is ignored (binary variables keep their bounds 0 <= x <= 1).
+    Input:
+        path: path of LP file
+        sparse: return a scipy sparse CSC tableau instead of a dense array (dense without scipy)
+        bounds_as_rows: see StandardFormBuilder.build
+    Output:
+        A: stardard form (see transfer_to_standard_form)
+        free_var: list including indeces of free variables
+        n_var: number of original variables
+        variable_cons: constraints of variables ("<= 0", ">= 0", "Free"), see StandardFormBuilder.build
+        func_type: type of objective function
+        var_names: names of the original variables X1..Xn
+        bounds: (lower, upper) bounds of the columns of A (only if bounds_as_rows is False)
+    '''
+    builder = StandardFormBuilder()
+    func_type = 'Minimize'
+    section = None
+
+    # state of the expression being read
+    row = None
+    sign = 1.0
+    coef = None
+    expect_rhs = False
+
+    for line in read_lines(path):
+        tokens = tokenize_lp_line(line)
+        if not tokens:
+            continue
+
+        # section keywords start a line
+        first = tokens[0][1].lower() if tokens[0][0] == 'name' else None
+        if first in LP_SECTIONS and not (len(tokens) > 1 and tokens[1][0] == 'colon'):
+            section = LP_SECTIONS[first]
+            if first.startswith(b'max'):
+                func_type = 'Maximize'
+            skip = 1
+            if first in (b'subject', b'such') and len(tokens) > 1:
+                skip = 2
+            tokens = tokens[skip:]
+            row, sign, coef, expect_rhs = None, 1.0, None, False
+            if section == 'end':
+                break
+
+        if section == 'bounds':
+            read_lp_bound(builder, tokens)
+            continue
+
+        if section in ('integers', 'binaries'):
+            if section == 'binaries':
+                for kind, value in tokens:
+                    builder.set_bound(builder.var(value), 0.0, 1.0)
+            continue
+
+        for k, (kind, value) in enumerate(tokens):
+            # label of the objective or of a constraint
+            if kind == 'name' and k + 1 < len(tokens) and tokens[k + 1][0] == 'colon':
+                if section == 'constraints':
+                    row = builder.add_row(value)
+                continue
+            if kind == 'colon':
+                continue
+
+            if kind == 'sign':
+                sign = -sign if value == b'-' else sign
+            elif kind == 'number':
+                if expect_rhs:
+                    builder.rhs[row] = sign*float(value)
+                    row, sign, coef, expect_rhs = None, 1.0, None, False
+                else:
+                    coef = float(value) if coef is None else coef*float(value)
+            elif kind == 'sense':
+                builder.senses[row] = LP_SENSES[value]
+                sign, coef, expect_rhs = 1.0, None, True
+            elif kind == 'name':
+                col = builder.var(value)
+                value = sign*(1.0 if coef is None else coef)
+                if section == 'objective':
+                    builder.objective[col] = builder.objective.get(col, 0.0) + value
+                else:
+                    if row is None:
+                        row = builder.add_row(b'R%d' % len(builder.senses))
+                    builder.add(row, col, value)
+                sign, coef = 1.0, None
+
+    built = builder.build(func_type, sparse, bounds_as_rows)
+    return built[:4] + (func_type, [name.decode() for name in builder.var_names]) + built[4:]
+
+
+def read_problem(path, sparse = True, bounds_as_rows = True):
+    '''
+        Function reads an MPS (.mps) or LP (.lp) file, see read_mps and read_lp.
+    '''
+    if path.lower().endswith('.lp'):
+        return read_lp(path, sparse, bounds_as_rows)
+    return read_mps(path, sparse, bounds_as_rows)
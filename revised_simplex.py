@@ -0,0 +1,581 @@
+import warnings
+from time import perf_counter
+
+import numpy as np
+
+try:
+    import scipy.sparse as sp
+    from scipy.linalg import lu_factor, lu_solve
+    from scipy.sparse.linalg import splu
+except ImportError:
+    sp = None
+    lu_factor = None
+    lu_solve = None
+    splu = None
+
+from linear_programming_functions import is_sparse, find_unit_basis, recover_solution, get_optimal_value
+from pricing import make_pricing
+
+
+def column(M, j):
+    '''
+        Function returns column j of a dense or sparse matrix as a dense vector.
+    '''
+    if is_sparse(M):
+        return M[:, [j]].toarray().ravel()
+    return M[:, j]
+
+
+def to_dense(M):
+    '''
+        Function returns a dense copy of a dense or sparse matrix.
+    '''
+    if is_sparse(M):
+        return M.toarray()
+    return np.array(M, dtype = float)
+
+
+def factorize(M):
+    '''
+        Function computes the LU factorization of a square matrix with partial pivoting.
+    Sparse matrices are factorized with SuperLU.
+    Input:
+        M: square matrix
+    Output:
+        LU: combined L and U factors
+        piv: row interchanges (row k was swapped with row piv[k])
+    '''
+    if is_sparse(M):
+        return splu(sp.csc_matrix(M))
+
+    if lu_factor is not None:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            lu_piv = lu_factor(M, check_finite = False)
+        if np.any(np.diag(lu_piv[0]) == 0):
+            raise np.linalg.LinAlgError("Basis matrix is singular.")
+        return lu_piv
+
+    LU = np.array(M, dtype = float)
+    m = LU.shape[0]
+    piv = np.arange(m)
+
+    for k in range(m):
+        # choose the largest element of the column as pivot
+        p = k + np.argmax(np.abs(LU[k:, k]))
+        if LU[p, k] == 0:
+            raise np.linalg.LinAlgError("Basis matrix is singular.")
+        if p != k:
+            LU[[k, p], :] = LU[[p, k], :]
+        piv[k] = p
+
+        # eliminate below the pivot with one rank-1 update
+        LU[k + 1:, k] /= LU[k, k]
+        LU[k + 1:, k + 1:] -= np.outer(LU[k + 1:, k], LU[k, k + 1:])
+
+    return LU, piv
+
+
+def solve_factorized(lu_piv, b, trans = 0):
+    '''
+        Function solves M x = b (trans = 0) or M^T x = b (trans = 1) from an LU factorization.
+    Input:
+        lu_piv: factorization returned by factorize
+        b: right-hand side (vector or matrix)
+        trans: solve with the transposed matrix
+    Output:
+        x: solution
+    '''
+    if splu is not None and not isinstance(lu_piv, tuple):
+        return lu_piv.solve(np.asarray(b, dtype = float), trans = 'T' if trans else 'N')
+
+    if lu_solve is not None:
+        return lu_solve(lu_piv, b, trans = trans, check_finite = False)
+
+    LU, piv = lu_piv
+    m = LU.shape[0]
+    x = np.array(b, dtype = float)
+
+    if trans == 0:
+        for k in range(m):
+            if piv[k] != k:
+                x[[k, piv[k]]] = x[[piv[k], k]]
+        for i in range(1, m):
+            x[i] -= LU[i, :i] @ x[:i]
+        for i in range(m - 1, -1, -1):
+            x[i] = (x[i] - LU[i, i + 1:] @ x[i + 1:])/LU[i, i]
+    else:
+        for i in range(m):
+            x[i] = (x[i] - LU[:i, i] @ x[:i])/LU[i, i]
+        for i in range(m - 2, -1, -1):
+            x[i] -= LU[i + 1:, i] @ x[i + 1:]
+        for k in range(m - 1, -1, -1):
+            if piv[k] != k:
+                x[[k, piv[k]]] = x[[piv[k], k]]
+
+    return x
+
+
+class BasisFactorization:
+    '''
+        LU factorization of the basis matrix kept up to date with product-form (eta) updates.
+    The basis is refactorized from scratch every `refactor_frequency` updates.
+    '''
+    def __init__(self, M, basis, refactor_frequency = 50):
+        self.M = M
+        self.refactor_frequency = refactor_frequency
+        self.refactor(basis)
+
+    def refactor(self, basis = None):
+        if basis is not None:
+            self.basis = np.array(basis)
+        self.lu = factorize(self.M[:, self.basis])
+        self.etas = []
+
+    def ftran(self, a):
+        '''
+            Function computes B^-1 a.
+        '''
+        x = solve_factorized(self.lu, a)
+        for r, eta in self.etas:
+            x_r = x[r].copy() if x.ndim > 1 else x[r]
+            x[r] = 0.0
+            x += np.multiply.outer(eta, x_r)
+        return x
+
+    def btran(self, c):
+        '''
+            Function computes c^T B^-1.
+        '''
+        w = np.array(c, dtype = float)
+        for r, eta in reversed(self.etas):
+            w[r] = w @ eta
+        return solve_factorized(self.lu, w, trans = 1)
+
+    def update(self, pivot_row, d, entering):
+        '''
+            Function replaces the basic variable of pivot_row by the entering column.
+        Input:
+            pivot_row: position of the leaving variable in the basis
+            d: B^-1 a of the entering column
+            entering: index of the entering column
+        '''
+        eta = -d/d[pivot_row]
+        eta[pivot_row] = 1.0/d[pivot_row]
+        self.etas.append((pivot_row, eta))
+        self.basis[pivot_row] = entering
+
+        if len(self.etas) >= self.refactor_frequency:
+            self.refactor()
+
+
+def revised_simplex_iterations(M, b, c, factor, n_candidates, tol = 1e-9, max_iter = None, pricing = None, observer = None):
+    '''
+        Function runs primal revised simplex iterations from a feasible basis.
+    Input:
+        M: constraint matrix
+        b: right-hand side
+        c: cost vector
+        factor: BasisFactorization of a feasible basis
+        n_candidates: only columns with index < n_candidates may enter the basis
+        tol: optimality and pivot tolerance
+        max_iter: maximal number of pivots
+        pricing: started PricingStrategy choosing the entering column
+        observer: instrumentation.SolveObserver told about every pivot (None: no instrumentation)
+    Output:
+        status: "optimal", "unbounded" or "iteration_limit"
+        x_B: values of the basic variables
+    '''
+    pricing = make_pricing(pricing)
+    x_B = factor.ftran(b)
+    is_basic = np.zeros(M.shape[1], dtype = bool)
+    is_basic[factor.basis] = True
+    iteration = 0
+
+    while max_iter is None or iteration < max_iter:
+        if observer is not None:
+            start = perf_counter()
+
+        # pricing: reduced costs of the candidate columns
+        y = factor.btran(c[factor.basis])
+
+        def price(cols):
+            reduced = c[cols] - M[:, cols].T @ y
+            reduced[is_basic[cols]] = 0.0
+            return reduced
+
+        entering = pricing.select(price, n_candidates, tol)
+        if entering is None:
+            return "optimal", x_B
+
+        if observer is not None:
+            priced = perf_counter()
+
+        # ratio test on the updated entering column
+        d = factor.ftran(column(M, entering))
+        candidates = np.where(d > tol)[0]
+        if len(candidates) == 0:
+            return "unbounded", x_B
+
+        ratios = x_B[candidates]/d[candidates]
+        pivot_row = candidates[np.argmin(ratios)]
+        if pricing.lowest_index_leaving:
+            ties = candidates[ratios <= ratios.min() + tol]
+            pivot_row = ties[np.argmin(factor.basis[ties])]
+        theta = x_B[pivot_row]/d[pivot_row]
+
+        if pricing.needs_pivot_row:
+            e_r = np.zeros(len(b))
+            e_r[pivot_row] = 1.0
+            alpha_row = M.T @ factor.btran(e_r)
+            products = M.T @ factor.btran(d) if pricing.needs_products else None
+            pricing.update(alpha_row, entering, d, products)
+
+        if observer is not None:
+            tested = perf_counter()
+            leaving = factor.basis[pivot_row]
+
+        # update basic values and basis factorization
+        x_B = x_B - theta*d
+        x_B[pivot_row] = theta
+        is_basic[factor.basis[pivot_row]] = False
+        is_basic[entering] = True
+        n_etas = len(factor.etas)
+        factor.update(pivot_row, d, entering)
+        if len(factor.etas) < n_etas:
+            x_B = factor.ftran(b)
+
+        if observer is not None:
+            observer.pivot(entering, leaving, pivot_row, c[factor.basis] @ x_B, priced - start, tested - priced, perf_counter() - tested)
+
+        iteration += 1
+
+    return "iteration_limit", x_B
+
+
+def drive_out_artificials(M, factor, n_real, tol = 1e-9):
+    '''
+        Function pivots basic artificial variables (at zero level) out of the basis.
+    Input:
+        M: constraint matrix including the artificial columns
+        factor: BasisFactorization of the phase 1 optimal basis
+        n_real: number of non-artificial columns
+    '''
+    for r in np.where(factor.basis >= n_real)[0]:
+        # row r of B^-1 M over the nonbasic real columns
+        e_r = np.zeros(M.shape[0])
+        e_r[r] = 1.0
+        row = (M.T @ factor.btran(e_r))[:n_real]
+        row[factor.basis[factor.basis < n_real]] = 0.0
+
+        candidates = np.where(np.abs(row) > tol)[0]
+        # redundant constraint: the artificial stays basic at zero
+        if len(candidates) == 0:
+            continue
+
+        entering = candidates[np.argmax(np.abs(row[candidates]))]
+        factor.update(r, factor.ftran(column(M, entering)), entering)
+
+
+class Basis:
+    '''
+        Optimal basis returned by a solve, which can warm start the next solve of the same model
+    after its costs or right-hand side have changed.
+    '''
+    def __init__(self, indices, shape):
+        self.indices = np.array(indices)
+        self.shape = shape
+
+    @classmethod
+    def from_tableau(cls, B):
+        '''
+            Function reads the basis of an optimal tableau (basic columns are unit columns with zero reduced cost).
+        '''
+        return cls(find_unit_basis(B[:, :-1])[1:], (B.shape[0] - 1, B.shape[1] - 1))
+
+    def fits(self, shape):
+        '''
+            Function checks whether the basis can be used for a constraint matrix of the given shape.
+        '''
+        m, n = shape
+        return (tuple(self.shape) == (m, n) and len(self.indices) == m and np.all(self.indices >= 0)
+                and np.all(self.indices < n) and len(np.unique(self.indices)) == m)
+
+
+def revised_dual_simplex_iterations(M, b, c, factor, n_candidates, tol = 1e-9, max_iter = None, observer = None):
+    '''
+        Function runs dual revised simplex iterations from a dual feasible basis.
+    Input:
+        M: constraint matrix
+        b: right-hand side
+        c: cost vector
+        factor: BasisFactorization of a dual feasible basis
+        n_candidates: only columns with index < n_candidates may enter the basis
+        tol: feasibility and pivot tolerance
+        max_iter: maximal number of pivots
+        observer: instrumentation.SolveObserver told about every pivot (None: no instrumentation)
+    Output:
+        status: "optimal", "infeasible" or "iteration_limit"
+        x_B: values of the basic variables
+    '''
+    m = len(b)
+    x_B = factor.ftran(b)
+    is_basic = np.zeros(M.shape[1], dtype = bool)
+    is_basic[factor.basis] = True
+    iteration = 0
+
+    while max_iter is None or iteration < max_iter:
+        if observer is not None:
+            start = perf_counter()
+
+        # leaving variable: the most negative basic variable
+        pivot_row = np.argmin(x_B)
+        if x_B[pivot_row] >= -tol:
+            return "optimal", x_B
+
+        if observer is not None:
+            priced = perf_counter()
+
+        # pivot row of the tableau and reduced costs
+        e_r = np.zeros(m)
+        e_r[pivot_row] = 1.0
+        alpha_row = (M.T @ factor.btran(e_r))[:n_candidates]
+        reduced = c[:n_candidates] - (M.T @ factor.btran(c[factor.basis]))[:n_candidates]
+
+        # dual ratio test, no negative entry => primal problem is infeasible
+        candidates = np.where((alpha_row < -tol) & ~is_basic[:n_candidates])[0]
+        if len(candidates) == 0:
+            return "infeasible", x_B
+        ratios = np.maximum(reduced[candidates], 0.0)/-alpha_row[candidates]
+        entering = candidates[np.argmin(ratios)]
+
+        if observer is not None:
+            tested = perf_counter()
+            leaving = factor.basis[pivot_row]
+
+        # update basic values and basis factorization
+        d = factor.ftran(column(M, entering))
+        theta = x_B[pivot_row]/d[pivot_row]
+        x_B = x_B - theta*d
+        x_B[pivot_row] = theta
+        is_basic[factor.basis[pivot_row]] = False
+        is_basic[entering] = True
+        n_etas = len(factor.etas)
+        factor.update(pivot_row, d, entering)
+        if len(factor.etas) < n_etas:
+            x_B = factor.ftran(b)
+
+        if observer is not None:
+            observer.pivot(entering, leaving, pivot_row, c[factor.basis] @ x_B, priced - start, tested - priced, perf_counter() - tested)
+
+        iteration += 1
+
+    return "iteration_limit", x_B
+
+
+def read_tableau(A):
+    '''
+        Function splits a dense or sparse tableau into costs, constraint matrix and right-hand side.
+    Output:
+        c: cost vector
+        M: constraint matrix (a copy, scipy sparse CSC if A is sparse)
+        b: right-hand side
+    '''
+    if is_sparse(A):
+        A = sp.csc_matrix(A, dtype = float)
+        return A[0, :-1].toarray().ravel(), A[1:, :-1], A[1:, -1].toarray().ravel()
+    return np.array(A[0, :-1], dtype = float), np.array(A[1:, :-1], dtype = float), np.array(A[1:, -1], dtype = float)
+
+
+def warm_start(M, b, c, basis, refactor_frequency = 50, tol = 1e-9, max_iter = None, pricing = None, observer = None):
+    '''
+        Function resumes the simplex method from the basis of a previous solve.
+    Primal simplex is used if the basis is still primal feasible (costs changed), dual simplex
+    if it is still dual feasible (right-hand side changed).
+    Input:
+        M, b, c: constraint matrix, right-hand side and cost vector
+        basis: Basis of a previous solve
+        observer: instrumentation.SolveObserver (None: no instrumentation)
+    Output:
+        factor: BasisFactorization of the final basis (None if the basis cannot be used)
+        status: status of the iterations
+    '''
+    m, n = M.shape
+    if not basis.fits((m, n)):
+        return None, None
+    try:
+        factor = BasisFactorization(M, basis.indices, refactor_frequency)
+    except (np.linalg.LinAlgError, RuntimeError):
+        return None, None
+
+    if np.all(factor.ftran(b) >= -tol):
+        pricing = make_pricing(pricing)
+        pricing.start(n)
+        if observer is not None:
+            observer.start_phase('warm_primal')
+        status, x_B = revised_simplex_iterations(M, b, c, factor, n, tol, max_iter, pricing, observer)
+        if observer is not None:
+            observer.end_phase(status)
+        return factor, status
+
+    reduced = c - M.T @ factor.btran(c[factor.basis])
+    reduced[factor.basis] = 0.0
+    if np.all(reduced >= -tol):
+        if observer is not None:
+            observer.start_phase('warm_dual')
+        status, x_B = revised_dual_simplex_iterations(M, b, c, factor, n, tol, max_iter, observer)
+        if observer is not None:
+            observer.end_phase(status)
+        return factor, status
+
+    return None, None
+
+
+def cold_start(M, b, c, refactor_frequency = 50, tol = 1e-9, max_iter = None, pricing = None, observer = None):
+    '''
+        Function runs phase 1 (if needed) and phase 2 of the revised simplex method from a unit basis.
+    Input:
+        M, b, c: constraint matrix, right-hand side and cost vector
+        observer: instrumentation.SolveObserver (None: no instrumentation)
+    Output:
+        M: constraint matrix with rows of negative right-hand side flipped and artificial columns appended
+        b: right-hand side with rows flipped
+        factor: BasisFactorization of the final basis
+        status: status of the iterations, "infeasible" if phase 1 fails
+    '''
+    m, n = M.shape
+
+    # make right-hand side nonnegative
+    negative = b < 0
+    if is_sparse(M):
+        M = sp.csc_matrix(sp.diags(np.where(negative, -1.0, 1.0)) @ M)
+    else:
+        M[negative] *= -1
+    b[negative] *= -1
+
+    # complete the unit columns of the starting basis with artificial variables
+    basis = find_unit_basis(M)
+    missing = np.where(basis < 0)[0]
+    n_art = len(missing)
+    if n_art != 0:
+        artificial = np.zeros((m, n_art))
+        artificial[missing, np.arange(n_art)] = 1.0
+        if is_sparse(M):
+            M = sp.hstack((M, sp.csc_matrix(artificial)), format = 'csc')
+        else:
+            M = np.hstack((M, artificial))
+        basis[missing] = n + np.arange(n_art)
+
+    factor = BasisFactorization(M, basis, refactor_frequency)
+
+    # the starting basis is the identity, so the edge norms are the column norms of M
+    pricing = make_pricing(pricing)
+    norms = None
+    if pricing.needs_products:
+        norms = np.asarray(M.multiply(M).sum(axis = 0)).ravel() if is_sparse(M) else np.einsum('ij,ij->j', M, M)
+    pricing.start(n + n_art, norms)
+
+    # phase 1: minimize the sum of the artificial variables
+    if n_art != 0:
+        c_1 = np.zeros(n + n_art)
+        c_1[n:] = 1.0
+        if observer is not None:
+            observer.start_phase('phase_1', n_artificial = n_art)
+        status, x_B = revised_simplex_iterations(M, b, c_1, factor, n + n_art, tol, max_iter, pricing, observer)
+        if status == "optimal" and c_1[factor.basis] @ x_B > tol*max(1.0, np.abs(b).max()):
+            status = "infeasible"
+        if observer is not None:
+            observer.end_phase(status)
+        if status != "optimal":
+            return M, b, factor, status
+        drive_out_artificials(M, factor, n, tol)
+
+    # phase 2: original objective, artificial columns never enter
+    c_2 = np.concatenate((c, np.zeros(n_art)))
+    if observer is not None:
+        observer.start_phase('phase_2')
+    status, x_B = revised_simplex_iterations(M, b, c_2, factor, n, tol, max_iter, pricing, observer)
+    if observer is not None:
+        observer.end_phase(status)
+    return M, b, factor, status
+
+
+def basis_tableau(M, b, c, factor, full = True):
+    '''
+        Function builds the tableau of a basis once, from a fresh factorization.
+    Input:
+        M, b, c: constraint matrix, right-hand side and cost vector (M may have artificial columns
+                 appended after the n = len(c) real columns)
+        factor: BasisFactorization of the basis
+        full: also build the constraint rows B^-1 M, which are dense even if M is sparse
+    Output:
+        B: tableau of the basis over the real columns (only its objective row if full is False)
+        solver: values of the real variables at the basis
+    '''
+    m, n = M.shape[0], len(c)
+    c_B = np.where(factor.basis < n, c[np.minimum(factor.basis, n - 1)], 0.0)
+    factor.refactor()
+    x_B = factor.ftran(b)
+    y = factor.btran(c_B)
+
+    B = np.empty((m + 1 if full else 1, n + 1))
+    B[0, :-1] = c - (M.T @ y)[:n]
+    B[0, -1] = -(c_B @ x_B)
+    if full:
+        B[1:, :-1] = factor.ftran(to_dense(M[:, :n]))
+        B[1:, -1] = x_B
+
+    # get solution
+    solver = np.zeros(n)
+    real = factor.basis < n
+    solver[factor.basis[real]] = x_B[real]
+    return B, solver
+
+
+def revised_simplex_algorithm(n_var, A, free_var = [], func_type = 'Minimize', refactor_frequency = 50, tol = 1e-9, max_iter = None, pricing = None,
+                              basis = None, return_basis = False, observer = None, tableau = None):
+    '''
+        Function using revised simplex algorithm finds optimal solution for linear programming problems.
+    Only the basis is stored, as an LU factorization with product-form updates, so each pivot
+    costs O(m^2) plus one pricing pass instead of rewriting the full tableau.
+    A sparse tableau keeps its constraint matrix sparse and its basis is factorized with SuperLU.
+    Input:
+        n_var: number of original variables.
+        A: original tableau (dense or scipy sparse).
+        free_var: python list include indeces of free variables.
+        func_type: type of objective function
+        refactor_frequency: number of basis updates between two refactorizations
+        tol: optimality and pivot tolerance
+        max_iter: maximal number of pivots of each phase
+        pricing: pricing strategy choosing the entering column (see pricing.make_pricing)
+        basis: Basis of a previous solve of the same model to warm start from
+        return_basis: also return the optimal Basis
+        observer: instrumentation.SolveObserver told about every pivot and phase (None: no instrumentation)
+        tableau: build the constraint rows of the optimal tableau (default: only if A is dense, since they
+                 are dense and would take O(m*n) memory for a sparse A; the optimal value, the solution
+                 and the basis need only the objective row)
+    Output:
+        A: optimal tableau (only its objective row if the constraint rows are not built)
+        z: optimal value
+        solver: optimal solution
+        basis: optimal Basis (only if return_basis)
+    '''
+    if tableau is None:
+        tableau = not is_sparse(A)
+    c, M, b = read_tableau(A)
+    m, n = M.shape
+
+    factor = None
+    if basis is not None:
+        factor, status = warm_start(M, b, c, basis, refactor_frequency, tol, max_iter, pricing, observer)
+    if factor is None:
+        M, b, factor, status = cold_start(M, b, c, refactor_frequency, tol, max_iter, pricing, observer)
+
+    if status != "optimal":
+        return (None, None, None, None) if return_basis else (None, None, None)
+
+    B, solver = basis_tableau(M, b, c, factor, tableau)
+    result = B, get_optimal_value(B, func_type), recover_solution(solver, n_var, free_var)
+    if return_basis:
+        return result + (Basis(factor.basis.copy(), (m, n)),)
+    return result
@@ -0,0 +1,98 @@
+import numpy as np
+
+from bounded_simplex import transfer_to_bounded_form, bounded_simplex_algorithm
+
+
+def sensitivity_analysis(n_var, B, lower, upper, state, func_type = 'Minimize', tol = 1e-9):
+    '''
+        Function computes the sensitivity report of an optimal tableau of the bounded-variable simplex.
+    Every constraint has its own slack column in transfer_to_bounded_form, so the slack columns of the
+    optimal tableau hold the inverse of the basis: the shadow prices are their reduced costs and the
+    ranges follow from ratio tests on them, with no re-solve.
+    Input:
+        n_var: number of original variables
+        B: optimal tableau returned by bounded_simplex_algorithm
+        lower, upper: bounds of all columns of B
+        state: state returned with B by bounded_simplex_algorithm (return_state = True)
+        func_type: type of objective function
+        tol: zero tolerance of the tableau entries
+    Output:
+        report: python dict of numpy arrays, in the sense of func_type
+            "shadow_prices": change of the optimal value per unit increase of each right-hand side
+            "reduced_costs": reduced costs of the original variables
+            "rhs_ranges": allowable decrease and increase of each right-hand side (n_constraint x 2)
+                          keeping the basis optimal, over which the shadow prices hold
+            "cost_ranges": allowable decrease and increase of each objective coefficient (n_var x 2)
+                           keeping the solution optimal
+    '''
+    basis, x, _ = state
+    lower = np.asarray(lower, dtype = float)
+    upper = np.asarray(upper, dtype = float)
+    m = B.shape[0] - 1
+    n = n_var + m
+    d = B[0, :n]
+    W = B[1:, :n]
+
+    # b_i + t moves the basic variables along the slack column of row i, until one reaches a bound
+    R = W[:, n_var:]
+    up_room = (upper[basis] - x[basis])[:, None]
+    low_room = (lower[basis] - x[basis])[:, None]
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+        increase = np.where(R > tol, up_room/R, np.where(R < -tol, low_room/R, np.inf)).min(axis = 0)
+        decrease = np.where(R > tol, -low_room/R, np.where(R < -tol, -up_room/R, np.inf)).min(axis = 0)
+    rhs_ranges = np.maximum(np.column_stack((decrease, increase)), 0.0)
+
+    # nonbasic variables at a bound stay optimal while their reduced cost keeps its sign
+    nonbasic = np.ones(n, dtype = bool)
+    nonbasic[basis] = False
+    fixed = upper - lower <= tol
+    at_lower = nonbasic & ~fixed & (x <= lower + tol)
+    at_upper = nonbasic & ~fixed & (x >= upper - tol)
+    free = nonbasic & ~fixed & ~at_lower & ~at_upper
+    cost_ranges = np.zeros((n_var, 2))
+    cost_ranges[:, 0] = np.where(at_upper | fixed, np.inf, np.abs(d))[:n_var]
+    cost_ranges[:, 1] = np.where(at_lower | fixed, np.inf, np.abs(d))[:n_var]
+    cost_ranges[free[:n_var]] = 0.0
+
+    # c_j + t of a basic variable in row r changes the reduced costs of the nonbasic columns by -t*W[r]
+    rows = np.where(basis < n_var)[0]
+    if len(rows):
+        alpha = W[rows]
+        movable = at_lower | at_upper | free
+        with np.errstate(divide = 'ignore', invalid = 'ignore'):
+            ratio = np.where(np.abs(alpha) > tol, np.abs(d)/np.abs(alpha), np.inf)
+        limits_up = movable & (free | (at_lower & (alpha > tol)) | (at_upper & (alpha < -tol)))
+        limits_down = movable & (free | (at_lower & (alpha < -tol)) | (at_upper & (alpha > tol)))
+        cost_ranges[basis[rows], 0] = np.where(limits_down, ratio, np.inf).min(axis = 1)
+        cost_ranges[basis[rows], 1] = np.where(limits_up, ratio, np.inf).min(axis = 1)
+
+    # the tableau is in minimization form: a maximization flips the signs and swaps the ranges
+    shadow_prices = -d[n_var:]
+    reduced_costs = d[:n_var].copy()
+    if func_type == 'Maximize':
+        shadow_prices = -shadow_prices
+        reduced_costs = -reduced_costs
+        cost_ranges = cost_ranges[:, ::-1]
+    return {'shadow_prices': shadow_prices + 0.0, 'reduced_costs': reduced_costs + 0.0,
+            'rhs_ranges': rhs_ranges, 'cost_ranges': np.ascontiguousarray(cost_ranges)}
+
+
+def solve_with_sensitivity(n_var, n_constraint, func_type, func_coef, constraints, constraint_signs, variable_cons = None,
+                           pricing = None, observer = None):
+    '''
+        Function solves a problem in original form with the bounded-variable simplex and computes its sensitivity report.
+    Input:
+        same as bounded_simplex.solve_bounded_problem
+    Output:
+        A: optimal tableau
+        z: optimal value
+        solver: optimal solution X1..Xn
+        report: see sensitivity_analysis (None if there is no optimal solution or a redundant row keeps an artificial variable)
+    '''
+    A, lower, upper = transfer_to_bounded_form(n_var, n_constraint, func_type, func_coef, constraints, constraint_signs,
+                                               variable_cons)
+    B, z, solver, state = bounded_simplex_algorithm(n_var, A, lower, upper, func_type, pricing, observer = observer,
+                                                    return_state = True)
+    if state is None:
+        return B, z, solver, None
+    return B, z, solver, sensitivity_analysis(n_var, B, lower, upper, state, func_type)
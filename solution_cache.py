@@ -0,0 +1,231 @@
+import hashlib
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+from linear_programming_functions import is_sparse, solve_linear_programming_problem
+from pricing import PRICING_STRATEGIES
+
+
+def problem_key(A, free_var = [], func_type = 'Minimize', n_var = None, method = 'auto', pricing = None):
+    '''
+        Function computes a canonical hash of a problem in standard form. The constraint rows are
+    sorted first, so problems which only differ in the order of their constraints share one key.
+    transfer_to_standard_form gives row i its slack column n_col + i, so a row is compared by its
+    original coefficients, its slack coefficient and its right-hand side, and the slack columns
+    are permuted together with the rows. The engine and the pricing strategy are part of the key,
+    since they decide which optimal tableau (and which of several optimal solutions) is returned.
+    Input:
+        A: original tableau (numpy array or scipy sparse matrix)
+        free_var: python list include indeces of free variables.
+        func_type: type of objective function
+        n_var: number of original variables
+        method, pricing: see solve_linear_programming_problem
+    Output:
+        key: hexadecimal sha256 digest
+    '''
+    h = hashlib.sha256()
+    h.update(repr((A.shape, n_var, sorted(free_var), func_type, method, pricing_name(pricing))).encode())
+    m = A.shape[0] - 1
+    n_col = A.shape[1] - 1 - m
+
+    if is_sparse(A):
+        A = A.tocsr()
+        A.sum_duplicates()
+        A.sort_indices()
+        rows = []
+        for i in range(A.shape[0]):
+            low, high = A.indptr[i], A.indptr[i + 1]
+            indices = A.indices[low:high].astype(np.int64)
+            data = A.data[low:high].astype(float) + 0.0
+            keep = data != 0
+            rows.append((indices[keep], data[keep]))
+        rows = canonical_sparse_rows(rows, n_col, m)
+        h.update(rows[0])
+        for row in sorted(rows[1:]):
+            h.update(b'#' + row)
+    else:
+        # adding 0.0 turns -0.0 into 0.0
+        A = np.ascontiguousarray(A, dtype = float) + 0.0
+        S = A[1:, n_col:-1]
+        if n_col >= 0 and not np.any(S - np.diag(np.diag(S))):
+            h.update(b'slack')
+            rows = np.column_stack((A[1:, :n_col], np.diag(S), A[1:, -1]))
+            order = np.lexsort(rows.T[::-1])
+            h.update(A[0, :n_col].tobytes())
+            h.update(A[0, n_col:-1][order].tobytes())
+            h.update(A[0, -1:].tobytes())
+            h.update(rows[order].tobytes())
+        else:
+            order = np.lexsort(A[1:].T[::-1])
+            h.update(A[0].tobytes())
+            h.update(A[1:][order].tobytes())
+
+    return h.hexdigest()
+
+
+def pricing_name(pricing = None):
+    '''
+        Function names a pricing strategy for problem_key (None is Dantzig's rule, see pricing.make_pricing).
+    '''
+    if pricing is None:
+        return 'dantzig'
+    if isinstance(pricing, str):
+        return pricing
+    names = [name for name, strategy in PRICING_STRATEGIES.items() if type(pricing) is strategy]
+    return names[0] if names else type(pricing).__module__ + '.' + type(pricing).__qualname__
+
+
+def canonical_sparse_rows(rows, n_col, m):
+    '''
+        Function encodes the (indices, values) rows of a sparse tableau as bytes. If every constraint
+    row only has a slack entry in its own slack column, the slack column index is replaced by a marker
+    and the slack costs are kept with the rows, so that sorting the rows permutes the slack columns too.
+    Output:
+        rows: python list of bytes, objective row first
+    '''
+    slack = [(indices >= n_col) & (indices < n_col + m) for indices, data in rows]
+    diagonal = n_col >= 0 and all(np.all(indices[mask] == n_col + i) for i, ((indices, data), mask)
+                                  in enumerate(zip(rows[1:], slack[1:])))
+    if not diagonal:
+        return [indices.tobytes() + b'|' + data.tobytes() for indices, data in rows]
+
+    indices, data = rows[0]
+    costs = dict(zip(indices[slack[0]].tolist(), data[slack[0]].tolist()))
+    encoded = [b'slack' + indices[~slack[0]].tobytes() + b'|' + data[~slack[0]].tobytes()]
+    for i, ((indices, data), mask) in enumerate(zip(rows[1:], slack[1:])):
+        own = np.array([data[mask].sum() if mask.any() else 0.0, costs.get(n_col + i, 0.0)]) + 0.0
+        encoded.append(indices[~mask].tobytes() + b'|' + data[~mask].tobytes() + b'|' + own.tobytes())
+    return encoded
+
+
+class SolutionCache:
+    '''
+        LRU cache of solved problems keyed by problem_key, bounded by a number of entries and/or a
+    number of bytes. If a directory is given, every entry is also stored there and read back on a
+    miss, so the cache survives restarts.
+    '''
+    def __init__(self, max_entries = 1024, max_bytes = None, path = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.path = path
+        self.entries = OrderedDict()
+        self.n_bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if path is not None:
+            os.makedirs(path, exist_ok = True)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def stats(self):
+        '''
+            Function returns the hit/miss statistics of the cache.
+        '''
+        lookups = self.hits + self.disk_hits + self.misses
+        return {'hits': self.hits, 'disk_hits': self.disk_hits, 'misses': self.misses,
+                'evictions': self.evictions, 'entries': len(self.entries), 'bytes': self.n_bytes,
+                'hit_rate': (self.hits + self.disk_hits)/lookups if lookups else 0.0}
+
+    def entry_path(self, key):
+        return os.path.join(self.path, key + '.npz')
+
+    def get(self, key):
+        '''
+            Function looks a key up in memory, then on disk.
+        Output:
+            result: cached (A, z, solver) or None on a miss
+        '''
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+
+        if self.path is not None and os.path.exists(self.entry_path(key)):
+            with np.load(self.entry_path(key)) as data:
+                if data['optimal']:
+                    result = (data['A'], float(data['z']), list(data['solver']))
+                else:
+                    result = (None, None, None)
+            self.disk_hits += 1
+            self.store(key, result)
+            return result
+
+        self.misses += 1
+        return None
+
+    def put(self, key, result):
+        '''
+            Function adds a result to the cache (and to the disk store).
+        '''
+        if self.path is not None:
+            A, z, solver = result
+            optimal = isinstance(A, np.ndarray)
+            tmp = self.entry_path(key) + '.tmp.npz'
+            np.savez(tmp, optimal = optimal, A = A if optimal else np.zeros(0),
+                     z = z if optimal else np.nan, solver = np.array(solver if optimal else [], dtype = float))
+            os.replace(tmp, self.entry_path(key))
+        self.store(key, result)
+
+    def store(self, key, result):
+        if key in self.entries:
+            self.n_bytes -= entry_size(self.entries.pop(key))
+        self.entries[key] = result
+        self.n_bytes += entry_size(result)
+
+        # evict least recently used entries
+        while len(self.entries) > 1 and ((self.max_entries is not None and len(self.entries) > self.max_entries)
+                                         or (self.max_bytes is not None and self.n_bytes > self.max_bytes)):
+            _, old = self.entries.popitem(last = False)
+            self.n_bytes -= entry_size(old)
+            self.evictions += 1
+
+    def clear(self):
+        '''
+            Function empties the in-memory cache (the disk store is kept).
+        '''
+        self.entries.clear()
+        self.n_bytes = 0
+
+
+def entry_size(result):
+    A, z, solver = result
+    if not isinstance(A, np.ndarray):
+        return 0
+    return A.nbytes + 8*(len(solver) + 1)
+
+
+default_cache = SolutionCache()
+
+
+def cached_solve(n_var, A, free_var = [], func_type = 'min', method = 'auto', pricing = None, cache = None):
+    '''
+        Function solves a problem through a solution cache: a problem seen before with the same engine
+    and pricing strategy (up to the order of its constraints) is answered from the cache without pivoting.
+    Only z and solver are shared between problems with different orders of constraints: the tableau is
+    the one of the first solve, whose rows and slack columns follow the order of that problem.
+    Input:
+        n_var, A, free_var, func_type, method, pricing: see solve_linear_programming_problem
+        cache: SolutionCache (default: a module-wide cache of 1024 entries)
+    Output:
+        A: optimal tableau of the first solve of the problem (its constraints may be in another order)
+        z: optimal value
+        solver: optimal solution
+    '''
+    cache = default_cache if cache is None else cache
+    key = problem_key(A, free_var, func_type, n_var, method, pricing)
+
+    result = cache.get(key)
+    if result is None:
+        # the tableau engines pivot in place, the caller's tableau must keep its key
+        result = solve_linear_programming_problem(n_var, A.copy(), free_var, func_type, method, pricing)
+        cache.put(key, result)
+
+    B, z, solver = result
+    if not isinstance(B, np.ndarray):
+        return None, None, None
+    return B.copy(), z, list(solver)
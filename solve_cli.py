@@ -0,0 +1,191 @@
+import argparse
+import contextlib
+import json
+import os
+import sys
+
+# NumPy and the solver modules are imported inside the functions, after the arguments are parsed:
+# "--help" and argument errors stay instant, and only the engine that is used gets imported.
+# Nothing here imports tkinter, so no display server is needed.
+
+METHODS = ('auto', 'primal', 'dual', 'two_phase', 'tableau', 'revised', 'interior_point', 'network', 'bounded')
+PRICINGS = ('dantzig', 'bland', 'partial', 'devex', 'steepest_edge')
+NODE_SELECTIONS = ('best_bound', 'depth_first')
+
+
+def parse_json_problems(text):
+    '''
+        Function parses the problems of a JSON document: a single problem, a list of problems or
+    one problem per line (JSONL).
+    Input:
+        text: content of the document
+    Output:
+        python list of problems (python dicts)
+    '''
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+    if isinstance(data, list):
+        return data
+    return [data]
+
+
+def read_sources(sources):
+    '''
+        Function reads the problems of every source.
+    Input:
+        sources: paths of JSON, JSONL, MPS (.mps) or LP (.lp) files, "-" for standard input
+    Output:
+        generator of (name, problem) pairs, problem is a python dict (JSON problems)
+        or the path of an MPS/LP file
+    '''
+    for source in sources:
+        if source == '-':
+            text = sys.stdin.read()
+            name = 'stdin'
+        elif os.path.splitext(source)[1].lower() in ('.mps', '.lp'):
+            yield source, source
+            continue
+        else:
+            with open(source) as f:
+                text = f.read()
+            name = os.path.splitext(os.path.basename(source))[0]
+
+        problems = parse_json_problems(text)
+        for i, problem in enumerate(problems):
+            yield (name if len(problems) == 1 else '%s:%d' % (name, i + 1)), problem
+
+
+def solve_json_problem(problem, method = 'auto', pricing = None, presolve = False, mip_options = None):
+    '''
+        Function solves a problem given with the inputs of transfer_to_standard_form: "n_var", "n_constraint",
+    "func_type", "func_coef", "constraints", "constraint_signs" and "variable_cons". Problems with "Integer"
+    or "Binary" variables are solved by branch_and_bound.branch_and_bound, whatever the method.
+    Input:
+        mip_options: python dict of keyword arguments of branch_and_bound (node_selection, gap, time_limit, workers)
+    Output:
+        z: optimal value (None if there is no optimal solution)
+        solver: optimal solution X1..Xn
+        var_names: names of the variables
+        info: statistics of branch_and_bound (None for linear problems)
+    '''
+    n_var, n_constraint, func_type = problem['n_var'], problem['n_constraint'], problem['func_type']
+    inputs = (n_var, n_constraint, func_type, list(problem['func_coef']), [list(row) for row in problem['constraints']],
+              list(problem['constraint_signs']), list(problem['variable_cons']))
+
+    var_names = ['X%d' % (j + 1) for j in range(n_var)]
+    from branch_and_bound import is_mixed_integer
+    if is_mixed_integer(inputs[6]):
+        from branch_and_bound import branch_and_bound
+        B, z, solver, info = branch_and_bound(*inputs, return_info = True, **(mip_options or {}))
+        return z, solver, var_names, info
+
+    if method == 'bounded':
+        from bounded_simplex import solve_bounded_problem
+        B, z, solver = solve_bounded_problem(*inputs, pricing = pricing)
+    elif presolve:
+        from presolve import solve_with_presolve
+        B, z, solver = solve_with_presolve(*inputs, method = method, pricing = pricing)
+    else:
+        from linear_programming_functions import transfer_to_standard_form, solve_linear_programming_problem, restore_signs
+        A, free_var = transfer_to_standard_form(*inputs)
+        B, z, solver = solve_linear_programming_problem(n_var, A, free_var, func_type, method, pricing)
+        if z is not None:
+            solver = restore_signs(solver, inputs[6])
+    return z, solver, var_names, None
+
+
+def solve_file_problem(path, method = 'auto', pricing = None):
+    '''
+        Function solves a problem read from an MPS or LP file (see problem_readers.read_problem).
+    The bounded method keeps the bounds of the file as bounds of the columns instead of extra rows; the other
+    methods split free variables and negate the columns of "<= 0" variables, which restore_signs flips back.
+    Output:
+        same as solve_json_problem
+    '''
+    from problem_readers import read_problem
+    from linear_programming_functions import solve_linear_programming_problem, restore_signs
+
+    if method == 'bounded':
+        A, free_var, n_var, variable_cons, func_type, var_names, bounds = read_problem(path, bounds_as_rows = False)
+    else:
+        A, free_var, n_var, variable_cons, func_type, var_names = read_problem(path)
+        bounds = None
+    B, z, solver = solve_linear_programming_problem(n_var, A, free_var, func_type, method, pricing, bounds = bounds)
+    if z is not None:
+        solver = restore_signs(solver, variable_cons)
+    return z, solver, var_names, None
+
+
+def solve_one(name, problem, method = 'auto', pricing = None, presolve = False, mip_options = None):
+    '''
+        Function solves one problem of read_sources.
+    Output:
+        result: python dict with "id", "status" ("optimal", "no_solution" or "error", "time_limit" or "node_limit"
+                if branch and bound stopped early), "z", "solution" (python dict from variable name to value),
+                "message" for errors, and "nodes" and "gap" for integer problems
+    '''
+    problem_id = problem.get('id', name) if isinstance(problem, dict) else name
+    try:
+        # the engines print their messages, which must not end up in the JSON output
+        with contextlib.redirect_stdout(sys.stderr):
+            if isinstance(problem, dict):
+                z, solver, var_names, info = solve_json_problem(problem, method, pricing, presolve, mip_options)
+            else:
+                z, solver, var_names, info = solve_file_problem(problem, method, pricing)
+    except Exception as e:
+        return {'id': problem_id, 'status': 'error', 'message': '%s: %s' % (type(e).__name__, e)}
+
+    if z is None:
+        result = {'id': problem_id, 'status': 'no_solution', 'z': None, 'solution': None}
+    else:
+        result = {'id': problem_id, 'status': 'optimal' if info is None else info['status'], 'z': float(z),
+                  'solution': {name: float(x) for name, x in zip(var_names, solver)}}
+    if info is not None:
+        result.update(nodes = info['nodes'], gap = info['gap'])
+    return result
+
+
+def main(argv = None):
+    '''
+        Function runs the command line: solves every problem of the sources and writes one JSON result per problem.
+    Input:
+        argv: command line arguments (default: sys.argv[1:])
+    Output:
+        exit status: 0 if every problem was solved or shown to have no optimal solution, 1 if a problem failed
+    '''
+    parser = argparse.ArgumentParser(prog = 'solve_cli', description = "Solve linear programming problems without the GUI.",
+                                     epilog = "JSON problems have the keys n_var, n_constraint, func_type, func_coef, "
+                                              "constraints, constraint_signs, variable_cons and an optional id.")
+    parser.add_argument('sources', nargs = '*', default = ['-'],
+                        help = "JSON, JSONL, MPS or LP files, - for standard input (default)")
+    parser.add_argument('-o', '--output', default = '-', help = "result file (default: standard output)")
+    parser.add_argument('--method', default = 'auto', choices = METHODS, help = "solver engine")
+    parser.add_argument('--pricing', default = None, choices = PRICINGS, help = "pricing strategy")
+    parser.add_argument('--presolve', action = 'store_true', help = "presolve JSON problems before solving")
+    parser.add_argument('--node-selection', default = 'best_bound', choices = NODE_SELECTIONS,
+                        help = "order of the open nodes of integer problems")
+    parser.add_argument('--gap', type = float, default = 1e-6, help = "relative gap closing the search of integer problems")
+    parser.add_argument('--time-limit', type = float, default = None, help = "seconds per integer problem")
+    parser.add_argument('--workers', type = int, default = 1, help = "processes solving the nodes of integer problems")
+    parser.add_argument('--indent', type = int, default = None, help = "indent the JSON results (one line each otherwise)")
+    args = parser.parse_args(argv)
+
+    mip_options = dict(node_selection = args.node_selection, gap = args.gap, time_limit = args.time_limit, workers = args.workers)
+    f = sys.stdout if args.output == '-' else open(args.output, 'w')
+    failed = False
+    try:
+        for name, problem in read_sources(args.sources):
+            result = solve_one(name, problem, args.method, args.pricing, args.presolve, mip_options)
+            failed = failed or result['status'] == 'error'
+            f.write(json.dumps(result, indent = args.indent) + '\n')
+            f.flush()
+    finally:
+        if f is not sys.stdout:
+            f.close()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,383 @@
+import argparse
+import asyncio
+import http.client
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit, parse_qs
+
+PROBLEM_KEYS = ('n_var', 'n_constraint', 'func_type', 'func_coef', 'constraints', 'constraint_signs', 'variable_cons')
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 413: 'Payload Too Large',
+           503: 'Service Unavailable', 504: 'Gateway Timeout'}
+
+
+def read_problem(data):
+    '''
+        Function reads a problem sent to the service: either the list returned by get_input
+    [n_var, n_constraint, func_type, func_coef, constraints, constraint_signs, variable_cons]
+    or a JSON object with these keys (and an optional "id").
+    Output:
+        problem: python dict (see batch_runner.read_problems)
+    '''
+    if isinstance(data, list):
+        if len(data) != len(PROBLEM_KEYS):
+            raise ValueError("a problem list needs %d items" % len(PROBLEM_KEYS))
+        return dict(zip(PROBLEM_KEYS, data))
+    if isinstance(data, dict):
+        missing = [key for key in PROBLEM_KEYS if key not in data]
+        if missing:
+            raise ValueError("missing keys: " + ", ".join(missing))
+        return data
+    raise ValueError("a problem is a JSON list or object")
+
+
+def load_solver():
+    '''
+        Function imports the solver once in every worker process, before the first request arrives.
+    '''
+    import batch_runner
+
+
+def solve_batch(problems, method = 'auto'):
+    '''
+        Function solves a micro-batch of problems in a worker process.
+    Output:
+        python list of results (see batch_runner.solve_problem)
+    '''
+    from batch_runner import solve_problem
+    return [solve_problem(problem, method) for problem in problems]
+
+
+def percentile(values, q):
+    '''
+        Function computes the q-th percentile of sorted values (None if there is none).
+    '''
+    if not values:
+        return None
+    return values[min(len(values) - 1, int(q/100*len(values)))]
+
+
+class ServiceMetrics:
+    '''
+        Counters of the solve service. Latencies (from the arrival of a request to its answer) and
+    completion times are kept for the last `window` requests.
+    '''
+    def __init__(self, window = 10000):
+        self.started = time.monotonic()
+        self.requests = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.bad_requests = 0
+        self.batches = 0
+        self.batched = 0
+        self.max_queue_depth = 0
+        self.latencies = deque(maxlen = window)
+        self.finished = deque(maxlen = window)
+
+    def complete(self, latency):
+        self.completed += 1
+        self.latencies.append(latency)
+        self.finished.append(time.monotonic())
+
+    def snapshot(self, queue_depth, in_flight, workers, recent = 60.0):
+        '''
+            Function summarizes the counters.
+        Output:
+            python dict of metrics, throughputs in solves per second and latencies in seconds
+        '''
+        now = time.monotonic()
+        uptime = now - self.started
+        latencies = sorted(self.latencies)
+        n_recent = sum(1 for t in self.finished if now - t <= recent)
+        return {
+            'uptime': uptime,
+            'requests': self.requests,
+            'completed': self.completed,
+            'rejected': self.rejected,
+            'timeouts': self.timeouts,
+            'bad_requests': self.bad_requests,
+            'throughput': self.completed/uptime if uptime > 0 else 0.0,
+            'recent_throughput': n_recent/min(recent, uptime) if uptime > 0 else 0.0,
+            'latency': {
+                'mean': sum(latencies)/len(latencies) if latencies else None,
+                'p50': percentile(latencies, 50),
+                'p90': percentile(latencies, 90),
+                'p99': percentile(latencies, 99),
+                'max': latencies[-1] if latencies else None,
+            },
+            'queue_depth': queue_depth,
+            'max_queue_depth': self.max_queue_depth,
+            'in_flight_batches': in_flight,
+            'batches': self.batches,
+            'mean_batch_size': self.batched/self.batches if self.batches else None,
+            'workers': workers,
+        }
+
+
+class SolveService:
+    '''
+        Asyncio front end of a pool of solver processes, answering HTTP requests on localhost:
+            POST /solve     body: one problem (see read_problem), optional query "timeout" in seconds
+                            answer: result of batch_runner.solve_problem
+            GET  /metrics   throughput, latency and queue-depth metrics (see ServiceMetrics.snapshot)
+    Requests arriving together are gathered into micro-batches of at most batch_size problems
+    (waiting at most batch_delay seconds for more), at most 2*workers batches are in flight.
+    When max_queue requests wait, new requests are refused at once with status 503.
+    A request not answered within its timeout gets status 504; if it has not been sent to a
+    worker yet, it is dropped from the queue.
+    Input:
+        workers: number of worker processes (default: number of CPUs)
+        batch_size: maximal number of problems of a batch
+        batch_delay: time waited for more requests before a batch is sent (seconds)
+        max_queue: maximal number of waiting requests
+        timeout: default time limit of a request (seconds)
+        max_timeout: largest time limit a request may ask for (seconds)
+        method: solver engine passed to solve_linear_programming_problem
+        max_body: largest accepted request body (bytes)
+    '''
+    def __init__(self, workers = None, batch_size = 16, batch_delay = 0.002, max_queue = 1024, timeout = 30.0,
+                 max_timeout = 300.0, method = 'auto', max_body = 64*1024*1024):
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.max_timeout = max_timeout
+        self.method = method
+        self.max_body = max_body
+        self.metrics = ServiceMetrics()
+        self.executor = None
+        self.queue = None
+        self.slots = None
+        self.batcher = None
+        self.in_flight = 0
+        self.tasks = set()
+
+    async def start(self):
+        '''
+            Function starts the worker processes and the batching task.
+        '''
+        self.executor = ProcessPoolExecutor(self.workers, initializer = load_solver)
+        self.queue = asyncio.Queue(self.max_queue)
+        self.slots = asyncio.Semaphore(2*self.workers)
+        self.batcher = asyncio.create_task(self.batch_loop())
+
+    async def stop(self):
+        self.batcher.cancel()
+        for task in list(self.tasks):
+            task.cancel()
+        self.executor.shutdown(wait = False, cancel_futures = True)
+
+    async def batch_loop(self):
+        '''
+            Function gathers waiting requests into micro-batches and sends them to the workers.
+        A batch is only formed once a worker slot is free, so under load the requests wait in the
+        bounded queue (and the batches grow) instead of piling up in the pool.
+        '''
+        while True:
+            await self.slots.acquire()
+            batch = [await self.queue.get()]
+            if self.batch_delay > 0 and self.queue.qsize() < self.batch_size - 1:
+                await asyncio.sleep(self.batch_delay)
+            while len(batch) < self.batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+
+            # requests that timed out while waiting are not solved
+            batch = [(problem, future) for problem, future in batch if not future.done()]
+            if not batch:
+                self.slots.release()
+                continue
+
+            task = asyncio.create_task(self.run_batch(batch))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def run_batch(self, batch):
+        self.in_flight += 1
+        self.metrics.batches += 1
+        self.metrics.batched += len(batch)
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                self.executor, solve_batch, [problem for problem, future in batch], self.method)
+        except Exception as e:
+            results = [{'id': problem.get('id'), 'status': 'error', 'message': str(e)} for problem, future in batch]
+        finally:
+            self.in_flight -= 1
+            self.slots.release()
+
+        for (problem, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def solve(self, problem, timeout = None):
+        '''
+            Function queues a problem and waits for its result.
+        Output:
+            status: HTTP status (200, 503 if the queue is full, 504 on timeout)
+            result: python dict
+        '''
+        start = time.monotonic()
+        self.metrics.requests += 1
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((problem, future))
+        except asyncio.QueueFull:
+            self.metrics.rejected += 1
+            return 503, {'status': 'rejected', 'message': "queue full, retry later"}
+        self.metrics.max_queue_depth = max(self.metrics.max_queue_depth, self.queue.qsize())
+
+        try:
+            result = await asyncio.wait_for(future, self.timeout if timeout is None else timeout)
+        except asyncio.TimeoutError:
+            self.metrics.timeouts += 1
+            return 504, {'id': problem.get('id'), 'status': 'timeout'}
+        self.metrics.complete(time.monotonic() - start)
+        return 200, result
+
+    async def dispatch(self, method, target, body):
+        '''
+            Function answers one HTTP request.
+        Output:
+            status: HTTP status
+            payload: python object sent back as JSON
+        '''
+        url = urlsplit(target)
+        if url.path == '/metrics':
+            if method != 'GET':
+                return 405, {'message': "use GET"}
+            return 200, self.metrics.snapshot(self.queue.qsize(), self.in_flight, self.workers)
+
+        if url.path != '/solve':
+            return 404, {'message': "unknown path " + url.path}
+        if method != 'POST':
+            return 405, {'message': "use POST"}
+
+        try:
+            problem = read_problem(json.loads(body))
+            timeout = parse_qs(url.query).get('timeout')
+            if timeout:
+                timeout = float(timeout[0])
+                # also rejects nan
+                if not timeout > 0:
+                    raise ValueError("timeout must be a positive number of seconds")
+                timeout = min(timeout, self.max_timeout)
+            else:
+                timeout = None
+        except ValueError as e:
+            self.metrics.bad_requests += 1
+            return 400, {'status': 'error', 'message': str(e)}
+        return await self.solve(problem, timeout)
+
+    async def handle_connection(self, reader, writer):
+        '''
+            Function serves the HTTP requests of one connection (kept alive between requests).
+        '''
+        try:
+            while True:
+                line = await reader.readline()
+                if not line.strip():
+                    break
+                method, target, version = line.decode('latin-1').split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if not line.strip():
+                        break
+                    key, _, value = line.decode('latin-1').partition(':')
+                    headers[key.strip().lower()] = value.strip()
+
+                length = int(headers.get('content-length', 0))
+                if length > self.max_body:
+                    self.respond(writer, 413, {'message': "request body too large"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                status, payload = await self.dispatch(method, target, body)
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                self.respond(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    def respond(self, writer, status, payload, keep_alive):
+        body = json.dumps(payload).encode()
+        head = ['HTTP/1.1 %d %s' % (status, REASONS[status]),
+                'Content-Type: application/json',
+                'Content-Length: %d' % len(body),
+                'Connection: ' + ('keep-alive' if keep_alive else 'close')]
+        if status == 503:
+            head.append('Retry-After: 1')
+        writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + body)
+
+
+async def serve(service, port = 8765, unix_path = None, ready = None):
+    '''
+        Function runs the service until it is cancelled. It only listens on the loopback interface
+    (or on a unix socket), never on an external address.
+    Input:
+        service: SolveService
+        port: TCP port on 127.0.0.1
+        unix_path: path of a unix socket used instead of TCP
+        ready: function called with the server once it listens
+    '''
+    await service.start()
+    if unix_path is not None:
+        server = await asyncio.start_unix_server(service.handle_connection, unix_path)
+    else:
+        server = await asyncio.start_server(service.handle_connection, '127.0.0.1', port)
+    if ready is not None:
+        ready(server)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+
+def solve_remote(problem, port = 8765, timeout = None):
+    '''
+        Function sends a problem to a running service on 127.0.0.1 and waits for the answer.
+    Input:
+        problem: list returned by get_input or python dict (see read_problem)
+        port: TCP port of the service
+        timeout: time limit of the request (seconds, default: the service default)
+    Output:
+        status: HTTP status
+        result: python dict
+    '''
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout = None if timeout is None else timeout + 5)
+    try:
+        path = '/solve' if timeout is None else '/solve?timeout=%g' % timeout
+        connection.request('POST', path, json.dumps(problem), {'Content-Type': 'application/json'})
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Serve the solver to local processes over HTTP.")
+    parser.add_argument('-p', '--port', type = int, default = 8765, help = "TCP port on 127.0.0.1")
+    parser.add_argument('--unix', default = None, help = "listen on this unix socket instead of TCP")
+    parser.add_argument('-w', '--workers', type = int, default = None, help = "number of worker processes")
+    parser.add_argument('--batch-size', type = int, default = 16, help = "maximal number of problems of a batch")
+    parser.add_argument('--batch-delay', type = float, default = 0.002, help = "seconds waited for more requests")
+    parser.add_argument('--max-queue', type = int, default = 1024, help = "waiting requests before 503 answers")
+    parser.add_argument('--timeout', type = float, default = 30.0, help = "default time limit of a request (seconds)")
+    parser.add_argument('--method', default = 'auto', help = "solver engine")
+    args = parser.parse_args()
+
+    service = SolveService(args.workers, args.batch_size, args.batch_delay, args.max_queue, args.timeout, method = args.method)
+    where = args.unix or '127.0.0.1:%d' % args.port
+    try:
+        asyncio.run(serve(service, args.port, args.unix, lambda server: print("serving on " + where, file = sys.stderr)))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,29 @@
+import json
+
+import pytest
+
+from batch_runner import read_problems, run_batch
+
+PROBLEM = {'n_var': 2, 'n_constraint': 3, 'func_type': 'Maximize', 'func_coef': [3, 2],
+           'constraints': [[1, 1, 4], [1, 3, 6], [2, 1, 7]], 'constraint_signs': ['<=', '>=', '<='],
+           'variable_cons': ['>= 0', '>= 0']}
+
+
+def test_malformed_line_gives_an_error_result(tmp_path):
+    source = tmp_path / 'problems.jsonl'
+    source.write_text(json.dumps(dict(PROBLEM, id = 'a')) + '\n{"n_var": 2,\n\n[1, 2]\n' + json.dumps(PROBLEM) + '\n')
+    output = tmp_path / 'results.jsonl'
+
+    assert run_batch(str(source), str(output), workers = 1, chunk_size = 2) == 4
+    results = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [r['id'] for r in results] == ['a', 'line 2', 'line 4', 'line 5']
+    assert [r['status'] for r in results] == ['optimal', 'error', 'error', 'optimal']
+    assert results[0]['z'] == pytest.approx(11.0) and results[3]['z'] == pytest.approx(11.0)
+
+
+def test_directory_source(tmp_path):
+    (tmp_path / 'good.json').write_text(json.dumps(PROBLEM))
+    (tmp_path / 'bad.json').write_text('{')
+    problems = list(read_problems(str(tmp_path)))
+    assert [p['id'] for p in problems] == ['bad', 'good']
+    assert 'error' in problems[0]
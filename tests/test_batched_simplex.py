@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from batched_simplex import solve_batch
+from linear_programming_functions import transfer_to_standard_form
+
+
+def test_batch_of_problems_reaches_known_optima():
+    # max 3x + 2y  s.t.  x + y <= b1,  x + 3y >= 6,  2x + y <= 7
+    tableaux = []
+    for b1 in (4, 5, 100):
+        A, free_var = transfer_to_standard_form(2, 3, 'Maximize', [3, 2], [[1, 1, b1], [1, 3, 6], [2, 1, 7]],
+                                                ['<=', '>=', '<='], ['>= 0', '>= 0'])
+        tableaux.append(A)
+    status, z, solver = solve_batch(2, np.stack(tableaux), free_var, 'Maximize')
+    assert list(status) == ['optimal'] * 3
+    assert z == pytest.approx([11.0, 12.0, 14.0])
+    assert solver[0] == pytest.approx([3.0, 1.0])
+
+
+def test_degenerate_problem_does_not_cycle():
+    # Beale's example cycles under Dantzig's rule with lowest-index ties; optimum -5/4 at (1, 0, 1, 0)
+    A, free_var = transfer_to_standard_form(4, 3, 'Minimize', [-0.75, 20, -0.5, 6],
+                                            [[0.25, -8, -1, 9, 0], [0.5, -12, -0.5, 3, 0], [0, 0, 1, 0, 1]],
+                                            ['<='] * 3, ['>= 0'] * 4)
+    status, z, solver = solve_batch(4, np.stack([A, A]), free_var, 'Minimize', max_iter = 200)
+    assert list(status) == ['optimal', 'optimal']
+    assert z == pytest.approx([-1.25, -1.25])
+    assert solver[0] == pytest.approx([1.0, 0.0, 1.0, 0.0])
+
+
+def test_infeasible_and_unbounded_problems_are_masked_out():
+    infeasible, free_var = transfer_to_standard_form(2, 2, 'Minimize', [1, 1], [[1, 1, 1], [1, 1, 3]], ['<=', '>='],
+                                                     ['>= 0', '>= 0'])
+    unbounded, free_var = transfer_to_standard_form(2, 2, 'Maximize', [1, 1], [[1, -1, 1], [0, 0, 3]], ['<=', '<='],
+                                                    ['>= 0', '>= 0'])
+    status, z, solver = solve_batch(2, np.stack([infeasible, unbounded]), free_var)
+    assert list(status) == ['infeasible', 'unbounded']
+    assert np.isnan(z).all()
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from bounded_simplex import solve_bounded_problem
+from linear_programming_functions import transfer_to_standard_form, solve_linear_programming_problem
+from problem_readers import read_problem
+
+# max 3x + 2y  s.t.  x + y <= 4,  x + 3y >= 6,  2x + y <= 7, optimum 11 at (3, 1)
+CONSTRAINTS = [[1, 1, 4], [1, 3, 6], [2, 1, 7]]
+SIGNS = ['<=', '>=', '<=']
+
+
+def test_bounded_problem_with_variable_bounds():
+    # the extra bound x <= 2 moves the optimum to (2, 2)
+    B, z, solver = solve_bounded_problem(2, 3, 'Maximize', [3, 2], CONSTRAINTS, SIGNS, upper = [2, np.inf])
+    assert z == pytest.approx(10.0)
+    assert solver == pytest.approx([2.0, 2.0])
+
+
+def test_bounded_method_of_solve_linear_programming_problem():
+    A, free_var = transfer_to_standard_form(2, 3, 'Maximize', [3, 2], CONSTRAINTS, SIGNS, ['>= 0', 'Free'])
+    B, z, solver = solve_linear_programming_problem(2, A, free_var, 'Maximize', 'bounded')
+    assert z == pytest.approx(11.0)
+    assert solver == pytest.approx([3.0, 1.0])
+
+
+def test_column_bounds_are_not_rows(tmp_path):
+    path = tmp_path / 'bounded.lp'
+    path.write_text('Maximize\n obj: 3 x + 2 y\nSubject To\n c1: x + y <= 4\n c2: x + 3 y >= 6\n c3: 2 x + y <= 7\n'
+                    'Bounds\n 0 <= x <= 2\n 1 <= y <= 5\nEnd\n')
+    A, free_var, n_var, variable_cons, func_type, var_names, bounds = read_problem(str(path), sparse = False, bounds_as_rows = False)
+    assert A.shape == (4, 6)
+    B, z, solver = solve_linear_programming_problem(n_var, A, free_var, func_type, bounds = bounds)
+    assert z == pytest.approx(10.0)
+
+    A_rows, free_var, n_var, variable_cons, func_type, var_names = read_problem(str(path), sparse = False)
+    assert A_rows.shape[0] > A.shape[0]
+    assert solve_linear_programming_problem(n_var, A_rows, free_var, func_type)[1] == pytest.approx(10.0)
+
+
+def test_infeasible_bounds():
+    B, z, solver = solve_bounded_problem(2, 3, 'Maximize', [3, 2], CONSTRAINTS, SIGNS, lower = [5, 0])
+    assert B is None and z is None
@@ -0,0 +1,41 @@
+import pytest
+
+from branch_and_bound import branch_and_bound, is_mixed_integer
+
+# max 5a + 4b + 3c  s.t.  2a + 3b + c <= 5,  4a + b + 2c <= 11,  3a + 4b + 2c <= 8
+CONSTRAINTS = [[2, 3, 1, 5], [4, 1, 2, 11], [3, 4, 2, 8]]
+
+
+@pytest.mark.parametrize('node_selection', ['best_bound', 'depth_first'])
+def test_integer_problem_reaches_known_optimum(node_selection):
+    B, z, solver, info = branch_and_bound(3, 3, 'Maximize', [5, 4, 3], CONSTRAINTS, ['<='] * 3, ['Integer'] * 3,
+                                          node_selection = node_selection, return_info = True)
+    assert info['status'] == 'optimal'
+    assert z == pytest.approx(13.0)
+    assert solver == [2.0, 0.0, 1.0]
+
+
+def test_binary_knapsack():
+    # max 10a + 13b + 7c + 8d  s.t.  4a + 6b + 3c + 5d <= 10, all binary: optimum a, b
+    B, z, solver = branch_and_bound(4, 1, 'Maximize', [10, 13, 7, 8], [[4, 6, 3, 5, 10]], ['<='], ['Binary'] * 4)
+    assert z == pytest.approx(23.0)
+    assert solver == [1.0, 1.0, 0.0, 0.0]
+
+
+def test_mixed_problem_with_continuous_variable():
+    # min x + y  s.t.  2x + 2y >= 3, x integer, y >= 0 continuous: x = 0, y = 1.5 or x = 1, y = 0.5
+    B, z, solver = branch_and_bound(2, 1, 'Minimize', [1, 1], [[2, 2, 3]], ['>='], ['Integer', '>= 0'])
+    assert z == pytest.approx(1.5)
+    assert solver[0] == round(solver[0])
+
+
+def test_infeasible_integer_problem():
+    # 2x = 1 has no integer solution
+    B, z, solver, info = branch_and_bound(1, 1, 'Minimize', [1], [[2, 1]], ['='], ['Integer'], return_info = True)
+    assert z is None and info['status'] == 'infeasible'
+
+
+def test_parallel_search_matches_sequential():
+    B, z, solver = branch_and_bound(3, 3, 'Maximize', [5, 4, 3], CONSTRAINTS, ['<='] * 3, ['Integer'] * 3, workers = 2)
+    assert z == pytest.approx(13.0)
+    assert is_mixed_integer(['>= 0', 'Binary']) and not is_mixed_integer(['>= 0', 'Free'])
@@ -0,0 +1,18 @@
+import coefficient_grid
+from coefficient_grid import CoefficientGrid, parse_block
+
+
+def test_parse_block_splits_spreadsheet_cells():
+    assert parse_block('1\t2\t<=\t4\n3\t-1\t>=\t2\n') == [['1', '2', '<=', '4'], ['3', '-1', '>=', '2']]
+
+
+def test_paste_shortcut_reports_bad_cell(monkeypatch):
+    # the bound handler only needs paste_clipboard, no window is created
+    class Grid:
+        def paste_clipboard(self, event):
+            raise ValueError("bad cell")
+
+    errors = []
+    monkeypatch.setattr(coefficient_grid.messagebox, 'showerror', lambda title, message: errors.append(message))
+    assert CoefficientGrid.on_paste(Grid(), None) == 'break'
+    assert errors == ["bad cell"]
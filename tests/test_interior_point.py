@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from linear_programming_functions import transfer_to_standard_form, solve_linear_programming_problem
+from interior_point import interior_point_algorithm
+
+
+def random_problem(rng, n_var = 6, n_constraint = 5):
+    # "<=" rows bound every variable, ">=" rows with small right-hand sides keep the problem feasible
+    constraints = np.column_stack((rng.uniform(0.1, 2.0, (n_constraint, n_var)), rng.uniform(5.0, 10.0, n_constraint)))
+    constraints[1::2, -1] = 1.0
+    signs = ['<=', '>=']*(n_constraint//2) + ['<=']*(n_constraint % 2)
+    return (n_var, n_constraint, 'Maximize', list(rng.uniform(-1.0, 3.0, n_var)), constraints.tolist(), signs, ['>= 0']*n_var)
+
+
+@pytest.mark.parametrize('crossover_basis', [True, False])
+def test_random_problems_match_two_phase(crossover_basis):
+    rng = np.random.default_rng(3)
+    for _ in range(10):
+        problem = random_problem(rng)
+        A, free_var = transfer_to_standard_form(*problem)
+        expected = solve_linear_programming_problem(problem[0], A, free_var, 'Maximize', 'two_phase')[1]
+        B, z, solver = interior_point_algorithm(problem[0], A, free_var, 'Maximize', crossover_basis)
+        assert z == pytest.approx(expected, rel = 1e-6)
+        assert np.dot(problem[3], solver) == pytest.approx(expected, rel = 1e-6)
+
+
+def test_sparse_tableau():
+    problem = random_problem(np.random.default_rng(4))
+    A, free_var = transfer_to_standard_form(*problem)
+    expected = interior_point_algorithm(problem[0], A, free_var, 'Maximize')[1]
+    assert interior_point_algorithm(problem[0], sp.csc_matrix(A), free_var, 'Maximize')[1] == pytest.approx(expected)
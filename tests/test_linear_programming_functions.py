@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from linear_programming_functions import (transfer_to_standard_form, solve_linear_programming_problem, restore_signs,
+                                          choose_method)
+
+# max 3x + 2y  s.t.  x + y <= 4,  x + 3y >= 6,  2x + y <= 7, optimum 11 at (3, 1)
+MIXED = (2, 3, 'Maximize', [3, 2], [[1, 1, 4], [1, 3, 6], [2, 1, 7]], ['<=', '>=', '<='], ['>= 0', '>= 0'])
+# max 3x + 5y  s.t.  x <= 4,  3x + 2y <= 18, optimum 45 at (0, 9), feasible slack basis
+PRIMAL = (2, 2, 'Maximize', [3, 5], [[1, 0, 4], [3, 2, 18]], ['<=', '<='], ['>= 0', '>= 0'])
+# min 2x + 3y  s.t.  x + y >= 4,  x + 3y >= 6, optimum 9 at (3, 1), dual feasible slack basis
+DUAL = (2, 2, 'Minimize', [2, 3], [[1, 1, 4], [1, 3, 6]], ['>=', '>='], ['>= 0', '>= 0'])
+# min x + y  s.t.  x >= -3,  y >= -5, x free and y <= 0, optimum -8 at (-3, -5)
+SIGNED = (2, 2, 'Minimize', [1, 1], [[1, 0, -3], [0, 1, -5]], ['>=', '>='], ['Free', '<= 0'])
+INFEASIBLE = (1, 2, 'Maximize', [1], [[1, 1], [1, 2]], ['<=', '>='], ['>= 0'])
+UNBOUNDED = (2, 1, 'Maximize', [1, 1], [[1, -1, 1]], ['<='], ['>= 0', '>= 0'])
+
+ENGINES = ['two_phase', 'tableau', 'revised', 'interior_point', 'bounded', 'auto']
+
+
+def solve(problem, method):
+    A, free_var = transfer_to_standard_form(*problem)
+    B, z, solver = solve_linear_programming_problem(problem[0], A, free_var, problem[2], method)
+    if solver is not None:
+        solver = restore_signs(solver, problem[6])
+    return z, solver
+
+
+@pytest.mark.parametrize('method', ENGINES)
+@pytest.mark.parametrize('problem, z_opt, x_opt', [(MIXED, 11.0, [3.0, 1.0]), (PRIMAL, 45.0, [0.0, 9.0]),
+                                                    (DUAL, 9.0, [3.0, 1.0]), (SIGNED, -8.0, [-3.0, -5.0])])
+def test_engines_reach_known_optimum(method, problem, z_opt, x_opt):
+    z, solver = solve(problem, method)
+    assert z == pytest.approx(z_opt)
+    assert solver == pytest.approx(x_opt, abs = 1e-7)
+
+
+def test_primal_and_dual_simplex():
+    assert solve(PRIMAL, 'primal') == pytest.approx((45.0, [0.0, 9.0]))
+    assert solve(DUAL, 'dual')[0] == pytest.approx(9.0)
+    # each engine needs its own feasible starting basis
+    assert solve(DUAL, 'primal') == (None, None)
+    assert solve(PRIMAL, 'dual') == (None, None)
+
+
+@pytest.mark.parametrize('method', ENGINES + ['primal', 'dual'])
+def test_infeasible_and_unbounded_problems(method):
+    assert solve(INFEASIBLE, method) == (None, None)
+    assert solve(UNBOUNDED, method) == (None, None)
+
+
+def test_choose_method():
+    assert choose_method(transfer_to_standard_form(*PRIMAL)[0]) == 'primal'
+    assert choose_method(transfer_to_standard_form(*DUAL)[0]) == 'dual'
+    assert choose_method(transfer_to_standard_form(*MIXED)[0]) == 'two_phase'
+
+
+def test_unknown_method():
+    A, free_var = transfer_to_standard_form(*MIXED)
+    with pytest.raises(ValueError):
+        solve_linear_programming_problem(2, A, free_var, 'Maximize', 'simplex')
+
+
+def test_single_precision_two_phase_is_refined():
+    rng = np.random.default_rng(1)
+    n_var, n_constraint = 8, 6
+    # "<=" rows bound every variable, ">=" rows with small right-hand sides keep the problem feasible
+    constraints = np.column_stack((rng.uniform(0.1, 2.0, (n_constraint, n_var)), rng.uniform(5.0, 10.0, n_constraint)))
+    constraints[1::2, -1] = 1.0
+    problem = (n_var, n_constraint, 'Maximize', list(rng.uniform(0.5, 3.0, n_var)), constraints.tolist(),
+               ['<=', '>=']*3, ['>= 0']*n_var)
+    A, free_var = transfer_to_standard_form(*problem)
+    expected = solve_linear_programming_problem(n_var, A, free_var, 'Maximize', 'two_phase')
+    result = solve_linear_programming_problem(n_var, A, free_var, 'Maximize', 'two_phase', dtype = np.float32)
+    assert result[0].dtype == np.float64
+    assert result[1] == pytest.approx(expected[1], rel = 1e-12)
+    assert result[2] == pytest.approx(expected[2], abs = 1e-9)
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from linear_programming_functions import transfer_to_standard_form, solve_linear_programming_problem
+from network_simplex import is_network, network_simplex_algorithm
+
+
+def transportation_problem(supply, demand, cost):
+    '''
+        Function builds a transportation problem in original form (supply rows "<=", demand rows ">=").
+    '''
+    m, n = len(supply), len(demand)
+    rows = []
+    for i in range(m):
+        row = np.zeros(m*n + 1)
+        row[i*n:(i + 1)*n] = 1.0
+        row[-1] = supply[i]
+        rows.append(row.tolist())
+    for j in range(n):
+        row = np.zeros(m*n + 1)
+        row[j:m*n:n] = 1.0
+        row[-1] = demand[j]
+        rows.append(row.tolist())
+    return (m*n, m + n, 'Minimize', list(np.ravel(cost)), rows, ['<=']*m + ['>=']*n, ['>= 0']*(m*n))
+
+
+def test_transportation_problem():
+    # supplies 20, 30, demands 10, 25, 15: the optimum ships 20 from the first source to the second demand
+    problem = transportation_problem([20, 30], [10, 25, 15], [[8, 6, 10], [9, 12, 13]])
+    A, free_var = transfer_to_standard_form(*problem)
+    assert is_network(A)
+    assert is_network(sp.csc_matrix(A))
+    B, z, solver = network_simplex_algorithm(problem[0], A, free_var, 'Minimize')
+    assert z == pytest.approx(solve_linear_programming_problem(problem[0], A, free_var, 'Minimize', 'two_phase')[1])
+    assert z == pytest.approx(20*6 + 10*9 + 5*12 + 15*13)
+    assert solver == pytest.approx([0, 20, 0, 10, 5, 15])
+
+
+def test_assignment_problem_has_integral_optimum():
+    rng = np.random.default_rng(5)
+    cost = rng.integers(1, 20, (5, 5))
+    problem = transportation_problem([1]*5, [1]*5, cost)
+    A, free_var = transfer_to_standard_form(*problem)
+    B, z, solver = solve_linear_programming_problem(problem[0], A, free_var, 'Minimize', 'network')
+    assert z == pytest.approx(solve_linear_programming_problem(problem[0], A, free_var, 'Minimize', 'two_phase')[1])
+    assert np.allclose(solver, np.round(solver))
+    assert np.allclose(np.reshape(solver, (5, 5)).sum(axis = 0), 1.0)
+
+
+def test_random_networks_match_two_phase():
+    rng = np.random.default_rng(6)
+    for _ in range(10):
+        supply = rng.integers(5, 20, 3)
+        demand = rng.integers(1, 12, 4)
+        problem = transportation_problem(supply, demand, rng.integers(1, 10, (3, 4)))
+        A, free_var = transfer_to_standard_form(*problem)
+        expected = solve_linear_programming_problem(problem[0], A, free_var, 'Minimize', 'two_phase')[1]
+        z = solve_linear_programming_problem(problem[0], A, free_var, 'Minimize', 'auto')[1]
+        if expected is None:
+            assert z is None
+        else:
+            assert z == pytest.approx(expected)
+
+
+def test_non_network_is_rejected():
+    problem = (2, 3, 'Maximize', [3, 2], [[1, 1, 4], [1, 3, 6], [2, 1, 7]], ['<=', '>=', '<='], ['>= 0', '>= 0'])
+    A, free_var = transfer_to_standard_form(*problem)
+    assert not is_network(A)
+    with pytest.raises(ValueError):
+        network_simplex_algorithm(2, A, free_var, 'Maximize')
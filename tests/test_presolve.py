@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+from linear_programming_functions import transfer_to_standard_form, solve_linear_programming_problem, restore_signs
+from presolve import presolve, solve_with_presolve
+
+PROBLEMS = [
+    # max 3x + 2y  s.t.  x + y <= 4,  x + 3y >= 6,  2x + y <= 7: nothing to remove, optimum 11
+    (2, 3, 'Maximize', [3, 2], [[1, 1, 4], [1, 3, 6], [2, 1, 7]], ['<=', '>=', '<='], ['>= 0', '>= 0']),
+    # singleton row z = 2 fixes z, an empty row and a duplicate row
+    (3, 5, 'Maximize', [3, 2, 1], [[1, 1, 1, 6], [0, 0, 1, 2], [0, 0, 0, 0], [1, 3, 0, 6], [1, 1, 1, 6]],
+     ['<=', '=', '<=', '>=', '<='], ['>= 0', '>= 0', '>= 0']),
+    # singleton rows become bounds of a free and a nonpositive variable, x + y <= 10 is dominated by them
+    (2, 4, 'Minimize', [1, -1], [[1, 0, -3], [0, 1, -5], [1, 1, 10], [1, -1, 1]], ['>=', '>=', '<=', '<='],
+     ['Free', '<= 0']),
+    # x <= 0 and x >= 0 force x = 0
+    (2, 3, 'Minimize', [-1, -2], [[1, 0, 0], [1, 1, 3], [0, 1, 5]], ['<=', '<=', '<='], ['>= 0', '>= 0']),
+]
+
+
+def plain_solve(problem):
+    A, free_var = transfer_to_standard_form(*problem)
+    B, z, solver = solve_linear_programming_problem(problem[0], A, free_var, problem[2], 'two_phase')
+    return z, (None if solver is None else restore_signs(solver, problem[6]))
+
+
+def assert_feasible(problem, solver, tol = 1e-7):
+    n_var, n_constraint, func_type, func_coef, constraints, signs, variable_cons = problem
+    C = np.array(constraints, dtype = float)
+    activity = C[:, :n_var] @ np.array(solver)
+    for value, rhs, sign in zip(activity, C[:, -1], signs):
+        assert {'<=': value <= rhs + tol, '>=': value >= rhs - tol, '=': abs(value - rhs) <= tol}[sign]
+    for value, con in zip(solver, variable_cons):
+        assert {'>= 0': value >= -tol, '<= 0': value <= tol, 'Free': True}[con]
+
+
+@pytest.mark.parametrize('problem', PROBLEMS)
+def test_presolve_keeps_optimum(problem):
+    z, solver = plain_solve(problem)
+    B, z_presolved, solver_presolved = solve_with_presolve(*problem)
+    assert z_presolved == pytest.approx(z)
+    assert_feasible(problem, solver_presolved)
+    assert np.dot(problem[3], solver_presolved) == pytest.approx(z)
+
+
+def test_presolve_reduces_problem():
+    reduced, record = presolve(*PROBLEMS[1])
+    assert reduced[0] < PROBLEMS[1][0]
+    assert reduced[1] < PROBLEMS[1][1]
+    assert record.fixed[2] == pytest.approx(2.0)
+
+
+def test_random_problems():
+    rng = np.random.default_rng(2)
+    for _ in range(20):
+        n_var, n_constraint = 4, 5
+        C = np.round(rng.uniform(-1.0, 3.0, (n_constraint, n_var)))
+        C[rng.random(C.shape) < 0.4] = 0.0
+        constraints = np.column_stack((C, rng.integers(0, 8, n_constraint))).tolist()
+        signs = list(rng.choice(['<=', '<=', '>=', '='], n_constraint))
+        problem = (n_var, n_constraint, 'Minimize', list(rng.uniform(0.0, 3.0, n_var)), constraints, signs, ['>= 0']*n_var)
+        z, solver = plain_solve(problem)
+        B, z_presolved, solver_presolved = solve_with_presolve(*problem)
+        if z is None:
+            assert z_presolved is None
+        else:
+            assert z_presolved == pytest.approx(z, abs = 1e-7)
+            assert_feasible(problem, solver_presolved)
+
+
+def test_infeasible_problem():
+    problem = (1, 2, 'Maximize', [1], [[1, 1], [1, 2]], ['<=', '>='], ['>= 0'])
+    assert solve_with_presolve(*problem) == (None, None, None)
+
+
+def test_singleton_rows_become_column_bounds():
+    # x >= 2 and 2x <= 8 box x, -y >= -5 with y free gives y <= 5, only x keeps one bound row; optimum 0 at (2, 2)
+    problem = (2, 4, 'Minimize', [1, -1], [[1, 1, 4], [1, 0, 2], [2, 0, 8], [0, -1, -5]], ['<=', '>=', '<=', '>='],
+               ['>= 0', 'Free'])
+    reduced, record = presolve(*problem)
+    assert reduced[1] < problem[1]
+    assert reduced[1] == 2
+    assert reduced[6] == ['>= 0', '<= 0']
+    B, z, solver = solve_with_presolve(*problem)
+    assert z == pytest.approx(plain_solve(problem)[0])
+    assert_feasible(problem, solver)
+
+
+def test_singleton_rows_with_equal_bounds_fix_the_column():
+    # 3 <= x <= 3 from two singleton rows, x is substituted and y <= 7 - x = 4
+    problem = (2, 3, 'Maximize', [1, 1], [[1, 0, 3], [2, 0, 6], [1, 1, 7]], ['>=', '<=', '<='], ['>= 0', '>= 0'])
+    reduced, record = presolve(*problem)
+    assert record.fixed == {0: pytest.approx(3.0)}
+    assert reduced[0] == 1 and reduced[1] < problem[1]
+    B, z, solver = solve_with_presolve(*problem)
+    assert z == pytest.approx(7.0)
+    assert solver[0] == pytest.approx(3.0)
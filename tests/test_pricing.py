@@ -0,0 +1,35 @@
+import pytest
+
+from linear_programming_functions import transfer_to_standard_form, solve_linear_programming_problem
+from pricing import PRICING_STRATEGIES, BlandPricing, make_pricing
+
+# max 3x + 2y  s.t.  x + y <= 4,  x + 3y >= 6,  2x + y <= 7, optimum 11 at (3, 1)
+PROBLEM = (2, 3, 'Maximize', [3, 2], [[1, 1, 4], [1, 3, 6], [2, 1, 7]], ['<=', '>=', '<='], ['>= 0', '>= 0'])
+# Beale's example cycles under Dantzig's rule, optimum 1 at (1, 0, 1, 0)
+BEALE = (4, 3, 'Maximize', [10, -57, -9, -24], [[0.5, -5.5, -2.5, 9, 0], [0.5, -1.5, -0.5, 1, 0], [1, 0, 0, 0, 1]],
+         ['<=', '<=', '<='], ['>= 0']*4)
+
+
+@pytest.mark.parametrize('pricing', sorted(PRICING_STRATEGIES))
+@pytest.mark.parametrize('method', ['two_phase', 'revised'])
+def test_every_strategy_reaches_optimum(pricing, method):
+    A, free_var = transfer_to_standard_form(*PROBLEM)
+    B, z, solver = solve_linear_programming_problem(2, A, free_var, 'Maximize', method, pricing)
+    assert z == pytest.approx(11.0)
+    assert solver == pytest.approx([3.0, 1.0])
+
+
+@pytest.mark.parametrize('method', ['primal', 'two_phase', 'revised'])
+def test_bland_rule_does_not_cycle(method):
+    A, free_var = transfer_to_standard_form(*BEALE)
+    B, z, solver = solve_linear_programming_problem(4, A, free_var, 'Maximize', method, 'bland')
+    assert z == pytest.approx(1.0)
+    assert solver == pytest.approx([1.0, 0.0, 1.0, 0.0])
+
+
+def test_make_pricing():
+    strategy = BlandPricing()
+    assert make_pricing(strategy) is strategy
+    assert isinstance(make_pricing('bland'), BlandPricing)
+    with pytest.raises(ValueError):
+        make_pricing('random')
@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+
+import problem_readers
+from linear_programming_functions import is_sparse, solve_linear_programming_problem, restore_signs
+from problem_readers import read_problem
+
+# max 3x + 2y  s.t.  x + y <= 4,  x + 3y >= 6,  2x + y <= 7,  0 <= x <= 3,  y free; optimum 11 at (3, 1)
+MPS = '''NAME          SMALL
+OBJSENSE
+    MAX
+ROWS
+ N  obj
+ L  c1
+ G  c2
+ L  c3
+COLUMNS
+    x         obj       3.0          c1        1.0
+    x         c2        1.0          c3        2.0
+    y         obj       2.0          c1        1.0
+    y         c2        3.0          c3        1.0
+RHS
+    rhs       c1        4.0          c2        6.0
+    rhs       c3        7.0
+BOUNDS
+ UP bnd       x         3.0
+ FR bnd       y
+ENDATA
+'''
+
+LP = '''Maximize
+ obj: 3 x + 2 y
+Subject To
+ c1: x + y <= 4
+ c2: x + 3 y >= 6
+ c3: 2 x + y <= 7
+Bounds
+ 0 <= x <= 3
+ y free
+End
+'''
+
+
+# min 2x + y  s.t.  x + y >= -2,  x >= -3,  -inf <= x <= 0; optimum -5 at (-3, 1)
+NONPOSITIVE_MPS = '''NAME          NONPOS
+ROWS
+ N  obj
+ G  c1
+ G  c2
+COLUMNS
+    x         obj       2.0          c1        1.0
+    x         c2        1.0
+    y         obj       1.0          c1        1.0
+RHS
+    rhs       c1        -2.0         c2        -3.0
+BOUNDS
+ MI bnd       x
+ UP bnd       x         0.0
+ENDATA
+'''
+
+NONPOSITIVE_LP = '''Minimize
+ obj: 2 x + y
+Subject To
+ c1: x + y >= -2
+ c2: x >= -3
+Bounds
+ -inf <= x <= 0
+End
+'''
+
+
+def read(tmp_path, name, text, sparse = True):
+    path = tmp_path / name
+    path.write_text(text)
+    return read_problem(str(path), sparse)
+
+
+@pytest.mark.parametrize('name, text', [('small.mps', MPS), ('small.lp', LP)])
+def test_reader_solves_to_known_optimum(tmp_path, name, text):
+    A, free_var, n_var, variable_cons, func_type, var_names = read(tmp_path, name, text)
+    assert var_names == ['x', 'y'] and func_type == 'Maximize'
+    assert variable_cons == ['>= 0', 'Free']
+    B, z, solver = solve_linear_programming_problem(n_var, A, free_var, func_type)
+    assert abs(z - 11.0) < 1e-9
+    assert np.allclose(solver, [3.0, 1.0])
+
+
+def test_mps_and_lp_give_the_same_standard_form(tmp_path):
+    A_mps, free_mps = read(tmp_path, 'small.mps', MPS, sparse = False)[:2]
+    A_lp, free_lp = read(tmp_path, 'small.lp', LP, sparse = False)[:2]
+    assert free_mps == free_lp
+    assert np.array_equal(A_mps, A_lp)
+
+
+def test_reader_without_scipy(tmp_path, monkeypatch):
+    dense = read(tmp_path, 'small.mps', MPS, sparse = False)[0]
+    monkeypatch.setattr(problem_readers, 'sp', None)
+    A = read(tmp_path, 'small.mps', MPS, sparse = True)[0]
+    assert not is_sparse(A)
+    assert np.array_equal(A, dense)
+
+
+@pytest.mark.parametrize('name, text', [('nonpositive.mps', NONPOSITIVE_MPS), ('nonpositive.lp', NONPOSITIVE_LP)])
+def test_nonpositive_variable_keeps_its_sign(tmp_path, name, text):
+    A, free_var, n_var, variable_cons, func_type, var_names = read(tmp_path, name, text)
+    assert variable_cons == ['<= 0', '>= 0']
+    B, z, solver = solve_linear_programming_problem(n_var, A, free_var, func_type)
+    assert abs(z + 5.0) < 1e-9
+    assert np.allclose(restore_signs(solver, variable_cons), [-3.0, 1.0])
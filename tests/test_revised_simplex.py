@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from instrumentation import SolveObserver
+from linear_programming_functions import (transfer_to_standard_form, transfer_to_sparse_standard_form,
+                                          solve_linear_programming_problem)
+
+# max 3x + 2y  s.t.  x + y <= 4,  x + 3y >= 6,  2x + y <= 7, optimum 11 at (3, 1)
+PROBLEM = (2, 3, 'Maximize', [3, 2], [[1, 1, 4], [1, 3, 6], [2, 1, 7]], ['<=', '>=', '<='], ['>= 0', '>= 0'])
+
+
+def test_dense_and_sparse_standard_forms():
+    A, free_var = transfer_to_standard_form(*PROBLEM)
+    S, sparse_free_var = transfer_to_sparse_standard_form(*PROBLEM[:4], sp.csr_matrix(np.array(PROBLEM[4], dtype = float)),
+                                                          *PROBLEM[5:])
+    assert np.allclose(S.toarray(), A)
+    for tableau in (A, S):
+        B, z, solver = solve_linear_programming_problem(2, tableau, free_var, 'Maximize', 'revised')
+        assert z == pytest.approx(11.0)
+        assert solver == pytest.approx([3.0, 1.0])
+
+
+def test_random_problems_match_two_phase():
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        n_var, n_constraint = 5, 4
+        constraints = np.column_stack((rng.uniform(0.1, 2.0, (n_constraint, n_var)), rng.uniform(1.0, 10.0, n_constraint)))
+        signs = list(rng.choice(['<=', '>=', '<='], n_constraint))
+        problem = (n_var, n_constraint, 'Maximize', list(rng.uniform(-1.0, 3.0, n_var)), constraints.tolist(), signs,
+                   ['>= 0']*n_var)
+        A, free_var = transfer_to_standard_form(*problem)
+        expected = solve_linear_programming_problem(n_var, A, free_var, 'Maximize', 'two_phase')[1]
+        z = solve_linear_programming_problem(n_var, A, free_var, 'Maximize', 'revised')[1]
+        if expected is None:
+            assert z is None
+        else:
+            assert z == pytest.approx(expected)
+
+
+def test_warm_start_after_changes_of_rhs_and_costs():
+    A, free_var = transfer_to_standard_form(*PROBLEM)
+    B, z, solver, basis = solve_linear_programming_problem(2, A, free_var, 'Maximize', 'revised', return_basis = True)
+    assert z == pytest.approx(11.0)
+
+    changed_rhs = A.copy()
+    changed_rhs[1, -1] = 5
+    changed_costs = A.copy()
+    changed_costs[0, :2] = [-1, -3]
+    for changed, z_opt in ((changed_rhs, 12.0), (changed_costs, 12.0)):
+        cold = SolveObserver()
+        warm = SolveObserver()
+        expected = solve_linear_programming_problem(2, changed, free_var, 'Maximize', 'revised', observer = cold)
+        result = solve_linear_programming_problem(2, changed, free_var, 'Maximize', 'revised', basis = basis, observer = warm)
+        assert expected[1] == pytest.approx(z_opt)
+        assert result[1] == pytest.approx(z_opt)
+        assert warm.total_pivots < cold.total_pivots
+
+
+def test_warm_start_ignores_basis_of_another_shape():
+    A, free_var = transfer_to_standard_form(*PROBLEM)
+    basis = solve_linear_programming_problem(2, A, free_var, 'Maximize', 'revised', return_basis = True)[3]
+    # without the row 2x + y <= 7 and its slack the optimum is still 11, at the crossing of the other two rows
+    smaller = np.delete(np.delete(A, 3, axis = 0), 4, axis = 1)
+    B, z, solver = solve_linear_programming_problem(2, smaller, free_var, 'Maximize', 'revised', basis = basis)
+    assert z == pytest.approx(11.0)
+    assert solver == pytest.approx([3.0, 1.0])
+
+
+def test_sparse_solve_does_not_build_dense_constraint_rows():
+    A, free_var = transfer_to_standard_form(*PROBLEM)
+    S = sp.csc_matrix(A)
+    B, z, solver, basis = solve_linear_programming_problem(2, S, free_var, 'Maximize', 'revised', return_basis = True)
+    assert B.shape == (1, A.shape[1])
+    assert z == pytest.approx(11.0)
+    assert solver == pytest.approx([3.0, 1.0])
+
+    full = solve_linear_programming_problem(2, S, free_var, 'Maximize', 'revised', tableau = True)[0]
+    dense = solve_linear_programming_problem(2, A, free_var, 'Maximize', 'revised')[0]
+    assert np.allclose(full, dense)
+    assert np.allclose(B[0], dense[0])
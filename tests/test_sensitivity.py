@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from sensitivity import solve_with_sensitivity
+
+# max 3x + 5y  s.t.  x <= 4,  2y <= 12,  3x + 2y <= 18, optimum 36 at (2, 6)
+WYNDOR = (2, 3, 'Maximize', [3, 5], [[1, 0, 4], [0, 2, 12], [3, 2, 18]], ['<=', '<=', '<='], ['>= 0', '>= 0'])
+# min 2x + 3y  s.t.  x + y >= 4,  x + 3y >= 6, optimum 9 at (3, 1)
+DIET = (2, 2, 'Minimize', [2, 3], [[1, 1, 4], [1, 3, 6]], ['>=', '>='], ['>= 0', '>= 0'])
+
+
+def test_known_report():
+    B, z, solver, report = solve_with_sensitivity(*WYNDOR)
+    assert z == pytest.approx(36.0)
+    assert report['shadow_prices'] == pytest.approx([0.0, 1.5, 1.0])
+    assert report['reduced_costs'] == pytest.approx([0.0, 0.0])
+    assert np.allclose(report['rhs_ranges'], [[2.0, np.inf], [6.0, 6.0], [6.0, 6.0]])
+    assert np.allclose(report['cost_ranges'], [[3.0, 4.5], [3.0, np.inf]])
+
+
+@pytest.mark.parametrize('problem', [WYNDOR, DIET])
+def test_shadow_prices_match_re_solves(problem):
+    B, z, solver, report = solve_with_sensitivity(*problem)
+    for i, (decrease, increase) in enumerate(report['rhs_ranges']):
+        for step in (-0.5*min(decrease, 1.0), 0.5*min(increase, 1.0)):
+            constraints = [list(row) for row in problem[4]]
+            constraints[i][-1] += step
+            z_changed = solve_with_sensitivity(*problem[:4], constraints, *problem[5:])[1]
+            assert z_changed == pytest.approx(z + report['shadow_prices'][i]*step)
+
+
+@pytest.mark.parametrize('problem', [WYNDOR, DIET])
+def test_solution_stays_optimal_inside_cost_ranges(problem):
+    B, z, solver, report = solve_with_sensitivity(*problem)
+    for j, (decrease, increase) in enumerate(report['cost_ranges']):
+        for step in (-0.5*min(decrease, 1.0), 0.5*min(increase, 1.0)):
+            func_coef = list(problem[3])
+            func_coef[j] += step
+            assert solve_with_sensitivity(*problem[:3], func_coef, *problem[4:])[2] == pytest.approx(solver)
+
+
+def test_infeasible_problem_has_no_report():
+    problem = (1, 2, 'Maximize', [1], [[1, 1], [1, 2]], ['<=', '>='], ['>= 0'])
+    assert solve_with_sensitivity(*problem)[3] is None
@@ -0,0 +1,56 @@
+import numpy as np
+import scipy.sparse as sp
+
+from linear_programming_functions import transfer_to_standard_form
+from pricing import BlandPricing
+from solution_cache import SolutionCache, cached_solve, problem_key
+
+CONSTRAINTS = [[1, 1, 4], [1, 3, 6], [2, 1, 7]]
+SIGNS = ['<=', '>=', '<=']
+
+
+def standard_form(order, sparse = False):
+    constraints = [CONSTRAINTS[i] for i in order]
+    signs = [SIGNS[i] for i in order]
+    if sparse:
+        constraints = sp.csr_matrix(np.array(constraints, dtype = float))
+    return transfer_to_standard_form(2, 3, 'Maximize', [3, 2], constraints, signs, ['>= 0', '>= 0'])
+
+
+def test_row_permuted_problem_hits_cache():
+    cache = SolutionCache()
+    A, free_var = standard_form([0, 1, 2])
+    B, z, solver = cached_solve(2, A, free_var, 'Maximize', cache = cache)
+    A, free_var = standard_form([2, 0, 1])
+    B2, z2, solver2 = cached_solve(2, A, free_var, 'Maximize', cache = cache)
+
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+    assert z == z2 and solver == solver2
+    assert abs(z - 11.0) < 1e-9
+    # only z and solver are shared: the tableau is the one of the first order of the constraints
+    assert np.array_equal(B, B2)
+
+
+def test_engine_and_pricing_are_part_of_the_key():
+    cache = SolutionCache()
+    A, free_var = standard_form([0, 1, 2])
+    cached_solve(2, A, free_var, 'Maximize', 'two_phase', cache = cache)
+    cached_solve(2, A, free_var, 'Maximize', 'revised', cache = cache)
+    cached_solve(2, A, free_var, 'Maximize', 'two_phase', 'bland', cache = cache)
+    cached_solve(2, A, free_var, 'Maximize', 'two_phase', BlandPricing(), cache = cache)
+    assert cache.stats()['misses'] == 3 and cache.stats()['hits'] == 1
+    assert problem_key(A, free_var, 'Maximize', 2) == problem_key(A, free_var, 'Maximize', 2, 'auto', 'dantzig')
+
+
+def test_row_permuted_sparse_problem_shares_key():
+    A, free_var = standard_form([0, 1, 2], sparse = True)
+    B, free_var_b = standard_form([1, 2, 0], sparse = True)
+    assert problem_key(A, free_var, 'Maximize', 2) == problem_key(B, free_var_b, 'Maximize', 2)
+
+
+def test_different_problems_have_different_keys():
+    A, free_var = standard_form([0, 1, 2])
+    B = A.copy()
+    B[2, -1] += 1.0
+    assert problem_key(A, free_var, 'Maximize', 2) != problem_key(B, free_var, 'Maximize', 2)
+    assert problem_key(A, free_var, 'Maximize', 2) != problem_key(A, free_var, 'Minimize', 2)
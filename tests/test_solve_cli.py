@@ -0,0 +1,67 @@
+import json
+
+import pytest
+
+from solve_cli import main
+
+# min 2x + y  s.t.  x + y >= -2,  x >= -3,  -inf <= x <= 0; the only optimum is -5 at (-3, 1)
+NONPOSITIVE_LP = '''Minimize
+ obj: 2 x + y
+Subject To
+ c1: x + y >= -2
+ c2: x >= -3
+Bounds
+ -inf <= x <= 0
+End
+'''
+
+# every kind of bound: nonpositive x, free y, boxed z, w <= -1; the only optimum is -13 at (-3, 1, 5, -3)
+BOUNDS_LP = '''Minimize
+ obj: 2 x + y - z + w
+Subject To
+ c1: x + y >= -2
+ c2: x >= -3
+ c3: z - y <= 4
+ c4: w + x >= -6
+ c5: w - z >= -10
+Bounds
+ -inf <= x <= 0
+ y free
+ -1 <= z <= 5
+ -inf <= w <= -1
+End
+'''
+
+
+def run(capsys, *args):
+    assert main(list(args)) == 0
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+def test_nonpositive_variable_of_a_file_keeps_its_sign(tmp_path, capsys):
+    path = tmp_path / 'nonpositive.lp'
+    path.write_text(NONPOSITIVE_LP)
+    result, = run(capsys, str(path))
+    assert result['status'] == 'optimal'
+    assert result['z'] == pytest.approx(-5.0)
+    assert result['solution']['x'] == pytest.approx(-3.0)
+    assert result['solution']['y'] == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize('method', ['auto', 'two_phase', 'tableau', 'revised', 'interior_point', 'bounded'])
+def test_every_method_gives_the_same_solution_of_a_file(tmp_path, capsys, method):
+    path = tmp_path / 'bounds.lp'
+    path.write_text(BOUNDS_LP)
+    result, = run(capsys, str(path), '--method', method)
+    assert result['z'] == pytest.approx(-13.0)
+    assert result['solution'] == pytest.approx({'x': -3.0, 'y': 1.0, 'z': 5.0, 'w': -3.0})
+
+
+def test_json_problem(tmp_path, capsys):
+    path = tmp_path / 'problem.json'
+    path.write_text(json.dumps({'n_var': 2, 'n_constraint': 2, 'func_type': 'Minimize', 'func_coef': [2, 1],
+                                'constraints': [[1, 1, -2], [1, 0, -3]], 'constraint_signs': ['>=', '>='],
+                                'variable_cons': ['<= 0', '>= 0']}))
+    result, = run(capsys, str(path))
+    assert result['z'] == pytest.approx(-5.0)
+    assert result['solution'] == pytest.approx({'X1': -3.0, 'X2': 1.0})
@@ -0,0 +1,32 @@
+import asyncio
+import json
+
+import pytest
+
+from solve_service import SolveService
+
+PROBLEM = {'n_var': 2, 'n_constraint': 3, 'func_type': 'Maximize', 'func_coef': [3, 2],
+           'constraints': [[1, 1, 4], [1, 3, 6], [2, 1, 7]], 'constraint_signs': ['<=', '>=', '<='],
+           'variable_cons': ['>= 0', '>= 0']}
+
+
+@pytest.mark.parametrize('timeout', ['0', '-1', 'nan', 'soon'])
+def test_invalid_timeout_is_rejected(timeout):
+    service = SolveService(workers = 1)
+    status, payload = asyncio.run(service.dispatch('POST', '/solve?timeout=' + timeout, json.dumps(PROBLEM).encode()))
+    assert status == 400 and payload['status'] == 'error'
+    assert service.metrics.bad_requests == 1
+
+
+def test_solve_request():
+    async def run():
+        service = SolveService(workers = 1)
+        await service.start()
+        try:
+            return await service.dispatch('POST', '/solve?timeout=20', json.dumps(PROBLEM).encode())
+        finally:
+            await service.stop()
+
+    status, payload = asyncio.run(run())
+    assert status == 200 and payload['status'] == 'optimal'
+    assert payload['z'] == pytest.approx(11.0)